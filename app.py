@@ -1,26 +1,38 @@
-from flask import Flask, render_template, request, redirect, url_for, session, flash
+import functools
+import hmac
+import json
+from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify, Response, stream_with_context, abort
 import database as db
+import database_async as adb
 import config
+from monitoring.metrics import metrics
 
 app = Flask(__name__)
 app.config.from_object(config)
 
+# 라우트별 처리 시간 / 요청 수 기록 (/metrics)
+if db.METRICS_ENABLED:
+    metrics.init_app(app)
+
+# 조리 방법 / 요리 종류 조회 테이블 미리 읽기 (실패하면 첫 사용 시 다시 시도)
+db.refresh_lookups()
+
+# 중단된 백그라운드 회원 탈퇴 정리 이어서 실행
+if db.USER_PURGE_ASYNC:
+    db.resume_user_purges()
+
+# 읽기 위주 화면(메인, 검색, 상세)은 async 뷰에서 database_async로 조회
 @app.route('/')
-def index():
+async def index():
     if 'user_id' in session:
-        favorites = db.get_my_favorites(session['user_id'])
-        my_recipes = db.get_my_recipes(session['user_id'])
-        my_comments = db.get_my_comments(session['user_id'])
-        
-        top_favorites = db.get_top5_favorites()
-        top_comments = db.get_top5_comments()
+        dashboard = await adb.get_dashboard(session['user_id'])
 
         return render_template('index.html',
-                               favorites=favorites,
-                               my_recipes=my_recipes,
-                               my_comments=my_comments,
-                               top_favorites=top_favorites,
-                               top_comments=top_comments)
+                               favorites=dashboard.favorites,
+                               my_recipes=dashboard.my_recipes,
+                               my_comments=dashboard.my_comments,
+                               top_favorites=dashboard.top_favorites,
+                               top_comments=dashboard.top_comments)
     return redirect(url_for('login'))
 
 # 내 즐겨찾기 목록
@@ -299,85 +311,127 @@ def delete_account():
     
     if db.delete_user(session['user_id']):
         session.clear()
-        flash('회원 탈퇴가 완료되었습니다.', 'success')
+        if db.USER_PURGE_ASYNC:
+            flash('회원 탈퇴가 접수되었습니다. 작성한 레시피는 잠시 후 모두 삭제됩니다.', 'success')
+        else:
+            flash('회원 탈퇴가 완료되었습니다.', 'success')
         return redirect(url_for('login'))
     else:
         flash('회원 탈퇴에 실패했습니다.', 'error')
         return redirect(url_for('mypage'))
 
+# 검색 폼 파라미터 수집
+def _search_filters():
+    args = request.args
+    return dict(
+        keyword=args.get('keyword'),
+        author=args.get('author'),
+        recipe_way=args.get('recipe_way'),
+        recipe_type=args.get('recipe_type'),
+        
+        # 세부 검색 파라미터
+        calories_min=args.get('calories_min', type=int),
+        calories_max=args.get('calories_max', type=int),
+        carbohydrate_min=args.get('carbohydrate_min', type=int),
+        carbohydrate_max=args.get('carbohydrate_max', type=int),
+        protein_min=args.get('protein_min', type=int),
+        protein_max=args.get('protein_max', type=int),
+        fat_min=args.get('fat_min', type=int),
+        fat_max=args.get('fat_max', type=int),
+        natrium_min=args.get('natrium_min', type=int),
+        natrium_max=args.get('natrium_max', type=int),
+        
+        # 재료 필터 (쉼표로 여러 재료)
+        include_ingredient=_ingredient_names('include_ingredient'),
+        exclude_ingredient=_ingredient_names('exclude_ingredient'),
+        include_mode='or' if args.get('include_mode') == 'or' else 'and'
+    )
+
+# 쉼표로 구분된 재료 이름 목록
+def _ingredient_names(name):
+    names = []
+    for value in request.args.getlist(name):
+        names.extend(n.strip() for n in value.split(','))
+    return [n for n in names if n]
+
+# 검색 결과 전체를 한 줄에 한 레시피씩 JSON으로 스트리밍 (format=ndjson)
+def _stream_ndjson(rows):
+    def generate():
+        for row in rows:
+            yield json.dumps(row, ensure_ascii=False, default=str) + "\n"
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+# 냉장고 파먹기 부족 재료 허용 개수 상한과 그때 보여줄 레시피 수 (페이지 없이 상위만)
+MAX_MISSING_LIMIT = 5
+RANKED_RESULT_LIMIT = 20
+
 @app.route('/search')
-def search():
+async def search():
     if 'user_id' not in session: return redirect(url_for('login'))
     
     mode = request.args.get('mode')
+    stream = request.args.get('format') == 'ndjson'
     recipes = []
+    page = None
     title = "전체 레시피"
+
+    # 키셋 페이지네이션 커서
+    after = request.args.get('after', type=int)
+    before = request.args.get('before', type=int)
+    
+    ranked = None
     
     if mode == 'fridge':
-        recipes = db.find_recipes_by_fridge(session['user_id'])
+        # 부족한 재료 허용 개수 (0이면 가진 재료만으로 만들 수 있는 레시피)
+        max_missing = request.args.get('max_missing', type=int) if request.args.get('max_missing') else 0
+        if max_missing is None or not 0 <= max_missing <= MAX_MISSING_LIMIT:
+            flash(f'부족한 재료 허용 개수는 0~{MAX_MISSING_LIMIT}개로 입력해주세요.', 'error')
+            return redirect(url_for('search', mode='fridge'))
+        if max_missing > 0:
+            # 한 개 더 가져와 잘린 결과인지 확인
+            recipes = await adb.find_recipes_by_fridge_ranked(session['user_id'], max_missing,
+                                                              RANKED_RESULT_LIMIT + 1)
+            ranked = {'max_missing': max_missing, 'limit': RANKED_RESULT_LIMIT,
+                      'truncated': len(recipes) > RANKED_RESULT_LIMIT}
+            recipes = recipes[:RANKED_RESULT_LIMIT]
+            if stream: return _stream_ndjson(recipes)
+        elif stream:
+            return _stream_ndjson(db.iter_recipes_by_fridge(session['user_id']))
+        else:
+            page = await adb.find_recipes_by_fridge_page(session['user_id'], after=after, before=before)
+            recipes = page.items
         title = "냉장고 파먹기 결과"
     else:
-        # 검색 파라미터 수집
-        keyword = request.args.get('keyword')
-        author = request.args.get('author')
-        recipe_way = request.args.get('recipe_way')
-        recipe_type = request.args.get('recipe_type')
-        
-        # 세부 검색 파라미터
-        calories_min = request.args.get('calories_min', type=int)
-        calories_max = request.args.get('calories_max', type=int)
-        carbohydrate_min = request.args.get('carbohydrate_min', type=int)
-        carbohydrate_max = request.args.get('carbohydrate_max', type=int)
-        protein_min = request.args.get('protein_min', type=int)
-        protein_max = request.args.get('protein_max', type=int)
-        fat_min = request.args.get('fat_min', type=int)
-        fat_max = request.args.get('fat_max', type=int)
-        natrium_min = request.args.get('natrium_min', type=int)
-        natrium_max = request.args.get('natrium_max', type=int)
-        
-        # 재료 필터
-        include_ingredient = request.args.get('include_ingredient')
-        exclude_ingredient = request.args.get('exclude_ingredient')
+        filters = _search_filters()
+        if stream:
+            return _stream_ndjson(db.iter_search_recipes(**filters))
         
         # 레시피 검색 실행
-        recipes = db.search_recipes(
-            keyword=keyword,
-            author=author,
-            recipe_way=recipe_way,
-            recipe_type=recipe_type,
-            calories_min=calories_min,
-            calories_max=calories_max,
-            carbohydrate_min=carbohydrate_min,
-            carbohydrate_max=carbohydrate_max,
-            protein_min=protein_min,
-            protein_max=protein_max,
-            fat_min=fat_min,
-            fat_max=fat_max,
-            natrium_min=natrium_min,
-            natrium_max=natrium_max,
-            include_ingredient=include_ingredient,
-            exclude_ingredient=exclude_ingredient
-        )
+        page = await adb.search_recipes_page(after=after, before=before, **filters)
+        recipes = page.items
         
         # 검색 조건이 있으면 타이틀 변경
-        if any([keyword, author, recipe_way, recipe_type, calories_min, calories_max, 
-                carbohydrate_min, carbohydrate_max, protein_min, protein_max, 
-                fat_min, fat_max, natrium_min, natrium_max, include_ingredient, exclude_ingredient]):
+        if any(value for name, value in filters.items() if name != 'include_mode'):
             title = "검색 결과"
         
-    return render_template('search.html', recipes=recipes, title=title)
+    return render_template('search.html', recipes=recipes, page=page, title=title, ranked=ranked)
 
 # 레시피 상세 조회
 @app.route('/recipe/<int:recipe_id>')
-def recipe_detail(recipe_id):
+async def recipe_detail(recipe_id):
     if 'user_id' not in session: return redirect(url_for('login'))
     
-    detail = db.get_recipe_detail(recipe_id)
+    # 상세 정보와 즐겨찾기 여부를 동시에 조회
+    detail, is_favorite = await adb.fan_out(
+        adb.get_recipe_detail(recipe_id),
+        adb.is_favorited(recipe_id, session['user_id']))
+    if detail is adb.FAN_OUT_FAILED:
+        flash('레시피를 불러오지 못했습니다. 잠시 후 다시 시도해주세요.', 'error')
+        return redirect(url_for('index'))
     if not detail:
         flash('레시피를 찾을 수 없습니다.', 'error')
         return redirect(url_for('index'))
     
-    is_favorite = db.is_favorited(recipe_id, session['user_id'])
     return render_template('recipe_detail.html', detail=detail, is_favorite=is_favorite)
 
 # 즐겨찾기 등록 / 해제
@@ -425,6 +479,43 @@ def delete_comment(recipe_id, comment_id):
         
     return redirect(url_for('recipe_detail', recipe_id=recipe_id))
 
+# 모니터링 엔드포인트 접근 제한: 허용된 주소에서 오거나 토큰(Authorization: Bearer)이 맞아야 함
+MONITORING_ALLOWED_IPS = tuple(getattr(config, 'MONITORING_ALLOWED_IPS', ('127.0.0.1', '::1')))
+MONITORING_TOKEN = getattr(config, 'MONITORING_TOKEN', None)
+
+def monitoring_only(view):
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if request.remote_addr not in MONITORING_ALLOWED_IPS:
+            auth = request.headers.get('Authorization', '')
+            if not (MONITORING_TOKEN and auth.startswith('Bearer ')
+                    and hmac.compare_digest(auth[7:], MONITORING_TOKEN)):
+                abort(403)
+        return view(*args, **kwargs)
+    return wrapper
+
+# DB 커넥션 풀 상태 (모니터링용)
+@app.route('/status/db-pool')
+@monitoring_only
+def db_pool_status():
+    return jsonify(db.get_pool_stats())
+
+# 메모리 캐시 상태 (모니터링용)
+@app.route('/status/caches')
+@monitoring_only
+def cache_status():
+    return jsonify(db.get_cache_stats())
+
+# Prometheus 지표 (DB 함수 / 라우트별 지연, 호출·왕복·행 수, 커넥션 풀 / 캐시 상태)
+@app.route('/metrics')
+@monitoring_only
+def metrics_endpoint():
+    gauges = {f"app_db_pool_{name}": {(): value} for name, value in db.get_pool_stats().items()}
+    for cache, stats in db.get_cache_stats().items():
+        for name, value in stats.items():
+            gauges.setdefault(f"app_cache_{name}", {})[(('cache', cache),)] = value
+    return Response(metrics.render(gauges), mimetype='text/plain; version=0.0.4')
+
 if __name__ == '__main__':
     app.run(debug=True)
-    
\ No newline at end of file
+    
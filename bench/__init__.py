@@ -0,0 +1,17 @@
+"""database.py 벤치마크 (로컬 SQLite에서 실행: python -m bench.<모듈>)
+
+config.py가 없으면 config.example.py 기본값으로 config 모듈을 만든다
+(벤치는 use_local_db()로 SQLite를 쓰고 SECRET_KEY도 직접 정함).
+"""
+import importlib.util
+import os
+import sys
+
+try:
+    import config
+except ModuleNotFoundError:
+    _spec = importlib.util.spec_from_file_location(
+        'config', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config.example.py'))
+    config = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(config)
+    sys.modules['config'] = config
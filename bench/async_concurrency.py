@@ -0,0 +1,115 @@
+"""sync vs async 뷰 처리량 비교 (실제 app.py 라우트, 동시 클라이언트 200명 기본)
+
+동시 클라이언트 --clients명이 각자 WSGI 워커 스레드 하나로 요청을 하나씩 끝까지 처리한다
+(Flask test client로 app.py의 메인 화면 / 레시피 상세를 번갈아 요청). 두 모드 모두 워커
+스레드 수가 같고, async 모드의 database_async 스레드 풀(ASYNC_DB_THREADS)도 같은 수로 맞춘다.
+
+sync : database_async 호출을 요청 스레드에서 바로 실행 (동기 뷰와 같은 DB 호출 순서)
+async: app.py 그대로 (상세 + 즐겨찾기 여부를 동시에 조회, DB 호출은 스레드 풀에서)
+
+WSGI에서는 Flask async 뷰도 요청마다 워커 스레드 하나를 끝까지 차지하므로 동시에
+처리하는 요청 수는 두 모드 모두 --clients개로 같다. 즉 async 뷰는 한 요청 안의 독립적인
+DB 호출만 겹쳐 실행하고, 워커 하나가 여러 요청의 DB 호출을 동시에 진행하지는 않는다.
+이 측정의 async 이득은 그 겹침에서 오는 지연 감소뿐이다.
+
+왕복마다 --rtt-ms 만큼 네트워크 지연을 흉내 낸다. 캐시는 끄고 DB 경로만 잰다.
+SQLite에는 비동기 드라이버가 없으므로 Oracle 비동기 풀 경로는 측정하지 않는다.
+
+    python -m bench.async_concurrency --clients 200 --rtt-ms 2
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+import config
+from bench.common import RoundTripCounter, use_local_db
+
+_tmpdir = tempfile.mkdtemp(prefix='bench_async_')
+# 메모리 DB는 커넥션 구간을 직렬화하므로 파일 DB로 측정
+db = use_local_db(os.path.join(_tmpdir, 'bench.db'))
+
+def seed(n_recipes):
+    db.register_user('bench', 'bench', 'bench')
+    ids = []
+    for i in range(n_recipes):
+        ids.append(db.create_recipe('bench', f"벤치 레시피 {i}", '', 1, 1, 300, 40, 20, 10, 500,
+                                    [{'name': f"재료{j}", 'amount': '1'} for j in range(i % 5 + 1)],
+                                    [f"단계 {j}" for j in range(3)]))
+        if i % 3 == 0:
+            db.toggle_favorite(ids[-1], 'bench')
+    return ids
+
+def run_workers(app, clients, requests, recipe_ids):
+    """clients개 워커가 요청 requests개를 나눠 처리, (걸린 시간, 지연 목록 ms) 반환"""
+    latencies = []
+    next_request = iter(range(requests))
+    lock = threading.Lock()
+
+    def worker():
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session['user_id'] = 'bench'
+            session['nickname'] = 'bench'
+        while True:
+            with lock:
+                i = next(next_request, None)
+            if i is None:
+                return
+            path = '/' if i % 2 else f"/recipe/{recipe_ids[i % len(recipe_ids)]}"
+            start = time.perf_counter()
+            resp = client.get(path)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if resp.status_code != 200:
+                raise RuntimeError(f"{path}: HTTP {resp.status_code}")
+
+    workers = [threading.Thread(target=worker) for _ in range(clients)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return time.perf_counter() - start, latencies
+
+def report(name, elapsed, latencies):
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{name:<22} | {len(latencies) / elapsed:>8.1f} req/s | "
+          f"p50 {statistics.median(latencies):>8.1f}ms | p95 {p95:>8.1f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=200, help='동시 클라이언트(= WSGI 워커 스레드) 수 (두 모드 공통)')
+    parser.add_argument('--requests', type=int, default=4000, help='모드마다 보낼 요청 수')
+    parser.add_argument('--rtt-ms', type=float, default=2.0, help='왕복당 흉내 낼 네트워크 지연 (ms)')
+    parser.add_argument('--recipes', type=int, default=200)
+    args = parser.parse_args()
+
+    # database_async 스레드 풀도 워커 수와 같게
+    config.ASYNC_DB_THREADS = args.clients
+    import database_async as adb
+    from app import app
+
+    recipe_ids = seed(args.recipes)
+    db.get_dashboard('bench')   # 조회 테이블 / 랭킹 미리 로드
+    db.detail_cache.maxsize = 0
+    db.search_cache.maxsize = 0
+
+    async def run_inline(fn, *a, **kw):
+        return fn(*a, **kw)
+
+    print(f"clients={args.clients}, requests={args.requests}, rtt={args.rtt_ms}ms, "
+          f"backend={db.backend.NAME}, ASYNC_DB_THREADS={adb.ASYNC_DB_THREADS}")
+    with RoundTripCounter(db, args.rtt_ms):
+        run_sync = adb.run_sync
+        adb.run_sync = run_inline
+        try:
+            report("sync", *run_workers(app, args.clients, args.requests, recipe_ids))
+        finally:
+            adb.run_sync = run_sync
+        report("async", *run_workers(app, args.clients, args.requests, recipe_ids))
+
+if __name__ == '__main__':
+    main()
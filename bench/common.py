@@ -0,0 +1,78 @@
+"""벤치마크 공통 도구
+
+- use_local_db(): config를 SQLite(기본 메모리 DB)로 바꾸고 SECRET_KEY를 정한 뒤 database 모듈 반환
+- RoundTripCounter: database._connect를 감싸 execute/executemany/commit
+  호출(=DB 왕복) 횟수를 세고, 선택적으로 왕복마다 네트워크 지연(rtt)을 흉내 낸다
+"""
+import time
+
+import config
+
+def use_local_db(path=':memory:'):
+    config.DB_BACKEND = 'sqlite'
+    config.SQLITE_PATH = path
+    config.SECRET_KEY = getattr(config, 'SECRET_KEY', '') or 'bench'
+    import database
+    return database
+
+class _CountingCursor:
+    def __init__(self, cursor, counter):
+        self._cursor = cursor
+        self._counter = counter
+
+    def execute(self, *args, **kwargs):
+        self._counter.hit()
+        return self._cursor.execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        self._counter.hit()
+        return self._cursor.executemany(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+class _CountingConnection:
+    def __init__(self, conn, counter):
+        self._conn = conn
+        self._counter = counter
+
+    def cursor(self):
+        return _CountingCursor(self._conn.cursor(), self._counter)
+
+    def commit(self):
+        self._counter.hit()
+        return self._conn.commit()
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+class RoundTripCounter:
+    def __init__(self, database, rtt_ms=0.0):
+        self.database = database
+        self.rtt = rtt_ms / 1000
+        self.count = 0
+        self._orig = None
+
+    def hit(self):
+        self.count += 1
+        if self.rtt:
+            time.sleep(self.rtt)
+
+    def __enter__(self):
+        # get_db_conn과 ID 블록 할당 커넥션 모두 database._connect를 거침
+        self._orig = self.database._connect
+        orig = self._orig
+
+        def connect():
+            return _CountingConnection(orig(), self)
+
+        self.database._connect = connect
+        return self
+
+    def __exit__(self, *exc):
+        self.database._connect = self._orig
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
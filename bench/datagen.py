@@ -0,0 +1,169 @@
+"""시드 고정 합성 데이터 생성기 (벤치마크 / 부하 테스트용)
+
+- 사용자: 레시피 10개당 1명, 작성/활동량은 Zipf 분포 (소수의 헤비 유저)
+- 재료: 인기도가 Zipf 분포 (계란, 양파처럼 자주 쓰이는 재료가 앞 순위)
+- 레시피: 재료 3~15개(최빈 7개), 조리 순서 2~12단계(최빈 5단계), 영양 정보 10%는 NULL
+- 즐겨찾기 / 댓글: 레시피 인기도도 Zipf 분포, 레시피당 평균 2개 / 1.5개
+- 냉장고: 사용자마다 인기 재료 위주로 5~25개
+
+같은 (recipes, seed)면 항상 같은 데이터를 만든다. ID는 1부터 차례로 직접 넣으므로
+describe()만으로 어떤 사용자 / 레시피 / 재료가 있는지 DB 없이 알 수 있다.
+
+    python -m bench.datagen --recipes 100000 --path /tmp/recipes_100k.db
+"""
+import argparse
+import itertools
+import random
+import time
+from dataclasses import dataclass, field
+
+from bench.common import use_local_db
+
+# 앞 순위(인기) 재료 이름, 그 뒤는 '재료N'
+COMMON_INGREDIENTS = [
+    '계란', '양파', '마늘', '대파', '간장', '설탕', '소금', '참기름', '고춧가루', '후추',
+    '감자', '당근', '돼지고기', '두부', '김치', '애호박', '밥', '고추장', '된장', '식용유',
+    '닭고기', '소고기', '버섯', '청양고추', '깨', '우유', '밀가루', '버터', '양배추', '오이',
+    '콩나물', '시금치', '무', '어묵', '햄', '참치', '새우', '오징어', '치즈', '토마토',
+]
+TITLE_WORDS = ['김치', '된장', '볶음', '찌개', '구이', '무침', '조림', '국', '덮밥', '전',
+               '비빔', '매운', '간단', '바삭', '부드러운', '엄마표', '자취생', '초간단']
+WAY_COUNT = 6       # schema_sqlite.sql 기본 조리 방법 수
+TYPE_COUNT = 7      # 기본 요리 종류 수
+BATCH = 20000       # 레시피 몇 개씩 모아 executemany 할지
+
+@dataclass
+class Dataset:
+    recipes: int
+    seed: int = 0
+    users: int = field(init=False)
+    ingredients: int = field(init=False)
+
+    def __post_init__(self):
+        self.users = max(10, self.recipes // 10)
+        self.ingredients = max(len(COMMON_INGREDIENTS), min(5000, self.recipes // 20))
+
+    def user_id(self, i):
+        return f"user{i}"
+
+    def ingredient_name(self, rank):
+        """rank(1부터)번째로 인기 있는 재료 이름"""
+        if rank <= len(COMMON_INGREDIENTS):
+            return COMMON_INGREDIENTS[rank - 1]
+        return f"재료{rank}"
+
+    @property
+    def password(self):
+        return 'bench'
+
+def describe(recipes, seed=0):
+    return Dataset(recipes, seed)
+
+def _zipf_cum_weights(n, s=1.1):
+    return list(itertools.accumulate(1 / k ** s for k in range(1, n + 1)))
+
+def generate(db, recipes, seed=0, verbose=False):
+    """database 모듈이 가리키는 (빈) DB에 합성 데이터를 넣고 Dataset 반환"""
+    ds = Dataset(recipes, seed)
+    rnd = random.Random(seed)
+    ing_weights = _zipf_cum_weights(ds.ingredients)
+    ing_ranks = range(1, ds.ingredients + 1)
+    user_weights = _zipf_cum_weights(ds.users, 0.8)
+    user_ids = range(1, ds.users + 1)
+    started = time.perf_counter()
+
+    def log(msg):
+        if verbose:
+            print(f"  [{time.perf_counter() - started:6.1f}s] {msg}")
+
+    def distinct(population, weights, k):
+        picked = dict.fromkeys(rnd.choices(population, cum_weights=weights, k=k * 2))
+        return list(picked)[:k]
+
+    def nutrition(limit):
+        return None if rnd.random() < 0.1 else rnd.randint(0, limit)
+
+    conn = db.backend.connect()
+    cursor = conn.cursor()
+    try:
+        cursor.executemany("INSERT INTO USER_T (user_id, password, nickname) VALUES (:1, :2, :3)",
+                           [(ds.user_id(i), ds.password, f"요리사{i}") for i in user_ids])
+        cursor.executemany("INSERT INTO INGREDIENT (ingredient_id, name) VALUES (:1, :2)",
+                           [(rank, ds.ingredient_name(rank)) for rank in ing_ranks])
+        log(f"users={ds.users}, ingredients={ds.ingredients}")
+
+        for start in range(1, recipes + 1, BATCH):
+            end = min(start + BATCH, recipes + 1)
+            authors = rnd.choices(user_ids, cum_weights=user_weights, k=end - start)
+            recipe_rows, ing_rows, step_rows = [], [], []
+            for recipe_id, author in zip(range(start, end), authors):
+                title = f"{rnd.choice(TITLE_WORDS)} {rnd.choice(TITLE_WORDS)} {recipe_id}"
+                recipe_rows.append((recipe_id, title, f"{title} 만드는 법", ds.user_id(author),
+                                    rnd.randint(1, TYPE_COUNT), rnd.randint(1, WAY_COUNT),
+                                    nutrition(900), nutrition(120), nutrition(80), nutrition(60), nutrition(2500)))
+                for rank in distinct(ing_ranks, ing_weights, round(rnd.triangular(3, 15, 7))):
+                    ing_rows.append((recipe_id, rank, f"{rnd.randint(1, 5)}큰술"))
+                for step in range(1, round(rnd.triangular(2, 12, 5)) + 1):
+                    step_rows.append((recipe_id, step, f"{step}단계: 재료를 손질하고 조리한다"))
+            cursor.executemany("""
+                INSERT INTO RECIPE (recipe_id, title, description, author_id, recipe_type_id, recipe_way_id,
+                    info_calories, info_carbohydrate, info_protein, info_fat, info_natrium)
+                VALUES (:1, :2, :3, :4, :5, :6, :7, :8, :9, :10, :11)
+            """, recipe_rows)
+            cursor.executemany("INSERT INTO RECIPE_INGREDIENT (recipe_id, ingredient_id, amount) VALUES (:1, :2, :3)", ing_rows)
+            cursor.executemany("INSERT INTO COOKING_STEP (recipe_id, step_number, instruction) VALUES (:1, :2, :3)", step_rows)
+            conn.commit()
+            log(f"recipes {end - 1}/{recipes}")
+
+        recipe_ids = range(1, recipes + 1)
+        recipe_weights = _zipf_cum_weights(recipes, 0.9)
+        favorites = set(zip(rnd.choices(recipe_ids, cum_weights=recipe_weights, k=recipes * 2),
+                            rnd.choices(user_ids, k=recipes * 2)))
+        db.backend.insert_ignore_duplicates(
+            cursor, "INSERT INTO FAVORITE (recipe_id, user_id) VALUES (:1, :2)",
+            [(r, ds.user_id(u)) for r, u in favorites])
+        conn.commit()
+        log(f"favorites={len(favorites)}")
+
+        n_comments = recipes * 3 // 2
+        for start in range(0, n_comments, BATCH * 5):
+            count = min(BATCH * 5, n_comments - start)
+            rows = zip(range(start + 1, start + count + 1),
+                       rnd.choices(user_ids, cum_weights=user_weights, k=count),
+                       rnd.choices(recipe_ids, cum_weights=recipe_weights, k=count))
+            cursor.executemany("INSERT INTO COMMENT_T (comment_id, user_id, recipe_id, content) VALUES (:1, :2, :3, :4)",
+                               [(cid, ds.user_id(u), r, f"맛있어요 {cid}") for cid, u, r in rows])
+            conn.commit()
+        log(f"comments={n_comments}")
+
+        fridge_rows = []
+        for u in user_ids:
+            for rank in distinct(ing_ranks, ing_weights, rnd.randint(5, 25)):
+                fridge_rows.append((ds.user_id(u), rank, '1'))
+        cursor.executemany("INSERT INTO USER_INGREDIENT (user_id, ingredient_id, quantity) VALUES (:1, :2, :3)", fridge_rows)
+        conn.commit()
+        log(f"fridge rows={len(fridge_rows)}")
+    finally:
+        cursor.close()
+        conn.close()
+    return ds
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--recipes', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--path', default='synthetic.db', help="SQLite 파일 경로 (':memory:' 가능)")
+    args = parser.parse_args()
+
+    db = use_local_db(args.path)
+    started = time.perf_counter()
+    ds = generate(db, args.recipes, args.seed, verbose=True)
+    # WAL 내용을 DB 파일에 반영해 두어 파일만 복사해도 되게 함
+    conn = db.backend.connect()
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.close()
+    print(f"{args.path}: recipes={ds.recipes}, users={ds.users}, ingredients={ds.ingredients}, "
+          f"{time.perf_counter() - started:.1f}s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,412 @@
+"""사용자 흐름 단위 HTTP 부하 생성기 (app.py 대상, 라우트별 처리량 / 지연 분위수)
+
+가상 사용자 --users명이 각자 스레드 하나와 keep-alive HTTP 연결 하나로, 흐름(journey)을
+--mix 비율대로 골라 끝나자마자 다음 흐름을 실행한다 (--think-ms로 단계 사이 대기 가능).
+리다이렉트는 브라우저처럼 따라가며, 따라간 요청도 각 라우트 표본으로 센다.
+
+    cook   : 로그인 → 냉장고 재료 추가 → 냉장고 검색 → 레시피 상세 → 즐겨찾기 → 댓글
+    browse : 로그인 → 메인 → 키워드 검색 → 레시피 상세
+    signup : 회원가입 → 로그인 → 냉장고 재료 추가 3번 → 냉장고 검색 → 레시피 상세
+
+--url을 주지 않으면 bench.datagen 합성 데이터(--recipes, --seed) 복사본 SQLite DB로
+app.py를 별도 프로세스(werkzeug 스레드 서버)에 띄워 측정한다. --url로 이미 떠 있는
+서버(gunicorn 등, Oracle 포함)를 겨눌 때도 cook / browse는 같은 (--recipes, --seed)의
+datagen 사용자(user1.., 비밀번호 bench)로 로그인하므로 그 데이터가 들어 있어야 한다.
+
+    python -m bench.loadgen --recipes 10000 --users 20 --duration 30 --mix cook=6,browse=3,signup=1
+    python -m bench.loadgen --url http://127.0.0.1:8000 --users 50 --journeys 2000 --out load.json
+"""
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.cookies import SimpleCookie
+from urllib.parse import quote, urlencode, urlsplit
+
+from bench import datagen
+from bench.suite import git_commit, prepare_data
+
+RECIPE_LINK = re.compile(r'href="/recipe/(\d+)"')
+REDIRECTS = (301, 302, 303, 307, 308)
+
+class JourneyFailed(Exception):
+    pass
+
+class Recorder:
+    """스레드 하나의 표본 (라우트별 지연 목록 / 오류 수), 끝난 뒤 merge"""
+    def __init__(self, measure_from):
+        self.measure_from = measure_from
+        self.routes = {}
+        self.journeys = {}
+
+    def _add(self, table, name, started, elapsed, error):
+        if started < self.measure_from:
+            return
+        entry = table.setdefault(name, [[], 0])
+        if error:
+            entry[1] += 1
+        else:
+            entry[0].append(elapsed)
+
+    def request(self, route, started, elapsed, error):
+        self._add(self.routes, route, started, elapsed, error)
+
+    def journey(self, name, started, elapsed, error):
+        self._add(self.journeys, name, started, elapsed, error)
+
+    def merge(self, other):
+        for mine, theirs in ((self.routes, other.routes), (self.journeys, other.journeys)):
+            for name, (times, errors) in theirs.items():
+                entry = mine.setdefault(name, [[], 0])
+                entry[0].extend(times)
+                entry[1] += errors
+
+def route_of(method, path):
+    """요청 경로 → 라우트 이름 (ID는 <id>로, 검색은 냉장고 모드만 구분)"""
+    parts = urlsplit(path)
+    route = re.sub(r'/\d+', '/<id>', parts.path)
+    if route == '/search' and 'mode=fridge' in parts.query:
+        route += '?mode=fridge'
+    return f"{method} {route}"
+
+class VirtualUser:
+    def __init__(self, host, port, recorder, rnd, think, timeout):
+        self.host = host
+        self.port = port
+        self.recorder = recorder
+        self.rnd = rnd
+        self.think = think
+        self.timeout = timeout
+        self.conn = None
+        self.cookies = {}
+
+    def new_session(self):
+        self.cookies.clear()
+
+    def get(self, path, expect=None):
+        return self.request('GET', path, expect=expect)
+
+    def post(self, path, form=None, expect=None):
+        return self.request('POST', path, form or {}, expect)
+
+    def request(self, method, path, form=None, expect=None):
+        """요청 한 번 (리다이렉트는 따라감), 최종 응답 본문 반환
+
+        expect: 첫 응답이 이 경로로 시작하는 곳으로 리다이렉트해야 성공 (로그인 / 가입 확인용)
+        """
+        if self.think:
+            time.sleep(self.think * self.rnd.uniform(0.5, 1.5))
+        headers = {}
+        body = None
+        if form is not None:
+            body = urlencode(form)
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f"{k}={v}" for k, v in self.cookies.items())
+
+        route = route_of(method, path)
+        started = time.perf_counter()
+        try:
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self.conn.request(method, path, body, headers)
+            resp = self.conn.getresponse()
+            data = resp.read()
+        except (OSError, http.client.HTTPException) as e:
+            self.recorder.request(route, started, time.perf_counter() - started, True)
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+            raise JourneyFailed(f"{route}: {e}")
+        elapsed = time.perf_counter() - started
+
+        for header in resp.headers.get_all('Set-Cookie') or ():
+            for name, morsel in SimpleCookie(header).items():
+                if morsel.value and morsel['max-age'] != '0':
+                    self.cookies[name] = morsel.value
+                else:
+                    self.cookies.pop(name, None)
+
+        location = resp.getheader('Location') if resp.status in REDIRECTS else None
+        target = None
+        if location:
+            parts = urlsplit(location)
+            target = parts.path + (f"?{parts.query}" if parts.query else '')
+        failed = resp.status >= 400 or (expect is not None and not (target or '').startswith(expect))
+        self.recorder.request(route, started, elapsed, failed)
+        if failed:
+            raise JourneyFailed(f"{route}: HTTP {resp.status} {location or ''}".strip())
+        if target:
+            return self.get(target)
+        return data.decode('utf-8', 'replace')
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+
+class Scenario:
+    """흐름 정의와 흐름에 쓰는 입력값 선택 (가상 사용자별 rnd 사용)"""
+    def __init__(self, ds, token):
+        self.ds = ds
+        self.token = token
+        self.user_weights = datagen._zipf_cum_weights(ds.users, 0.8)
+        self.ing_weights = datagen._zipf_cum_weights(ds.ingredients)
+
+    def existing_user(self, rnd):
+        return self.ds.user_id(rnd.choices(range(1, self.ds.users + 1), cum_weights=self.user_weights)[0])
+
+    def ingredient(self, rnd):
+        return self.ds.ingredient_name(rnd.choices(range(1, self.ds.ingredients + 1),
+                                                   cum_weights=self.ing_weights)[0])
+
+    def recipe_from(self, page, rnd):
+        """결과 화면의 레시피 링크 중 하나 (없으면 임의 레시피)"""
+        ids = RECIPE_LINK.findall(page)
+        return int(rnd.choice(ids[:20])) if ids else rnd.randint(1, self.ds.recipes)
+
+    def login(self, vu, user_id, password):
+        vu.new_session()
+        vu.post('/login', {'user_id': user_id, 'password': password}, expect='/')
+
+    def cook(self, vu, rnd, n):
+        self.login(vu, self.existing_user(rnd), self.ds.password)
+        vu.post('/fridge', {'name': self.ingredient(rnd), 'quantity': '1'})
+        recipe_id = self.recipe_from(vu.get('/search?mode=fridge'), rnd)
+        vu.get(f"/recipe/{recipe_id}")
+        vu.post(f"/recipe/{recipe_id}/favorite")
+        vu.post(f"/recipe/{recipe_id}/comment", {'content': f"부하 테스트 댓글 {n}"})
+
+    def browse(self, vu, rnd, n):
+        self.login(vu, self.existing_user(rnd), self.ds.password)
+        vu.get('/')
+        keyword = rnd.choice(datagen.TITLE_WORDS)
+        vu.get(f"/recipe/{self.recipe_from(vu.get(f'/search?keyword={quote(keyword)}'), rnd)}")
+
+    def signup(self, vu, rnd, n):
+        vu.new_session()
+        user_id = f"lg{self.token}_{n}"
+        vu.post('/register', {'user_id': user_id, 'password': 'loadgen', 'nickname': user_id},
+                expect='/login')
+        self.login(vu, user_id, 'loadgen')
+        for _ in range(3):
+            vu.post('/fridge', {'name': self.ingredient(rnd), 'quantity': '1'})
+        vu.get(f"/recipe/{self.recipe_from(vu.get('/search?mode=fridge'), rnd)}")
+
+JOURNEYS = ('cook', 'browse', 'signup')
+
+def parse_mix(text):
+    """'cook=6,browse=3,signup=1' → {'cook': 6.0, ...}"""
+    mix = {}
+    for item in text.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in JOURNEYS:
+            raise argparse.ArgumentTypeError(f"알 수 없는 흐름: {name} (가능: {', '.join(JOURNEYS)})")
+        try:
+            mix[name] = float(weight or 1)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"비율이 숫자가 아님: {item}")
+    if not any(w > 0 for w in mix.values()):
+        raise argparse.ArgumentTypeError("비율 합이 0")
+    return mix
+
+def run_load(args, host, port):
+    """가상 사용자 스레드 실행, (Recorder 합계, 측정 시간 초, 흐름 실패 예시) 반환"""
+    ds = datagen.describe(args.recipes, args.seed)
+    scenario = Scenario(ds, f"{int(time.time()) % 1000000:06d}")
+    names = list(args.mix)
+    weights = [args.mix[n] for n in names]
+    started = time.perf_counter()
+    measure_from = started + args.warmup
+    deadline = measure_from + args.duration if args.journeys is None else None
+    remaining = [args.journeys]
+    lock = threading.Lock()
+    recorders = []
+    failures = []
+    counter = iter(range(1, 1 << 62))
+
+    def take():
+        if deadline is not None:
+            return time.perf_counter() < deadline
+        with lock:
+            if remaining[0] <= 0:
+                return False
+            remaining[0] -= 1
+            return True
+
+    def worker(index):
+        rnd = random.Random(f"{args.seed}-{index}")
+        recorder = Recorder(measure_from)
+        recorders.append(recorder)
+        vu = VirtualUser(host, port, recorder, rnd, args.think_ms / 1000, args.timeout)
+        try:
+            while take():
+                name = rnd.choices(names, weights)[0]
+                with lock:
+                    n = next(counter)
+                t0 = time.perf_counter()
+                try:
+                    getattr(scenario, name)(vu, rnd, n)
+                    recorder.journey(name, t0, time.perf_counter() - t0, False)
+                except JourneyFailed as e:
+                    recorder.journey(name, t0, time.perf_counter() - t0, True)
+                    if len(failures) < 10:
+                        failures.append(f"{name}: {e}")
+        finally:
+            vu.close()
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(args.users)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    finished = time.perf_counter()
+
+    total = Recorder(measure_from)
+    for recorder in recorders:
+        total.merge(recorder)
+    return total, max(finished - measure_from, 0.001), failures
+
+def _percentile(times, p):
+    """정렬된 목록의 nearest-rank 분위수"""
+    return times[max(0, math.ceil(len(times) * p / 100) - 1)]
+
+def summarize(table, seconds):
+    result = {}
+    for name in sorted(table):
+        times, errors = table[name]
+        times.sort()
+        row = {'count': len(times), 'errors': errors,
+               'per_sec': round((len(times) + errors) / seconds, 2) if seconds else None}
+        if times:
+            row.update({f"p{p}_ms": round(_percentile(times, p) * 1000, 3) for p in (50, 95, 99)})
+            row['max_ms'] = round(times[-1] * 1000, 3)
+        result[name] = row
+    return result
+
+def print_table(title, rows):
+    print(f"\n{title:<36} | {'count':>7} {'err':>5} {'/s':>8} | {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    for name, r in rows.items():
+        print(f"{name:<36} | {r['count']:>7} {r['errors']:>5} {r['per_sec']:>8.2f} | "
+              + ' '.join(f"{r[k]:>9.2f}" if k in r else f"{'-':>9}" for k in ('p50_ms', 'p95_ms', 'p99_ms', 'max_ms')))
+
+def start_server(args):
+    """합성 데이터 복사본 DB로 app.py 서버 프로세스 시작, (프로세스, 포트, 복사본 경로) 반환"""
+    work = prepare_data(args.recipes, args.seed, args.data_dir)
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+    cmd = [sys.executable, '-m', 'bench.loadgen', '--serve', str(port), '--db-path', work]
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL,
+                            stderr=None if args.verbose else subprocess.DEVNULL,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    deadline = time.monotonic() + 60
+    while True:
+        if proc.poll() is not None:
+            raise RuntimeError(f"서버 시작 실패 (종료 코드 {proc.returncode}, --verbose로 오류 확인)")
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                break
+        except OSError:
+            if time.monotonic() > deadline:
+                proc.kill()
+                raise RuntimeError("서버가 60초 안에 뜨지 않음")
+            time.sleep(0.2)
+    return proc, port, work
+
+def serve(args):
+    """(하위 프로세스) 복사본 DB로 app.py를 werkzeug 스레드 서버로 실행"""
+    import logging
+
+    from bench.common import use_local_db
+
+    use_local_db(args.db_path)
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    from werkzeug.serving import run_simple
+
+    from app import app
+    run_simple('127.0.0.1', args.serve, app, threaded=True)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help='이미 떠 있는 서버 주소 (없으면 합성 데이터로 직접 띄움)')
+    parser.add_argument('--users', type=int, default=10, help='동시 가상 사용자 수')
+    parser.add_argument('--duration', type=float, default=30, help='측정 시간 (초)')
+    parser.add_argument('--journeys', type=int, help='시간 대신 이 횟수만큼 흐름 실행')
+    parser.add_argument('--warmup', type=float, default=3, help='집계에서 뺄 시작 구간 (초)')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('cook=6,browse=3,signup=1'),
+                        help='흐름 비율 (예: cook=6,browse=3,signup=1)')
+    parser.add_argument('--think-ms', type=float, default=0, help='요청 사이 평균 대기 (ms)')
+    parser.add_argument('--timeout', type=float, default=30, help='요청 타임아웃 (초)')
+    parser.add_argument('--recipes', type=int, default=10000, help='합성 데이터 레시피 수')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'recipe_bench'),
+                        help='합성 데이터 DB를 만들어 둘 디렉터리')
+    parser.add_argument('--out', help='결과 JSON 경로')
+    parser.add_argument('--verbose', action='store_true', help='서버 오류 출력 표시')
+    parser.add_argument('--serve', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--db-path', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args)
+        return
+
+    proc = work = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        proc, port, work = start_server(args)
+        host = '127.0.0.1'
+    if args.journeys is not None:
+        args.warmup = 0
+    try:
+        print(f"{host}:{port} users={args.users} mix={args.mix} "
+              + (f"journeys={args.journeys}" if args.journeys is not None
+                 else f"duration={args.duration}s (+warmup {args.warmup}s)"))
+        total, seconds, failures = run_load(args, host, port)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(work + suffix):
+                    os.remove(work + suffix)
+
+    routes = summarize(total.routes, seconds)
+    journeys = summarize(total.journeys, seconds)
+    requests = sum(r['count'] + r['errors'] for r in routes.values())
+    print_table('route (ms)', routes)
+    print_table('journey (ms)', journeys)
+    print(f"\n{seconds:.1f}s, 요청 {requests}개 ({requests / seconds:.1f}/s), "
+          f"흐름 {sum(j['count'] for j in journeys.values())}개 완료 / "
+          f"{sum(j['errors'] for j in journeys.values())}개 실패")
+    for failure in failures:
+        print(f"  실패 예: {failure}")
+
+    if args.out:
+        report = {
+            'meta': {'commit': git_commit(), 'date': datetime.now().isoformat(timespec='seconds'),
+                     'target': args.url or f"sqlite synthetic recipes={args.recipes} seed={args.seed}",
+                     'users': args.users, 'mix': args.mix, 'think_ms': args.think_ms,
+                     'seconds': round(seconds, 3)},
+            'routes': routes,
+            'journeys': journeys,
+        }
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=1)
+        print(f"결과 저장: {args.out}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""영양 정보 범위 검색: SQL 조건 vs NumPy 열 저장소 비교
+
+SQL   : 범위 조건마다 R.info_* >= / <= 조건을 붙여 DB가 RECIPE 전체를 훑는 방식
+NumPy : catalog.nutrition 열 저장소에서 불리언 마스크로 후보 ID를 구한 뒤 IN 조건
+
+    python -m bench.nutrition_filter --recipes 1000000
+"""
+import argparse
+import random
+import statistics
+
+from bench.common import timed, use_local_db
+
+db = use_local_db()
+from catalog import nutrition
+from catalog.nutrition import nutrition_store
+
+QUERIES = {
+    '칼로리 1개 범위': dict(calories_min=200, calories_max=260),
+    '좁은 범위 2개': dict(calories_min=200, calories_max=202, protein_min=40, protein_max=41),
+    '3개 범위': dict(calories_max=500, protein_min=30, fat_max=15),
+    '10개 범위 전부': dict(calories_min=100, calories_max=700, carbohydrate_min=10, carbohydrate_max=90,
+                     protein_min=5, protein_max=60, fat_min=1, fat_max=40,
+                     natrium_min=100, natrium_max=1500),
+    '키워드 + 범위': dict(keyword='볶음', calories_max=400, natrium_max=900),
+}
+
+def load_recipes(n, seed=0):
+    """n개 레시피를 한 번에 INSERT (영양 정보는 10%가 NULL)"""
+    rnd = random.Random(seed)
+    names = ['김치', '된장', '볶음', '찌개', '구이', '무침', '조림', '국', '밥', '전']
+    limits = [900, 120, 80, 60, 2500]
+
+    def value(limit):
+        return None if rnd.random() < 0.1 else rnd.randint(0, limit)
+
+    db.register_user('bench', 'bench', 'bench')
+    conn = db.get_db_conn()
+    cursor = conn.cursor()
+    try:
+        rows = []
+        for i in range(n):
+            title = f"{rnd.choice(names)}{rnd.choice(names)} {i}"
+            rows.append((title, 'bench', 1, 1, *(value(limit) for limit in limits)))
+            if len(rows) == 50000 or i == n - 1:
+                cursor.executemany("""
+                    INSERT INTO RECIPE (title, author_id, recipe_type_id, recipe_way_id,
+                        info_calories, info_carbohydrate, info_protein, info_fat, info_natrium)
+                    VALUES (:1, :2, :3, :4, :5, :6, :7, :8, :9)
+                """, rows)
+                rows = []
+        conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+
+def measure(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        db.search_cache.clear()   # 검색 결과 캐시 없이 측정
+        result, ms = timed(fn)
+        times.append(ms)
+    return result, statistics.median(times)
+
+def ranges_of(filters):
+    return {f"info_{name}": (filters.get(f"{name}_min"), filters.get(f"{name}_max"))
+            for name in ('calories', 'carbohydrate', 'protein', 'fat', 'natrium')
+            if f"{name}_min" in filters or f"{name}_max" in filters}
+
+def sql_matching(ranges):
+    """범위 조건만으로 recipe_id 목록 조회 (SQL 비교 기준)"""
+    sql = "SELECT recipe_id FROM RECIPE WHERE 1=1"
+    params = []
+    for col, (lo, hi) in ranges.items():
+        if lo is not None:
+            params.append(lo)
+            sql += f" AND {col} >= :{len(params)}"
+        if hi is not None:
+            params.append(hi)
+            sql += f" AND {col} <= :{len(params)}"
+    conn = db.get_db_conn()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql + " ORDER BY recipe_id", params)
+        return [row[0] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+        conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--recipes', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    if not nutrition.available:
+        parser.error("NumPy가 설치되어 있지 않습니다")
+
+    load_recipes(args.recipes)
+    _, load_ms = timed(nutrition_store.ensure_loaded, db._load_recipe_nutrition)
+    print(f"recipes={args.recipes}, 열 저장소 생성 {load_ms:.0f}ms, repeat={args.repeat}")
+    print("filter: 범위 조건만으로 recipe_id 목록, search: search_recipes 전체 결과, page: 첫 페이지")
+    print(f"{'query':<14} | {'matches':>8} | {'filter SQL':>10} {'NumPy':>7} | "
+          f"{'search SQL':>10} {'NumPy':>7} | {'page SQL':>8} {'NumPy':>7}")
+    for name, filters in QUERIES.items():
+        ranges = ranges_of(filters)
+        sql_ids, sql_filter_ms = measure(lambda: sql_matching(ranges), args.repeat)
+        np_ids, np_filter_ms = measure(lambda: nutrition_store.matching(ranges), args.repeat)
+        assert sql_ids == np_ids, name
+
+        row = {}
+        for mode, enabled in (('sql', False), ('numpy', True)):
+            nutrition.available = enabled
+            matches, all_ms = measure(lambda: db.search_recipes(**filters), args.repeat)
+            page, page_ms = measure(lambda: db.search_recipes_page(**filters), args.repeat)
+            row[mode] = (matches, all_ms, page, page_ms)
+        nutrition.available = True
+        assert row['sql'][0] == row['numpy'][0] and row['sql'][2].items == row['numpy'][2].items, name
+        print(f"{name:<14} | {len(row['sql'][0]):>8} | {sql_filter_ms:>10.1f} {np_filter_ms:>7.1f} | "
+              f"{row['sql'][1]:>10.1f} {row['numpy'][1]:>7.1f} | {row['sql'][3]:>8.1f} {row['numpy'][3]:>7.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""레시피 저장(create_recipe / update_recipe) 왕복 횟수, 지연 시간 비교
+
+before: 재료마다 SELECT(+INSERT), 재료 연결/조리 순서마다 INSERT 하던 기존 방식
+after : database.py의 배열 바인드(executemany) + 재료 이름 일괄 조회 방식
+
+    python -m bench.recipe_write --rtt-ms 0.5
+"""
+import argparse
+import statistics
+
+from bench.common import RoundTripCounter, timed, use_local_db
+
+db = use_local_db()
+backend = db.backend
+
+def legacy_create_recipe(user_id, title, description, type_id, way_id,
+                         cal, carbo, protein, fat, natrium,
+                         ingredients_data, steps_data):
+    """변경 전 create_recipe (행 단위 SQL) - 비교용"""
+    conn = db.get_db_conn()
+    cursor = conn.cursor()
+    try:
+        recipe_id = backend.insert_returning_id(cursor, """
+            INSERT INTO RECIPE (
+                title, description, author_id, recipe_type_id, recipe_way_id,
+                info_calories, info_carbohydrate, info_protein, info_fat, info_natrium
+            ) VALUES (:1, :2, :3, :4, :5, :6, :7, :8, :9, :10)
+        """, [title, description, user_id, type_id, way_id, cal, carbo, protein, fat, natrium], 'recipe_id')
+        for ing in ingredients_data:
+            cursor.execute("SELECT ingredient_id FROM INGREDIENT WHERE name = :1", (ing['name'],))
+            res = cursor.fetchone()
+            if res:
+                ing_id = res[0]
+            else:
+                ing_id = backend.insert_returning_id(cursor, "INSERT INTO INGREDIENT (name) VALUES (:1)", [ing['name']], 'ingredient_id')
+            cursor.execute("INSERT INTO RECIPE_INGREDIENT (recipe_id, ingredient_id, amount) VALUES (:1, :2, :3)",
+                           (recipe_id, ing_id, ing['amount']))
+        for idx, instruction in enumerate(steps_data):
+            cursor.execute("INSERT INTO COOKING_STEP (recipe_id, step_number, instruction) VALUES (:1, :2, :3)",
+                           (recipe_id, idx + 1, instruction))
+        conn.commit()
+        return recipe_id
+    finally:
+        cursor.close()
+        conn.close()
+
+def make_recipe(n_ing, n_steps, seq):
+    # 절반은 기존 재료, 절반은 새 재료
+    ingredients = [{'name': f"재료{i}" if i % 2 else f"새재료{seq}_{i}", 'amount': f"{i}g"} for i in range(n_ing)]
+    steps = [f"{i + 1}. 조리 단계 {i + 1}" for i in range(n_steps)]
+    return ingredients, steps
+
+def run(fn, n_ing, n_steps, repeat, rtt_ms):
+    trips, times = [], []
+    for seq in range(repeat):
+        ingredients, steps = make_recipe(n_ing, n_steps, f"{fn.__name__}{n_ing}_{seq}")
+        with RoundTripCounter(db, rtt_ms) as counter:
+            recipe_id, ms = timed(fn, 'bench', '벤치 레시피', '', 1, 1,
+                                  500, 50, 20, 10, 800, ingredients, steps)
+        assert recipe_id
+        trips.append(counter.count)
+        times.append(ms)
+    return max(trips), statistics.median(times)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rtt-ms', type=float, default=0.5, help='왕복당 흉내 낼 네트워크 지연 (ms)')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    db.register_user('bench', 'bench', 'bench')
+    for i in range(1, 40, 2):
+        db.add_ingredient('bench', f"재료{i}", '1')
+
+    print(f"rtt={args.rtt_ms}ms, repeat={args.repeat}")
+    print(f"{'ingredients':>11} {'steps':>5} | {'before trips':>12} {'before ms':>9} | {'after trips':>11} {'after ms':>8}")
+    for n_ing, n_steps in [(3, 3), (15, 10), (30, 20)]:
+        b_trips, b_ms = run(legacy_create_recipe, n_ing, n_steps, args.repeat, args.rtt_ms)
+        a_trips, a_ms = run(db.create_recipe, n_ing, n_steps, args.repeat, args.rtt_ms)
+        print(f"{n_ing:>11} {n_steps:>5} | {b_trips:>12} {b_ms:>9.2f} | {a_trips:>11} {a_ms:>8.2f}")
+
+if __name__ == '__main__':
+    main()
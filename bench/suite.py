@@ -0,0 +1,318 @@
+"""database.py 공개 함수 마이크로 벤치마크 (합성 데이터 규모별)
+
+규모(레시피 수)마다 bench.datagen으로 만든 SQLite 파일 DB(--data-dir에 규모 / seed별로
+한 번 만들어 두고 실행마다 복사본 사용)를 별도 프로세스에서 열고, 공개 함수마다
+준비(시간 제외) → 실행을 --repeat번 반복해 중앙값 / p95 / 최솟값, 첫 호출 시간
+(메모리 색인 로드 포함), 호출당 DB 왕복 수를 잰다. 상세 / 검색 결과 캐시는 실행마다
+비워 DB 경로를 잰다 (--warm-caches면 그대로 둠). 쓰기 함수도 복사본 DB에서 실행한다.
+
+결과는 --out(기본 bench/results/<시각>-<커밋>.json)에 저장하며, 두 결과를 비교할 수 있다.
+
+    python -m bench.suite --scales 10000 100000 1000000
+    python -m bench.suite --compare bench/results/before.json bench/results/after.json
+"""
+import argparse
+import inspect
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from bench import datagen
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+def build_cases(db, ds, rnd):
+    """[(이름, 함수, 준비 함수 또는 None)], 준비 함수 prepare(i)는 호출 인자 튜플 반환
+
+    이름의 [...]는 같은 함수의 다른 조건 (비교 시 이름 단위로 맞춤)
+    """
+    heavy = ds.user_id(1)     # 작성 / 활동량 Zipf 1순위 사용자
+
+    def user():
+        return ds.user_id(rnd.randint(1, ds.users))
+
+    def recipe():
+        return rnd.randint(1, ds.recipes)
+
+    def ingredient(top=50):
+        return ds.ingredient_name(rnd.randint(1, min(top, ds.ingredients)))
+
+    def recipe_fields(i):
+        ings = [{'name': ds.ingredient_name(r), 'amount': '1큰술'}
+                for r in rnd.sample(range(1, min(60, ds.ingredients) + 1), 6)]
+        ings.append({'name': f"벤치재료{i}", 'amount': '약간'})
+        steps = [f"{n}단계 조리" for n in range(1, 6)]
+        return (f"벤치 레시피 {i}", '설명', 1, 1, 300, 40, 20, 10, 500, ings, steps)
+
+    def comment_of(user_id, content):
+        conn = db.get_db_conn()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT comment_id FROM COMMENT_T WHERE user_id = :1 AND content = :2", (user_id, content))
+            return cursor.fetchone()[0]
+        finally:
+            cursor.close()
+            conn.close()
+
+    def prepare_delete_ingredient(i):
+        u = user()
+        db.add_ingredient(u, f"삭제재료{i}", '1')
+        ing = next(x for x in db.get_user_ingredients(u) if x['ingredientname'] == f"삭제재료{i}")
+        return u, ing['user_ingredient_id']
+
+    def prepare_delete_user(i):
+        u = f"bench_del{i}"
+        db.register_user(u, 'pw', f"탈퇴{i}")
+        for n in range(3):
+            db.create_recipe(u, *recipe_fields(f"{i}_{n}"))
+        db.add_comment(u, recipe(), '탈퇴 전 댓글')
+        return (u,)
+
+    def prepare_delete_comment(i):
+        u = user()
+        db.add_comment(u, recipe(), f"삭제댓글{i}")
+        return comment_of(u, f"삭제댓글{i}"), u
+
+    def iterate(fn):
+        def consume(*args, **kwargs):
+            return sum(1 for _ in fn(*args, **kwargs))
+        return consume
+
+    def close_conn():
+        db.get_db_conn().close()
+
+    cases = [
+        ('get_db_conn', close_conn, None),
+        ('get_pool_stats', db.get_pool_stats, None),
+        ('get_cache_stats', db.get_cache_stats, None),
+        ('next_ids', db.next_ids, lambda i: ('COMMENT_T', 10)),
+        ('next_id', db.next_id, lambda i: ('RECIPE',)),
+        ('register_user', db.register_user, lambda i: (f"bench_new{i}", 'pw', f"새사용자{i}")),
+        ('login_user', db.login_user, lambda i: (user(), ds.password)),
+        ('add_ingredient', db.add_ingredient, lambda i: (user(), ingredient(200), '2')),
+        ('delete_ingredient', db.delete_ingredient, prepare_delete_ingredient),
+        ('get_user_ingredients', db.get_user_ingredients, lambda i: (user(),)),
+        ('get_my_recipes', db.get_my_recipes, lambda i: (user(),)),
+        ('get_my_recipes[heavy]', db.get_my_recipes, lambda i: (heavy,)),
+        ('get_my_comments', db.get_my_comments, lambda i: (user(),)),
+        ('get_my_comments[heavy]', db.get_my_comments, lambda i: (heavy,)),
+        ('get_my_favorites', db.get_my_favorites, lambda i: (user(),)),
+        ('get_user_info', db.get_user_info, lambda i: (user(),)),
+        ('update_nickname', db.update_nickname, lambda i: (user(), f"바뀐닉{i}")),
+        ('update_password', db.update_password, lambda i: (user(), ds.password)),
+        ('delete_user', db.delete_user, prepare_delete_user),
+        ('get_user_purge_status', db.get_user_purge_status, lambda i: (user(),)),
+        ('resume_user_purges', db.resume_user_purges, None),
+        ('search_recipes[keyword]', db.search_recipes, lambda i: ('볶음',)),
+        ('search_recipes[author]', lambda: db.search_recipes(author='요리사1'), None),
+        ('search_recipes[way+type]', lambda: db.search_recipes(recipe_way='볶기', recipe_type='반찬'), None),
+        ('search_recipes[nutrition]', lambda: db.search_recipes(calories_max=300, protein_min=40), None),
+        ('search_recipes[include]', lambda: db.search_recipes(include_ingredient=['계란', '양파']), None),
+        ('search_recipes[include_or+exclude]', lambda: db.search_recipes(
+            include_ingredient=['두부', '김치'], include_mode='or', exclude_ingredient=['돼지고기']), None),
+        ('search_recipes[combined]', lambda: db.search_recipes(
+            keyword='찌개', calories_max=500, include_ingredient='마늘', exclude_ingredient='우유'), None),
+        ('iter_search_recipes', lambda: sum(1 for _ in db.iter_search_recipes(keyword='볶음')), None),
+        ('refresh_lookups', db.refresh_lookups, None),
+        ('get_id_by_name', db.get_id_by_name, lambda i: ('RECIPE_WAY', 'recipe_way_id', 'way_name', '끓이기')),
+        ('create_recipe', db.create_recipe, lambda i: (user(), *recipe_fields(i))),
+        ('update_recipe', db.update_recipe, lambda i: (recipe(), *recipe_fields(i))),
+        ('delete_recipe', db.delete_recipe, lambda i: (db.create_recipe(user(), *recipe_fields(f"d{i}")),)),
+        ('get_recipe_detail', db.get_recipe_detail, lambda i: (recipe(),)),
+        ('get_top5_favorites', db.get_top5_favorites, None),
+        ('get_top5_comments', db.get_top5_comments, None),
+        ('get_dashboard', db.get_dashboard, lambda i: (user(),)),
+        ('get_dashboard[heavy]', db.get_dashboard, lambda i: (heavy,)),
+        ('find_recipes_by_fridge', db.find_recipes_by_fridge, lambda i: (user(),)),
+        ('iter_recipes_by_fridge', iterate(db.iter_recipes_by_fridge), lambda i: (user(),)),
+        ('search_recipes_page', lambda: db.search_recipes_page(keyword='볶음'), None),
+        ('find_recipes_by_fridge_page', db.find_recipes_by_fridge_page, lambda i: (user(),)),
+        ('find_recipes_by_fridge_ranked', db.find_recipes_by_fridge_ranked, lambda i: (user(), 2)),
+        ('add_comment', db.add_comment, lambda i: (user(), recipe(), f"벤치 댓글 {i}")),
+        ('delete_comment', db.delete_comment, prepare_delete_comment),
+        ('toggle_favorite', db.toggle_favorite, lambda i: (recipe(), user())),
+        ('is_favorited', db.is_favorited, lambda i: (recipe(), user())),
+    ]
+    return cases
+
+def public_functions(db):
+    return sorted(name for name, fn in vars(db).items()
+                  if not name.startswith('_') and inspect.isfunction(fn) and fn.__module__ == db.__name__)
+
+def run_scale(args):
+    """(하위 프로세스) 한 규모의 복사본 DB에서 모든 case 측정, 결과 dict 반환"""
+    from bench.common import RoundTripCounter, use_local_db
+
+    db = use_local_db(args.db_path)
+    ds = datagen.describe(args.run_scale, args.seed)
+    rnd = random.Random(args.seed)
+    cases = build_cases(db, ds, rnd)
+    results = {}
+    with RoundTripCounter(db) as counter:
+        for name, fn, prepare in cases:
+            if args.only and not any(name.startswith(p) for p in args.only):
+                continue
+            times = []
+            trips = []
+            first_ms = None
+            for i in range(args.warmup + args.repeat):
+                call_args = prepare(i) if prepare else ()
+                if not args.warm_caches:
+                    db.detail_cache.clear()
+                    db.search_cache.clear()
+                before = counter.count
+                start = time.perf_counter()
+                fn(*call_args)
+                ms = (time.perf_counter() - start) * 1000
+                if first_ms is None:
+                    first_ms = ms
+                if i >= args.warmup:
+                    times.append(ms)
+                    trips.append(counter.count - before)
+            times.sort()
+            results[name] = {
+                'median_ms': round(statistics.median(times), 4),
+                'p95_ms': round(times[max(0, int(len(times) * 0.95) - 1)], 4),
+                'min_ms': round(times[0], 4),
+                'first_ms': round(first_ms, 4),
+                'round_trips': statistics.mean(trips),
+            }
+            if args.verbose:
+                print(f"  {name:<38} {results[name]['median_ms']:>10.3f}ms", file=sys.stderr)
+
+    covered = {name.split('[')[0] for name, _, _ in cases}
+    return {
+        'recipes': ds.recipes, 'users': ds.users, 'ingredients': ds.ingredients,
+        'cases': results,
+        'uncovered': [name for name in public_functions(db) if name not in covered],
+    }
+
+def prepare_data(scale, seed, data_dir):
+    """규모 / seed별 원본 DB를 (없으면 만들어) 실행용 복사본 경로 반환"""
+    os.makedirs(data_dir, exist_ok=True)
+    pristine = os.path.join(data_dir, f"synthetic_{scale}_s{seed}.db")
+    if not os.path.exists(pristine):
+        print(f"[{scale}] 합성 데이터 생성: {pristine}")
+        partial = pristine + '.partial'
+        if os.path.exists(partial):
+            os.remove(partial)
+        subprocess.run([sys.executable, '-m', 'bench.datagen', '--recipes', str(scale),
+                        '--seed', str(seed), '--path', partial], check=True)
+        os.replace(partial, pristine)
+    work = os.path.join(data_dir, f"work_{scale}_s{seed}.db")
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(work + suffix):
+            os.remove(work + suffix)
+    shutil.copyfile(pristine, work)
+    return work
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True, cwd=os.path.dirname(__file__)).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_all(args):
+    commit = git_commit()
+    report = {
+        'meta': {
+            'commit': commit, 'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(), 'platform': platform.platform(),
+            'seed': args.seed, 'repeat': args.repeat, 'warmup': args.warmup,
+            'warm_caches': args.warm_caches,
+        },
+        'scales': {},
+    }
+    for scale in args.scales:
+        work = prepare_data(scale, args.seed, args.data_dir)
+        cmd = [sys.executable, '-m', 'bench.suite', '--run-scale', str(scale), '--db-path', work,
+               '--seed', str(args.seed), '--repeat', str(args.repeat), '--warmup', str(args.warmup)]
+        if args.warm_caches:
+            cmd.append('--warm-caches')
+        if args.only:
+            cmd += ['--only', *args.only]
+        if args.verbose:
+            cmd.append('--verbose')
+        print(f"[{scale}] 측정 중...")
+        out = subprocess.run(cmd, stdout=subprocess.PIPE, text=True, check=True,
+                             stderr=None if args.verbose else subprocess.DEVNULL).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+        report['scales'][str(scale)] = result
+        print_scale(scale, result)
+        if not args.keep_work:
+            os.remove(work)
+
+    out_path = args.out or os.path.join(
+        RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}-{commit or 'nogit'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    with open(out_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=1)
+    print(f"결과 저장: {out_path}")
+
+def print_scale(scale, result):
+    print(f"recipes={scale}, users={result['users']}, ingredients={result['ingredients']}")
+    print(f"{'function':<38} | {'median':>9} {'p95':>9} {'min':>9} {'first':>9} | {'trips':>5}")
+    for name, r in result['cases'].items():
+        print(f"{name:<38} | {r['median_ms']:>9.3f} {r['p95_ms']:>9.3f} {r['min_ms']:>9.3f} "
+              f"{r['first_ms']:>9.3f} | {r['round_trips']:>5.1f}")
+    if result['uncovered']:
+        print(f"측정하지 않은 공개 함수: {', '.join(result['uncovered'])}")
+
+def compare(old_path, new_path, threshold):
+    """두 결과 파일의 중앙값 비교 (threshold 비율 이상 달라진 항목 표시)"""
+    with open(old_path, encoding='utf-8') as f:
+        old = json.load(f)
+    with open(new_path, encoding='utf-8') as f:
+        new = json.load(f)
+    print(f"old: {old['meta'].get('commit')} ({old['meta']['date']})  "
+          f"new: {new['meta'].get('commit')} ({new['meta']['date']})")
+    for scale in old['scales'].keys() & new['scales'].keys():
+        print(f"\nrecipes={scale}")
+        print(f"{'function':<38} | {'old ms':>9} {'new ms':>9} {'ratio':>6} | {'trips':>11}")
+        old_cases = old['scales'][scale]['cases']
+        for name, n in new['scales'][scale]['cases'].items():
+            o = old_cases.get(name)
+            if o is None:
+                continue
+            ratio = n['median_ms'] / o['median_ms'] if o['median_ms'] else float('inf')
+            mark = '느려짐' if ratio > 1 + threshold else '빨라짐' if ratio < 1 - threshold else ''
+            print(f"{name:<38} | {o['median_ms']:>9.3f} {n['median_ms']:>9.3f} {ratio:>6.2f} | "
+                  f"{o['round_trips']:>5.1f}->{n['round_trips']:<5.1f} {mark}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[10000, 100000, 1000000], help='레시피 수')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=20, help='함수마다 측정 횟수')
+    parser.add_argument('--warmup', type=int, default=3, help='측정 전 실행 횟수 (첫 실행은 색인 로드 포함)')
+    parser.add_argument('--warm-caches', action='store_true', help='상세 / 검색 결과 캐시를 비우지 않음')
+    parser.add_argument('--only', nargs='+', help='이 이름으로 시작하는 case만 측정')
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'recipe_bench'),
+                        help='합성 DB를 만들어 둘 디렉터리')
+    parser.add_argument('--keep-work', action='store_true', help='측정에 쓴 복사본 DB를 지우지 않음')
+    parser.add_argument('--out', help='결과 JSON 경로')
+    parser.add_argument('--verbose', action='store_true')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='두 결과 JSON 비교')
+    parser.add_argument('--threshold', type=float, default=0.1, help='--compare에서 표시할 변화 비율')
+    parser.add_argument('--run-scale', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--db-path', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare, args.threshold)
+    elif args.run_scale:
+        print(json.dumps(run_scale(args), ensure_ascii=False))
+    else:
+        run_all(args)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,5 @@
+"""프로세스 내 카탈로그 인덱스/캐시
+
+database.py가 쓰기 경로에서 직접 갱신하는 메모리 자료구조 모음.
+DB가 원본이며, 여기 있는 구조는 언제든 DB에서 다시 만들 수 있다.
+"""
@@ -0,0 +1,43 @@
+"""블록 단위 ID 할당 (hi/lo)
+
+테이블마다 DB 시퀀스에서 block_size개짜리 ID 블록을 받아 두고, 블록을
+다 쓸 때까지는 DB 왕복 없이 메모리에서 다음 ID를 내준다. 블록은
+프로세스(워커)마다 따로 받으므로 워커끼리 ID가 겹치지 않으며, 프로세스가
+끝나면 쓰지 않은 나머지 ID는 버려진다 (ID에 빈 번호가 생길 수 있음).
+"""
+import threading
+
+class IdBlockAllocator:
+    def __init__(self, block_size=50):
+        self.block_size = block_size
+        self._lock = threading.Lock()   # _locks 보호용
+        self._locks = {}                # name -> 그 name의 블록 락
+        self._blocks = {}               # name -> [다음 ID, 블록 끝(미포함)]
+
+    def _lock_for(self, name):
+        with self._lock:
+            lock = self._locks.get(name)
+            if lock is None:
+                lock = self._locks[name] = threading.Lock()
+            return lock
+
+    def next_ids(self, name, count, fetch_block):
+        """name의 새 ID count개 목록
+
+        남은 블록이 모자라면 fetch_block(name, block_size)로 새 블록의
+        시작 ID를 받는다 (같은 name의 다른 호출만 그동안 기다림).
+        """
+        ids = []
+        with self._lock_for(name):
+            block = self._blocks.get(name)
+            while len(ids) < count:
+                if block is None or block[0] >= block[1]:
+                    start = fetch_block(name, self.block_size)
+                    block = self._blocks[name] = [start, start + self.block_size]
+                take = min(count - len(ids), block[1] - block[0])
+                ids.extend(range(block[0], block[0] + take))
+                block[0] += take
+        return ids
+
+    def next_id(self, name, fetch_block):
+        return self.next_ids(name, 1, fetch_block)[0]
@@ -0,0 +1,157 @@
+"""재료 → 레시피 역색인 (냉장고 파먹기용)
+
+재료 ID마다 그 재료가 필요한 레시피 ID를 정렬된 배열(posting list)로 저장하고,
+레시피마다 필요한 재료 ID 목록을 저장한다. 냉장고 재료들의 posting list만
+훑어서 레시피별로 몇 개가 충족되는지 세므로, 전체 레시피 수가 아니라
+냉장고 재료에 걸린 레시피 수에 비례해 동작한다.
+"""
+import heapq
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import chain
+
+from catalog.rebuild import Rebuildable
+
+class IngredientIndex(Rebuildable):
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings = {}       # ingredient_id -> array('q') (정렬된 recipe_id)
+        self._recipe_ings = {}    # recipe_id -> tuple(ingredient_id, ...)
+        self.loaded = False
+
+    def ensure_loaded(self, load_rows):
+        """처음 사용할 때 load_rows()의 (recipe_id, ingredient_id) 행으로 색인 생성
+
+        읽는 동안 락을 잡고 있으므로, 그 사이에 커밋된 쓰기는 로드가 끝난 뒤
+        set_recipe/remove_recipe로 반영된다.
+        """
+        if self.loaded:
+            return
+        with self._lock:
+            if self.loaded:
+                return
+            self._build(load_rows())
+
+    def rebuild(self, rows):
+        with self._lock:
+            self._build(rows)
+
+    def _build(self, rows):
+        recipe_ings = {}
+        for recipe_id, ing_id in rows:
+            recipe_ings.setdefault(recipe_id, set()).add(ing_id)
+
+        postings = {}
+        for recipe_id in sorted(recipe_ings):
+            for ing_id in recipe_ings[recipe_id]:
+                postings.setdefault(ing_id, array('q')).append(recipe_id)
+
+        self._recipe_ings = {r: tuple(ings) for r, ings in recipe_ings.items()}
+        self._postings = postings
+        self.loaded = True
+        self.built_at = time.monotonic()
+
+    def set_recipe(self, recipe_id, ingredient_ids):
+        """레시피의 재료 목록 교체 (생성/수정 후 호출)"""
+        ings = tuple(set(ingredient_ids))
+        with self._lock:
+            if not self.loaded:
+                return
+            self._log('set_recipe', recipe_id, ings)
+            self._remove(recipe_id)
+            if not ings:
+                return
+            self._recipe_ings[recipe_id] = ings
+            for ing_id in ings:
+                posting = self._postings.setdefault(ing_id, array('q'))
+                pos = bisect_left(posting, recipe_id)
+                if pos == len(posting) or posting[pos] != recipe_id:
+                    posting.insert(pos, recipe_id)
+
+    def remove_recipe(self, recipe_id):
+        """레시피 삭제 후 호출"""
+        with self._lock:
+            if self.loaded:
+                self._log('remove_recipe', recipe_id)
+                self._remove(recipe_id)
+
+    def _remove(self, recipe_id):
+        for ing_id in self._recipe_ings.pop(recipe_id, ()):
+            posting = self._postings.get(ing_id)
+            if posting is None:
+                continue
+            pos = bisect_left(posting, recipe_id)
+            if pos < len(posting) and posting[pos] == recipe_id:
+                del posting[pos]
+            if not posting:
+                del self._postings[ing_id]
+
+    def coverage(self, fridge_ids):
+        """레시피별 냉장고에 있는 재료 수 {recipe_id: count}"""
+        with self._lock:
+            postings = [self._postings[i] for i in set(fridge_ids) if i in self._postings]
+            return Counter(chain.from_iterable(postings))
+
+    def covered_recipes(self, fridge_ids):
+        """냉장고 재료만으로 만들 수 있는 레시피 ID 목록 (정렬)"""
+        counts = self.coverage(fridge_ids)
+        with self._lock:
+            recipe_ings = self._recipe_ings
+            return sorted(r for r, n in counts.items()
+                          if r in recipe_ings and n == len(recipe_ings[r]))
+
+    def ranked_matches(self, fridge_ids, max_missing, limit):
+        """부족한 재료가 max_missing개 이하인 레시피 상위 limit개
+
+        (충족 비율 내림차순, 부족 개수 오름차순, 최신 레시피 순) 정렬이며,
+        후보 전체를 정렬하지 않고 크기 limit의 힙으로 고른다.
+        반환: [(recipe_id, covered, needed, missing_ingredient_ids), ...]
+        """
+        fridge = set(fridge_ids)
+        counts = self.coverage(fridge)
+        with self._lock:
+            recipe_ings = self._recipe_ings
+
+            def candidates():
+                for r, covered in counts.items():
+                    ings = recipe_ings.get(r)
+                    if ings and len(ings) - covered <= max_missing:
+                        yield covered / len(ings), covered - len(ings), r
+
+            result = []
+            for _, _, r in heapq.nlargest(limit, candidates()):
+                missing = [i for i in recipe_ings[r] if i not in fridge]
+                needed = len(recipe_ings[r])
+                result.append((r, needed - len(missing), needed, missing))
+            return result
+
+    def recipes_with(self, ingredient_ids, match_all=True):
+        """재료를 모두(match_all) / 하나라도 포함하는 레시피 ID 목록 (정렬)
+
+        모두 포함은 가장 짧은 posting list에서 시작해 교집합, 하나라도는 합집합
+        """
+        with self._lock:
+            postings = [self._postings.get(i, ()) for i in set(ingredient_ids)]
+            if not postings:
+                return []
+            if match_all:
+                postings.sort(key=len)
+                result = set(postings[0]).intersection(*postings[1:])
+            else:
+                result = set().union(*postings)
+            return sorted(result)
+
+    def without(self, recipe_ids, ingredient_ids):
+        """recipe_ids 중 ingredient_ids 재료를 하나도 쓰지 않는 레시피 (순서 유지)"""
+        with self._lock:
+            excluded = set().union(*(self._postings.get(i, ()) for i in set(ingredient_ids)))
+            return [r for r in recipe_ids if r not in excluded]
+
+    def ingredients_of(self, recipe_id):
+        with self._lock:
+            return self._recipe_ings.get(recipe_id, ())
+
+ingredient_index = IngredientIndex()
@@ -0,0 +1,50 @@
+"""조리 방법(RECIPE_WAY) / 요리 종류(RECIPE_TYPE) 조회 테이블
+
+작고 거의 바뀌지 않는 테이블이므로 한 번 읽어 불변 스냅샷으로 들고 있고,
+refresh()가 호출될 때만 새 스냅샷으로 통째로 교체한다.
+"""
+import threading
+from types import MappingProxyType
+
+# 테이블 이름 → (ID 컬럼, 이름 컬럼)
+LOOKUP_TABLES = {
+    'RECIPE_WAY': ('RECIPE_WAY_ID', 'WAY_NAME'),
+    'RECIPE_TYPE': ('RECIPE_TYPE_ID', 'TYPE_NAME'),
+}
+
+class LookupTable:
+    def __init__(self, rows):
+        self.by_name = MappingProxyType({name: id_ for id_, name in rows})
+        self.by_id = MappingProxyType({id_: name for id_, name in rows})
+
+class Lookups:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tables = None
+
+    @property
+    def loaded(self):
+        return self._tables is not None
+
+    def refresh(self, load_rows):
+        """load_rows(table, id_col, name_col) → [(id, name), ...] 로 전체 다시 읽기"""
+        with self._lock:
+            tables = {}
+            for table, (id_col, name_col) in LOOKUP_TABLES.items():
+                tables[table] = LookupTable(load_rows(table, id_col, name_col))
+            self._tables = MappingProxyType(tables)
+
+    def ensure_loaded(self, load_rows):
+        if self._tables is None:
+            self.refresh(load_rows)
+
+    def id_of(self, table, name):
+        return self._tables[table].by_name.get(name)
+
+    def name_of(self, table, id_):
+        return self._tables[table].by_id.get(id_)
+
+    def names(self, table):
+        return list(self._tables[table].by_name)
+
+lookups = Lookups()
@@ -0,0 +1,173 @@
+"""영양 정보 열 저장소 (영양 정보 범위 검색용)
+
+레시피의 영양 정보 5개 열을 recipe_id 순서의 NumPy 배열로 따로 저장하고
+(값이 없으면 NaN), 최소/최대 범위 조건을 열마다 벡터 비교한 불리언
+마스크의 AND로 계산한다. NaN은 어떤 비교도 만족하지 않으므로 SQL의
+NULL 비교와 결과가 같다.
+
+삭제는 alive 마스크만 끄고, 지운 행이 절반을 넘으면 배열을 압축한다.
+결과 수 상한(max_count)을 주면 먼저 표본 행만 비교해 결과 수를 추정하고,
+상한을 넘을 것 같으면 전체 마스크를 계산하지 않는다.
+NumPy가 설치되어 있지 않으면 available이 False이며 SQL 조건을 사용한다.
+"""
+import threading
+import time
+
+from catalog.rebuild import Rebuildable
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+COLUMNS = ('info_calories', 'info_carbohydrate', 'info_protein', 'info_fat', 'info_natrium')
+SAMPLE_ROWS = 8192      # 결과 수 추정에 쓰는 표본 행 수
+
+available = np is not None
+
+class NutritionStore(Rebuildable):
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._size = 0
+        self._dead = 0
+        self.loaded = False
+        if available:
+            self._clear()
+
+    def _clear(self, capacity=0):
+        self._ids = np.empty(capacity, dtype=np.int64)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._columns = {col: np.full(capacity, np.nan) for col in COLUMNS}
+        self._size = 0
+        self._dead = 0
+
+    def ensure_loaded(self, load_rows):
+        """처음 사용할 때 load_rows()의 (recipe_id, *영양 정보) 행으로 배열 생성"""
+        if self.loaded:
+            return
+        with self._lock:
+            if self.loaded:
+                return
+            self._build(load_rows())
+
+    def rebuild(self, rows):
+        with self._lock:
+            self._build(rows)
+
+    def _build(self, rows):
+        data = np.array(rows, dtype=np.float64).reshape(-1, len(COLUMNS) + 1)
+        data = data[np.argsort(data[:, 0], kind='stable')]
+        n = len(data)
+        self._clear(n)
+        self._ids[:] = data[:, 0].astype(np.int64)
+        self._alive[:] = True
+        for j, col in enumerate(COLUMNS, 1):
+            self._columns[col][:] = data[:, j]
+        self._size = n
+        self.loaded = True
+        self.built_at = time.monotonic()
+
+    def _grow(self, capacity):
+        self._ids = np.resize(self._ids, capacity)
+        self._alive = np.concatenate([self._alive[:self._size], np.zeros(capacity - self._size, dtype=bool)])
+        for col in COLUMNS:
+            column = self._columns[col]
+            self._columns[col] = np.concatenate([column[:self._size], np.full(capacity - self._size, np.nan)])
+
+    def _position(self, recipe_id):
+        n = self._size
+        pos = int(np.searchsorted(self._ids[:n], recipe_id))
+        return pos, pos < n and self._ids[pos] == recipe_id
+
+    def set_recipe(self, recipe_id, values):
+        """레시피 영양 정보 교체 (생성/수정 후 호출), values는 COLUMNS 순서"""
+        with self._lock:
+            if not self.loaded:
+                return
+            self._log('set_recipe', recipe_id, tuple(values))
+            values = [np.nan if v is None else float(v) for v in values]
+            pos, found = self._position(recipe_id)
+            if not found:
+                if self._size == len(self._ids):
+                    self._grow(max(16, self._size * 2))
+                n = self._size
+                if pos < n:
+                    # 새 레시피는 보통 가장 큰 ID라 끝에 붙지만, 아니면 뒤를 한 칸씩 민다
+                    self._ids[pos + 1:n + 1] = self._ids[pos:n]
+                    self._alive[pos + 1:n + 1] = self._alive[pos:n]
+                    for col in COLUMNS:
+                        self._columns[col][pos + 1:n + 1] = self._columns[col][pos:n]
+                self._ids[pos] = recipe_id
+                self._size += 1
+            elif not self._alive[pos]:
+                self._dead -= 1
+            self._alive[pos] = True
+            for col, value in zip(COLUMNS, values):
+                self._columns[col][pos] = value
+
+    def remove_recipe(self, recipe_id):
+        """레시피 삭제 후 호출"""
+        with self._lock:
+            if not self.loaded:
+                return
+            self._log('remove_recipe', recipe_id)
+            pos, found = self._position(recipe_id)
+            if not found or not self._alive[pos]:
+                return
+            self._alive[pos] = False
+            self._dead += 1
+            if self._dead * 2 > self._size:
+                self._compact()
+
+    def _compact(self):
+        n = self._size
+        keep = self._alive[:n]
+        ids = self._ids[:n][keep]
+        columns = {col: self._columns[col][:n][keep] for col in COLUMNS}
+        self._clear(len(ids))
+        self._ids[:] = ids
+        self._alive[:] = True
+        for col in COLUMNS:
+            self._columns[col][:] = columns[col]
+        self._size = len(ids)
+
+    def matching(self, ranges, within=None, max_count=None):
+        """{열 이름: (최소, 최대)} 범위를 모두 만족하는 recipe_id 목록 (정렬)
+
+        최소/최대가 None이면 그쪽 조건은 없음.
+        within(정렬된 recipe_id 목록)을 주면 그 레시피들의 행만 모아서 비교
+        max_count를 주면 표본으로 추정한 결과 수가 이보다 많을 때 None
+        """
+        with self._lock:
+            n = self._size
+            ids = self._ids[:n]
+            if within is None:
+                rows = slice(0, n)
+            else:
+                within = np.asarray(within, dtype=np.int64)
+                rows = np.searchsorted(ids, within)
+                inside = rows < n
+                rows, within = rows[inside], within[inside]
+                rows = rows[ids[rows] == within]
+            count = n if within is None else len(rows)
+            if max_count is not None and count > max_count:
+                step = max(1, count // SAMPLE_ROWS)
+                sample = slice(0, n, step) if within is None else rows[::step]
+                if int(self._mask(sample, ranges).sum()) * step > max_count:
+                    return None
+            return ids[rows][self._mask(rows, ranges)].tolist()
+
+    def _mask(self, rows, ranges):
+        mask = self._alive[rows].copy()
+        for col, (lo, hi) in ranges.items():
+            column = self._columns[col][rows]
+            if lo is not None:
+                mask &= column >= lo
+            if hi is not None:
+                mask &= column <= hi
+        return mask
+
+    def __len__(self):
+        return self._size - self._dead
+
+nutrition_store = NutritionStore()
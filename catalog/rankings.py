@@ -0,0 +1,111 @@
+"""즐겨찾기 / 댓글 수 TOP N 랭킹
+
+레시피별 카운터 전체와 상위 후보 목록(_top, size * slack개)을 함께 유지한다.
+_top 바깥의 레시피는 항상 _top의 마지막 항목보다 순위가 낮다는 불변식을
+지키면서 카운터가 바뀔 때마다 _top만 고치므로, 읽기는 _top 앞부분을 잘라
+주기만 하면 된다. 후보가 size개 미만으로 줄어들 때만 전체를 다시 고른다.
+순위는 (개수 내림차순, recipe_id 내림차순)으로 기존 SQL과 같다.
+
+주기적 전체 재집계는 catalog.rebuild로 락 밖에서 하므로, 그동안에도
+adjust()와 top()은 기존 카운터로 바로 처리된다. 재집계 중에 adjust()된
+레시피는 증감을 다시 적용하지 않고(새 집계에 이미 들어 있을 수 있음)
+바꿔 끼운 뒤 그 레시피들만 다시 센다.
+"""
+import heapq
+import threading
+import time
+
+from catalog.rebuild import Rebuildable
+
+class Ranking(Rebuildable):
+    def __init__(self, size=5, slack=4):
+        self.size = size
+        self.capacity = size * slack
+        self._lock = threading.RLock()
+        self._counts = None     # recipe_id -> count (0 포함 전체 레시피)
+        self._top = []          # [(count, recipe_id), ...] 내림차순
+
+    @property
+    def loaded(self):
+        return self._counts is not None
+
+    def _empty(self):
+        return Ranking(self.size, self.capacity // self.size)
+
+    def ensure_loaded(self, load_rows):
+        """처음 사용할 때 load_rows()의 (recipe_id, count) 전체로 계산
+
+        load_rows(recipe_ids)는 주어진 레시피의 (recipe_id, count)만 돌려준다 (재집계 보정용)
+        """
+        if self.loaded:
+            return
+        with self._lock:
+            if self.loaded:
+                return
+            self._build(load_rows())
+
+    def _build(self, rows):
+        self._counts = dict(rows)
+        self._rebuild_top()
+        self.built_at = time.monotonic()
+
+    def _rebuild_top(self):
+        self._top = heapq.nlargest(self.capacity, ((c, r) for r, c in self._counts.items()))
+
+    def _replay(self, pending, load_rows):
+        adjusted = set()
+        for name, args in pending:
+            if name == 'adjust':
+                adjusted.add(args[0])
+            else:
+                getattr(self, name)(*args)
+        adjusted &= self._counts.keys()
+        if adjusted:
+            for recipe_id, count in load_rows(sorted(adjusted)):
+                if recipe_id in self._counts:
+                    self._set(recipe_id, count)
+
+    def _set(self, recipe_id, count):
+        self._counts[recipe_id] = count
+        key = (count, recipe_id)
+        floor = self._top[-1] if self._top else None
+        rest = [item for item in self._top if item[1] != recipe_id]
+
+        if len(rest) != len(self._top):
+            # 후보 안에 있던 레시피: 기존 최하위 이상이면 남기고, 아니면 밖으로
+            if key >= floor:
+                rest.append(key)
+                rest.sort(reverse=True)
+            self._top = rest
+        elif floor is not None and key > floor:
+            self._top.append(key)
+            self._top.sort(reverse=True)
+            del self._top[self.capacity:]
+
+    def add_recipe(self, recipe_id):
+        with self._lock:
+            self._log('add_recipe', recipe_id)
+            if self.loaded and recipe_id not in self._counts:
+                self._set(recipe_id, 0)
+
+    def remove_recipe(self, recipe_id):
+        with self._lock:
+            self._log('remove_recipe', recipe_id)
+            if self.loaded and self._counts.pop(recipe_id, None) is not None:
+                self._top = [item for item in self._top if item[1] != recipe_id]
+
+    def adjust(self, recipe_id, delta):
+        with self._lock:
+            self._log('adjust', recipe_id, delta)
+            if self.loaded and recipe_id in self._counts:
+                self._set(recipe_id, max(self._counts[recipe_id] + delta, 0))
+
+    def top(self):
+        """[(count, recipe_id), ...] 상위 size개"""
+        with self._lock:
+            if len(self._top) < min(self.size, len(self._counts)):
+                self._rebuild_top()
+            return self._top[:self.size]
+
+favorite_ranking = Ranking()
+comment_ranking = Ranking()
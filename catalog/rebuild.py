@@ -0,0 +1,57 @@
+"""메모리 색인 주기적 재구성 (여러 워커가 같은 DB에 쓰는 경우)
+
+색인은 자기 프로세스의 쓰기만 바로 반영하므로 다른 워커가 만들거나 고치거나
+지운 레시피는 재구성해야 보인다. 새 색인은 락 밖에서 만들고(그동안 읽기 /
+쓰기는 기존 색인 사용) 락 안에서 바꿔 끼운다. 만드는 동안 들어온 이
+프로세스의 쓰기는 기록해 두었다가 바꿔 끼운 직후 다시 적용한다.
+
+색인 클래스는 _lock(RLock), loaded, _build(rows)를 갖고, 변경 메서드에서
+self._log(메서드 이름, *인자)를 부르며, _build에서 built_at을 갱신한다.
+다시 적용하면 안 되는 변경(증감 등)은 _replay()를 재정의해 따로 처리한다.
+"""
+import time
+
+class Rebuildable:
+    _pending = None     # 재구성 중이면 [(메서드 이름, 인자), ...]
+    built_at = 0.0      # 마지막으로 색인을 만든 시각 (time.monotonic)
+
+    def _empty(self):
+        """같은 설정의 빈 색인 (재구성용)"""
+        return type(self)()
+
+    def _log(self, name, *args):
+        if self._pending is not None:
+            self._pending.append((name, args))
+
+    def claim_refresh(self, interval):
+        """interval초 전에 만든 색인이고 재구성 중이 아니면 재구성을 맡음
+
+        True를 받은 호출자만 refresh()를 부른다 (재구성은 한 번에 하나).
+        """
+        with self._lock:
+            if not self.loaded or self._pending is not None or time.monotonic() - self.built_at < interval:
+                return False
+            self._pending = []
+            return True
+
+    def refresh(self, load_rows):
+        """claim_refresh()로 맡은 재구성 실행 (실패하면 interval 뒤 다시 시도)"""
+        try:
+            fresh = self._empty()
+            fresh._build(load_rows())
+        except BaseException:
+            with self._lock:
+                self._pending = None
+                self.built_at = time.monotonic()
+            raise
+        with self._lock:
+            pending, self._pending = self._pending, None
+            for name, value in vars(fresh).items():
+                if name != '_lock':
+                    setattr(self, name, value)
+            self._replay(pending, load_rows)
+
+    def _replay(self, pending, load_rows):
+        """(락 안) 재구성하는 동안 기록된 변경을 새 색인에 다시 적용"""
+        for name, args in pending:
+            getattr(self, name)(*args)
@@ -0,0 +1,115 @@
+"""n-gram 역색인 (레시피 제목 / 작성자 닉네임 부분 문자열 검색용)
+
+LIKE '%검색어%'는 B-tree 인덱스를 쓸 수 없어 매번 전체 테이블을 훑는다.
+문서(제목, 닉네임)를 글자 2-gram, 3-gram으로 쪼개 gram → 문서 ID 집합을
+저장해 두고, 검색어의 gram 집합을 모두 가진 문서만 후보로 고른 뒤 실제
+부분 문자열 포함 여부로 확인한다. 한글은 음절 단위, 영문/숫자는 글자
+단위이며, LIKE와 같게 대소문자를 구분한다.
+"""
+import threading
+import time
+from bisect import bisect_left, bisect_right
+
+from catalog.rebuild import Rebuildable
+
+GRAM_SIZES = (2, 3)
+
+def grams(text, n):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+class NgramIndex(Rebuildable):
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings = {}   # gram -> set(doc_id)
+        self._docs = {}       # doc_id -> text
+        self.loaded = False
+
+    def ensure_loaded(self, load_rows):
+        """처음 사용할 때 load_rows()의 (doc_id, text) 행으로 색인 생성"""
+        if self.loaded:
+            return
+        with self._lock:
+            if self.loaded:
+                return
+            self._build(load_rows())
+
+    def rebuild(self, rows):
+        with self._lock:
+            self._build(rows)
+
+    def _build(self, rows):
+        self._postings = {}
+        self._docs = {}
+        for doc_id, text in rows:
+            self._add(doc_id, text)
+        self.loaded = True
+        self.built_at = time.monotonic()
+
+    def set_document(self, doc_id, text):
+        """문서 내용 교체 (생성/수정 후 호출)"""
+        with self._lock:
+            if not self.loaded:
+                return
+            self._log('set_document', doc_id, text)
+            if self._docs.get(doc_id) == text:
+                return
+            self._remove(doc_id)
+            self._add(doc_id, text)
+
+    def remove_document(self, doc_id):
+        """문서 삭제 후 호출"""
+        with self._lock:
+            if self.loaded:
+                self._log('remove_document', doc_id)
+                self._remove(doc_id)
+
+    def _add(self, doc_id, text):
+        text = text or ""
+        self._docs[doc_id] = text
+        for n in GRAM_SIZES:
+            for gram in grams(text, n):
+                self._postings.setdefault(gram, set()).add(doc_id)
+
+    def _remove(self, doc_id):
+        text = self._docs.pop(doc_id, None)
+        if text is None:
+            return
+        for n in GRAM_SIZES:
+            for gram in grams(text, n):
+                posting = self._postings.get(gram)
+                if posting is None:
+                    continue
+                posting.discard(doc_id)
+                if not posting:
+                    del self._postings[gram]
+
+    def search(self, query):
+        """query를 부분 문자열로 포함하는 문서 ID 목록 (정렬)
+
+        가장 긴 gram 크기로 쪼갠 posting들을 작은 것부터 교집합하고,
+        gram보다 짧은 검색어는 저장된 문서를 직접 훑는다.
+        """
+        n = min(len(query), GRAM_SIZES[-1])
+        with self._lock:
+            if n < GRAM_SIZES[0]:
+                return sorted(d for d, text in self._docs.items() if query in text)
+            postings = []
+            for gram in grams(query, n):
+                posting = self._postings.get(gram)
+                if not posting:
+                    return []
+                postings.append(posting)
+            postings.sort(key=len)
+            candidates = set(postings[0]).intersection(*postings[1:])
+            docs = self._docs
+            return sorted(d for d in candidates if query in docs[d])
+
+def id_range(ids, after=None, before=None):
+    """정렬된 ID 목록에서 before < id < after 구간 (키셋 페이지네이션 조건)"""
+    lo = bisect_right(ids, before) if before is not None else 0
+    hi = bisect_left(ids, after) if after is not None else len(ids)
+    return ids[lo:hi]
+
+# recipe_id → 제목, user_id → 닉네임
+title_index = NgramIndex()
+nickname_index = NgramIndex()
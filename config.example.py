@@ -1,7 +1,98 @@
+# DB 저장소 선택: 'oracle' 또는 'sqlite' (내장 DB, 단일 노드/로컬 테스트용)
+DB_BACKEND = "oracle"
+
+# SQLite 설정 (DB_BACKEND = "sqlite" 일 때 사용, ':memory:'는 메모리 DB)
+SQLITE_PATH = "recipes.db"
+
 # Oracle DB 연결 정보
 ORACLE_USER = ""
 ORACLE_PASSWORD = ""
 ORACLE_DSN = ""
 
+# Oracle Instant Client(Thick 모드) 사용 여부, 기본은 Thin 모드
+# Thick 모드에서는 비동기 커넥션 풀을 쓸 수 없어 async 뷰도 스레드 풀에서 조회한다
+ORACLE_THICK_MODE = False
+ORACLE_CLIENT_LIB_DIR = None        # Instant Client 경로 (None이면 시스템 기본 경로)
+
+# Oracle 커넥션 풀 설정
+ORACLE_POOL_MIN = 2                 # 최소 커넥션 수
+ORACLE_POOL_MAX = 10                # 최대 커넥션 수
+ORACLE_POOL_INCREMENT = 1           # 부족할 때 한 번에 늘릴 커넥션 수
+ORACLE_POOL_WAIT_TIMEOUT = 5000     # 풀이 가득 찼을 때 최대 대기 시간 (ms)
+ORACLE_POOL_PING_INTERVAL = 60      # 이 시간(초) 이상 쉬었던 커넥션은 꺼낼 때 ping 확인
+ORACLE_POOL_IDLE_TIMEOUT = 300      # 유휴 커넥션 제거 기준 (초)
+ORACLE_POOL_MAX_LIFETIME = 3600     # 커넥션 최대 수명 (초)
+ORACLE_CALL_TIMEOUT = 0             # DB 왕복 하나의 제한 시간 (ms, 0이면 없음, 전체 재집계 등 긴 조회도 포함)
+
+# 재료 이름 → ID 캐시 (TTL은 초, None이면 만료 없음)
+INGREDIENT_CACHE_SIZE = 10000
+INGREDIENT_CACHE_TTL = None
+
+# 레시피 상세 캐시 (TTL은 초, None이면 만료 없음)
+# 수정 / 삭제 / 댓글은 같은 프로세스의 캐시만 바로 지우므로, 여러 워커로 실행하면 다른
+# 워커의 쓰기는 최대 TTL만큼 늦게 상세 화면에 보인다 (None은 프로세스 하나일 때만 사용)
+DETAIL_CACHE_SIZE = 1000
+DETAIL_CACHE_TTL = 60
+
+# 검색 결과 캐시 (레시피/닉네임 변경 시 전체 무효화, TTL은 초, None이면 만료 없음)
+# 여러 프로세스로 실행하면 다른 프로세스의 쓰기는 알 수 없으므로 최대 TTL만큼 늦게
+# 검색 결과에 반영된다 (None은 프로세스 하나일 때만 사용)
+SEARCH_CACHE_SIZE = 512
+SEARCH_CACHE_TTL = 60
+
+# 검색 결과 페이지 크기
+SEARCH_PAGE_SIZE = 20
+
+# 스트리밍 검색(format=ndjson)에서 한 번에 읽어 올 행 수 (fetchmany arraysize)
+SEARCH_FETCH_ARRAYSIZE = 500
+
+# 검색 색인(제목/닉네임 n-gram, 영양 정보 열 저장소) 후보가 이보다 많으면 SQL 조건으로 검색
+SEARCH_INDEX_MAX_CANDIDATES = 5000
+
+# 메모리 검색 색인(재료 / 제목 / 닉네임 / 영양 정보) 재구성 주기 (초)
+# 색인은 자기 프로세스의 쓰기만 바로 반영하므로, 여러 워커로 실행하면 다른 워커가
+# 만들거나 고치거나 지운 레시피가 최대 이 시간만큼 늦게 검색에 반영된다.
+# None이면 재구성하지 않음 (프로세스 하나로 실행할 때만 결과가 정확함)
+CATALOG_REFRESH_INTERVAL = 300
+
+# 블록 단위 ID 할당: 워커마다 한 번에 받아 둘 ID 수 (Oracle은 시퀀스 INCREMENT BY와 같게,
+# storage/id_blocks_oracle.sql 참고). 댓글 ID는 항상 블록에서 받는다.
+ID_BLOCK_SIZE = 50
+# RECIPE / INGREDIENT 삽입에도 블록 ID 사용 (켜려면 모든 워커에서 함께 켤 것)
+ID_BLOCK_INSERTS = False
+
+# 회원 탈퇴 시 계정만 바로 막고 작성한 레시피는 백그라운드에서 나눠 삭제
+# (Oracle은 storage/user_purge_oracle.sql 실행 필요), 한 번에 삭제할 레시피 수
+USER_PURGE_ASYNC = False
+USER_PURGE_BATCH_SIZE = 200
+
+# TOP 5 랭킹 전체 재집계 주기 (초)
+RANKING_RECOUNT_INTERVAL = 300
+
+# async 뷰에서 독립적인 조회를 동시에 실행할 때 호출당 제한 시간 (초)
+# 시간이 지나도 스레드 풀에서 실행 중인 조회는 끝날 때까지 커넥션을 쓴다 (ORACLE_CALL_TIMEOUT 참고)
+FAN_OUT_TIMEOUT = 5.0
+
+# async 뷰에서 동기 DB 함수를 실행할 스레드 수 (비동기 드라이버가 없는 backend / 함수용)
+ASYNC_DB_THREADS = 16
+
+# database 함수 / 라우트 계측 (/metrics, Prometheus 텍스트 형식)
+METRICS_ENABLED = True
+
+# 느린 쿼리 로그 (실행 + 결과 읽기에 이 시간(ms) 이상 걸린 SQL을 JSON lines로 기록, None이면 끔)
+# 여러 프로세스로 실행하면 프로세스마다 다른 경로를 쓸 것 (파일 회전이 프로세스 간에 안전하지 않음)
+SLOW_QUERY_LOG_MS = None
+SLOW_QUERY_LOG_PATH = "slow_query.log"
+SLOW_QUERY_LOG_MAX_BYTES = 10 * 1024 * 1024   # 이 크기를 넘으면 회전
+SLOW_QUERY_LOG_BACKUPS = 5                    # 보관할 이전 파일 수
+SLOW_QUERY_REDACT_BINDS = True                # 문자열 바인드 값은 길이만 기록
+SLOW_QUERY_EXPLAIN = False                    # SELECT의 실행 계획도 기록 (Oracle은 PLAN_TABLE 필요)
+
+# 모니터링 엔드포인트(/status/db-pool, /status/caches, /metrics) 접근 제한
+# 허용 주소에서 온 요청이거나 "Authorization: Bearer <MONITORING_TOKEN>" 헤더가 맞아야 함
+# 리버스 프록시 뒤에서는 모든 요청이 프록시 주소로 보이므로 허용 주소를 비우고 토큰을 쓸 것
+MONITORING_ALLOWED_IPS = ("127.0.0.1", "::1")
+MONITORING_TOKEN = None
+
 # Flask 설정
-SECRET_KEY = ""
\ No newline at end of file
+SECRET_KEY = ""
@@ -1,28 +1,135 @@
-import oracledb
-import config
 import re
+import threading
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import config
+from storage import backend
+from catalog.id_blocks import IdBlockAllocator
+from catalog.ingredient_index import ingredient_index
+from catalog.lookups import LOOKUP_TABLES, lookups
+from catalog.rankings import comment_ranking, favorite_ranking
+from catalog.text_index import id_range, nickname_index, title_index
+from catalog.lru import LRUCache
+from catalog.nutrition import nutrition_store
+from catalog import nutrition
+from monitoring.metrics import metrics
+from monitoring.slow_query import SlowQueryLog
+
+# 재료 이름 → ingredient_id 캐시 (프로세스 공유, 커밋된 값만 저장)
+ingredient_cache = LRUCache(getattr(config, 'INGREDIENT_CACHE_SIZE', 10000),
+                            getattr(config, 'INGREDIENT_CACHE_TTL', None))
+
+# recipe_id → 레시피 상세 캐시 (이 프로세스의 수정/삭제/댓글 작성·삭제 시 무효화,
+# 다른 워커의 쓰기는 DETAIL_CACHE_TTL초 안에 반영)
+detail_cache = LRUCache(getattr(config, 'DETAIL_CACHE_SIZE', 1000),
+                        getattr(config, 'DETAIL_CACHE_TTL', 60))
+_detail_lock = threading.Lock()
+_detail_epoch = 0
+
+# 검색 조건 → search_recipes 결과 캐시
+# 레시피 / 닉네임이 바뀌는 쓰기마다 catalog 쓰기 epoch를 올려 전체 무효화
+# (이 프로세스의 쓰기만, 다른 워커의 쓰기는 SEARCH_CACHE_TTL초 안에 반영)
+search_cache = LRUCache(getattr(config, 'SEARCH_CACHE_SIZE', 512),
+                        getattr(config, 'SEARCH_CACHE_TTL', 60))
+_catalog_lock = threading.Lock()
+_catalog_epoch = 0
+
+# 공개 함수 계측 (호출 수 / 지연 / DB 왕복 / 읽은 행 수, app.py의 /metrics)
+METRICS_ENABLED = getattr(config, 'METRICS_ENABLED', True)
 
-# oracledb 초기화 (Thin 모드 사용)
-try:
-    oracledb.init_oracle_client()
-except Exception:
-    pass
+# 느린 쿼리 로그: 실행 + 결과 읽기에 SLOW_QUERY_LOG_MS 이상 걸린 문장을 JSON lines로 기록 (None이면 끔)
+SLOW_QUERY_LOG_MS = getattr(config, 'SLOW_QUERY_LOG_MS', None)
+slow_query_log = None
+if SLOW_QUERY_LOG_MS is not None:
+    slow_query_log = SlowQueryLog(
+        getattr(config, 'SLOW_QUERY_LOG_PATH', 'slow_query.log'), SLOW_QUERY_LOG_MS,
+        redact_binds=getattr(config, 'SLOW_QUERY_REDACT_BINDS', True),
+        explain=backend.explain_plan if getattr(config, 'SLOW_QUERY_EXPLAIN', False) else None,
+        max_bytes=getattr(config, 'SLOW_QUERY_LOG_MAX_BYTES', 10 * 1024 * 1024),
+        backup_count=getattr(config, 'SLOW_QUERY_LOG_BACKUPS', 5),
+        backend_name=backend.NAME)
+    metrics.add_statement_hook(slow_query_log.observe)
 
-oracledb.defaults.fetch_lobs = False
+def _connect():
+    """계측 커넥션 (실패하면 backend.Error)"""
+    return metrics.wrap_connection(backend.connect())
 
 def get_db_conn():
-    """Oracle DB 연결 객체 반환"""
-    try:
-        conn = oracledb.connect(
-            user=config.ORACLE_USER,
-            password=config.ORACLE_PASSWORD,
-            dsn=config.ORACLE_DSN
-        )
-        return conn
-    except oracledb.Error as e:
+    """설정된 저장소(Oracle 풀 / 내장 SQLite)의 DB 연결 객체 반환"""
+    try:
+        return _connect()
+    except backend.Error as e:
         print(f"DB 연결 실패: {e}")
         return None
-    
+
+def get_pool_stats():
+    """모니터링용 DB 연결 통계"""
+    return backend.get_pool_stats()
+
+def get_cache_stats():
+    """모니터링용 메모리 캐시 통계"""
+    return {
+        'ingredient': ingredient_cache.stats(),
+        'detail': detail_cache.stats(),
+        'search': search_cache.stats(),
+    }
+
+# 블록 단위 ID 할당: COMMENT_T는 항상, RECIPE / INGREDIENT는 ID_BLOCK_INSERTS일 때 사용
+# (Oracle은 storage/id_blocks_oracle.sql의 시퀀스 필요, INCREMENT BY = ID_BLOCK_SIZE)
+ID_BLOCK_SIZE = getattr(config, 'ID_BLOCK_SIZE', 50)
+ID_BLOCK_INSERTS = getattr(config, 'ID_BLOCK_INSERTS', False)
+id_blocks = IdBlockAllocator(ID_BLOCK_SIZE)
+_ID_COLUMNS = {'COMMENT_T': 'comment_id', 'RECIPE': 'recipe_id', 'INGREDIENT': 'ingredient_id'}
+
+def _fetch_id_block(table, size):
+    """새 ID 블록을 받아 바로 커밋 (블록은 호출한 쪽 트랜잭션과 무관하게 확정)"""
+    # 지표 / 느린 쿼리 로그에 남도록 계측 커넥션 사용 (연결 실패는 backend.Error로 전달)
+    conn = _connect()
+    cursor = conn.cursor()
+    try:
+        start = backend.allocate_id_block(cursor, table, _ID_COLUMNS[table], size)
+        conn.commit()
+        return start
+    finally:
+        cursor.close()
+        conn.close()
+
+def next_ids(table, count=1):
+    """table의 새 ID count개 (워커마다 ID_BLOCK_SIZE개씩 받아 둔 블록에서 꺼냄)
+
+    블록이 모자랄 때만 DB에 한 번 다녀온다. SQLite는 스레드의 커넥션을
+    재사용하므로 블록을 받으며 커밋하면 열려 있는 바깥 트랜잭션도 같이 커밋된다.
+    트랜잭션 시작 전에 받아 둘 것.
+    실패하면 backend.Error
+    """
+    return id_blocks.next_ids(table, count, _fetch_id_block)
+
+def next_id(table):
+    return next_ids(table)[0]
+
+def _reserve_ingredient_ids(names):
+    """ID_BLOCK_INSERTS일 때 캐시에 없는 재료 수만큼 INGREDIENT ID를 미리 받음 (아니면 None)"""
+    if not ID_BLOCK_INSERTS:
+        return None
+    misses = [n for n in dict.fromkeys(names) if n not in ingredient_cache]
+    return next_ids('INGREDIENT', len(misses))
+
+# IN 목록 바인드 변수 (Oracle은 IN 목록당 최대 1000개)
+IN_CHUNK_SIZE = 1000
+
+def _in_clause(count, start=1):
+    return ", ".join(f":{i}" for i in range(start, start + count))
+
+def _in_condition(column, count, start=1):
+    """column IN (...) 조건, IN_CHUNK_SIZE개씩 나눠 OR로 연결"""
+    parts = []
+    for i in range(0, count, IN_CHUNK_SIZE):
+        size = min(IN_CHUNK_SIZE, count - i)
+        parts.append(f"{column} IN ({_in_clause(size, start + i)})")
+    return "(" + " OR ".join(parts) + ")"
+
 def register_user(user_id, password, nickname):
     conn = get_db_conn()
     if not conn: return False
@@ -32,8 +139,9 @@ def register_user(user_id, password, nickname):
         sql = "INSERT INTO USER_T (user_id, password, nickname) VALUES (:1, :2, :3)"
         cursor.execute(sql, (user_id, password, nickname))
         conn.commit()
+        nickname_index.set_document(user_id, nickname)
         return True
-    except oracledb.Error as e:
+    except backend.Error as e:
         print(f"회원가입 실패: {e}")
         conn.rollback()
         return False
@@ -48,12 +156,15 @@ def login_user(user_id, password):
     cursor = conn.cursor()
     try:
         sql = "SELECT nickname FROM USER_T WHERE user_id = :1 AND password = :2"
+        if USER_PURGE_ASYNC:
+            # 탈퇴 정리 중인 계정은 로그인 불가
+            sql += " AND NOT EXISTS (SELECT 1 FROM USER_PURGE P WHERE P.user_id = USER_T.user_id)"
         cursor.execute(sql, (user_id, password))
         result = cursor.fetchone()
         if result:
             return {'user_id': user_id, 'nickname': result[0]}
         return None
-    except oracledb.Error as e:
+    except backend.Error as e:
         print(f"로그인 오류: {e}")
         return None
     finally:
@@ -61,22 +172,18 @@ def login_user(user_id, password):
         if conn: conn.close()
 
 def add_ingredient(user_id, name, quantity):
+    try:
+        new_ing_ids = _reserve_ingredient_ids([name])
+    except backend.Error as e:
+        print(f"재료 추가 실패: {e}")
+        return False
     conn = get_db_conn()
     if not conn: return False
     
     cursor = conn.cursor()
     try:
         # 재료 ID 찾기 (없으면 INGREDIENT에 먼저 추가)
-        cursor.execute("SELECT ingredient_id FROM INGREDIENT WHERE name = :1", (name,))
-        res = cursor.fetchone()
-        
-        if res:
-            ing_id = res[0]
-        else:
-            # 새 재료 추가 및 ID 반환
-            ing_id_var = cursor.var(int)
-            cursor.execute("INSERT INTO INGREDIENT (name) VALUES (:1) RETURNING ingredient_id INTO :2", [name, ing_id_var])
-            ing_id = ing_id_var.getvalue()[0]
+        ing_id = _resolve_ingredient_ids(cursor, [name], new_ing_ids)[name]
         # 2. 내 냉장고에 존재 여부 확인 후 UPDATE 또는 INSERT
         check_sql = "SELECT 1 FROM USER_INGREDIENT WHERE user_id = :1 AND ingredient_id = :2"
         cursor.execute(check_sql, (user_id, ing_id))
@@ -89,8 +196,9 @@ def add_ingredient(user_id, name, quantity):
             insert_sql = "INSERT INTO USER_INGREDIENT (user_id, ingredient_id, quantity) VALUES (:1, :2, :3)"
             cursor.execute(insert_sql, (user_id, ing_id, quantity))
         conn.commit()
+        ingredient_cache.put(name, ing_id)
         return True
-    except oracledb.Error as e:
+    except backend.Error as e:
         print(f"재료 추가 실패: {e}")
         conn.rollback()
         return False
@@ -107,7 +215,7 @@ def delete_ingredient(user_id, user_ing_id):
         cursor.execute("DELETE FROM USER_INGREDIENT WHERE user_ingredient_id = :1 AND user_id = :2", (user_ing_id, user_id))
         conn.commit()
         return True
-    except oracledb.Error as e:
+    except backend.Error as e:
         print(f"재료 삭제 실패: {e}")
         conn.rollback()
         return False
@@ -136,7 +244,7 @@ def get_user_ingredients(user_id):
             columns = [col[0].lower() for col in cursor.description]
             return [dict(zip(columns, row)) for row in cursor.fetchall()]
         return []
-    except oracledb.Error as e:
+    except backend.Error as e:
         print(f"냉장고 조회 오류: {e}")
         return []
     finally:
@@ -232,7 +340,7 @@ def get_user_info(user_id):
         if result:
             return {'user_id': result[0], 'nickname': result[1]}
         return None
-    except oracledb.Error as e:
+    except backend.Error as e:
         print(f"사용자 정보 조회 오류: {e}")
         return None
     finally:
@@ -247,9 +355,19 @@ def update_nickname(user_id, new_nickname):
     try:
         sql = "UPDATE USER_T SET nickname = :1 WHERE user_id = :2"
         cursor.execute(sql, (new_nickname, user_id))
+        # 닉네임이 표시되는 레시피 상세 (작성한 레시피, 댓글 단 레시피)
+        cursor.execute("""
+            SELECT recipe_id FROM RECIPE WHERE author_id = :1
+            UNION
+            SELECT recipe_id FROM COMMENT_T WHERE user_id = :2
+        """, (user_id, user_id))
+        affected = [row[0] for row in cursor.fetchall()]
         conn.commit()
+        nickname_index.set_document(user_id, new_nickname)
+        _bump_catalog_epoch()
+        _invalidate_details(*affected)
         return True
-    except oracledb.Error as e:
+    except backend.Error as e:
         print(f"닉네임 수정 실패: {e}")
         conn.rollback()
         return False
@@ -267,7 +385,7 @@ def update_password(user_id, new_password):
         cursor.execute(sql, (new_password, user_id))
         conn.commit()
         return True
-    except oracledb.Error as e:
+    except backend.Error as e:
         print(f"비밀번호 수정 실패: {e}")
         conn.rollback()
         return False
@@ -275,46 +393,87 @@ def update_password(user_id, new_password):
         if cursor: cursor.close()
         if conn: conn.close()
 
+# 레시피와 자식 행(댓글, 즐겨찾기, 조리 순서, 재료 연결)은 테이블마다 DELETE 한 번으로 삭제
+_RECIPE_CHILD_TABLES = ('COMMENT_T', 'FAVORITE', 'COOKING_STEP', 'RECIPE_INGREDIENT')
+
+def _delete_recipes(cursor, where, params):
+    """RECIPE에서 where 조건에 맞는 레시피와 자식 행 삭제, 삭제한 레시피 수 반환"""
+    for table in _RECIPE_CHILD_TABLES:
+        cursor.execute(f"DELETE FROM {table} WHERE recipe_id IN (SELECT recipe_id FROM RECIPE WHERE {where})", params)
+    cursor.execute(f"DELETE FROM RECIPE WHERE {where}", params)
+    return cursor.rowcount
+
+def _forget_recipes(recipe_ids):
+    """레시피 삭제 커밋 후 메모리 색인 / 랭킹 / 캐시 정리"""
+    for recipe_id in recipe_ids:
+        ingredient_index.remove_recipe(recipe_id)
+        title_index.remove_document(recipe_id)
+        nutrition_store.remove_recipe(recipe_id)
+        favorite_ranking.remove_recipe(recipe_id)
+        comment_ranking.remove_recipe(recipe_id)
+    _bump_catalog_epoch()
+    _invalidate_details(*recipe_ids)
+
+def _user_activity(cursor, user_id):
+    """랭킹 갱신용: 사용자가 즐겨찾기한 레시피 ID, 레시피별 댓글 수"""
+    cursor.execute("SELECT recipe_id FROM FAVORITE WHERE user_id = :1", (user_id,))
+    favorited_ids = [row[0] for row in cursor.fetchall()]
+    cursor.execute("SELECT recipe_id, COUNT(*) FROM COMMENT_T WHERE user_id = :1 GROUP BY recipe_id", (user_id,))
+    return favorited_ids, cursor.fetchall()
+
+def _delete_user_rows(cursor, user_id):
+    """작성한 레시피를 지운 뒤 사용자의 댓글, 즐겨찾기, 냉장고 재료, 계정 삭제"""
+    cursor.execute("DELETE FROM COMMENT_T WHERE user_id = :1", (user_id,))
+    cursor.execute("DELETE FROM FAVORITE WHERE user_id = :1", (user_id,))
+    cursor.execute("DELETE FROM USER_INGREDIENT WHERE user_id = :1", (user_id,))
+    cursor.execute("DELETE FROM USER_T WHERE user_id = :1", (user_id,))
+
+def _forget_user(user_id, favorited_ids, commented_counts):
+    """계정 삭제 커밋 후 닉네임 색인 / 랭킹 / 상세 캐시 정리"""
+    nickname_index.remove_document(user_id)
+    for recipe_id in favorited_ids:
+        favorite_ranking.adjust(recipe_id, -1)
+    for recipe_id, cnt in commented_counts:
+        comment_ranking.adjust(recipe_id, -cnt)
+    _bump_catalog_epoch()
+    _invalidate_details(*(recipe_id for recipe_id, _ in commented_counts))
+
+# 회원 탈퇴 백그라운드 정리: 계정은 USER_PURGE에 등록해 바로 막고(로그인 불가),
+# 작성한 레시피는 백그라운드 스레드에서 USER_PURGE_BATCH_SIZE개씩 나눠 삭제
+# (Oracle은 storage/user_purge_oracle.sql의 테이블 필요)
+USER_PURGE_ASYNC = getattr(config, 'USER_PURGE_ASYNC', False)
+USER_PURGE_BATCH_SIZE = getattr(config, 'USER_PURGE_BATCH_SIZE', 200)
+_purge_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='user-purge')
+_purge_lock = threading.Lock()
+_purging = set()
+
 # 회원 탈퇴
 def delete_user(user_id):
+    """회원 탈퇴 (USER_PURGE_ASYNC면 계정만 바로 막고 나머지는 백그라운드에서 삭제)"""
+    if USER_PURGE_ASYNC:
+        return _start_user_purge(user_id)
+
     conn = get_db_conn()
     if not conn: return False
     
     cursor = conn.cursor()
     try:
-        # 1. 사용자가 작성한 레시피들의 ID 조회
+        # 1. 사용자가 작성한 레시피들의 ID 조회 (커밋 후 메모리 색인 정리용)
         cursor.execute("SELECT recipe_id FROM RECIPE WHERE author_id = :1", (user_id,))
         recipe_ids = [row[0] for row in cursor.fetchall()]
-        
-        # 2. 각 레시피에 대한 관련 데이터 삭제
-        for recipe_id in recipe_ids:
-            # 레시피의 댓글 삭제
-            cursor.execute("DELETE FROM COMMENT_T WHERE recipe_id = :1", (recipe_id,))
-            # 레시피의 즐겨찾기 삭제
-            cursor.execute("DELETE FROM FAVORITE WHERE recipe_id = :1", (recipe_id,))
-            # 레시피의 조리 순서 삭제
-            cursor.execute("DELETE FROM COOKING_STEP WHERE recipe_id = :1", (recipe_id,))
-            # 레시피의 재료 연결 삭제
-            cursor.execute("DELETE FROM RECIPE_INGREDIENT WHERE recipe_id = :1", (recipe_id,))
-        
-        # 3. 사용자가 작성한 레시피 삭제
-        cursor.execute("DELETE FROM RECIPE WHERE author_id = :1", (user_id,))
-        
-        # 4. 사용자가 작성한 댓글 삭제 (다른 레시피에 단 댓글)
-        cursor.execute("DELETE FROM COMMENT_T WHERE user_id = :1", (user_id,))
-        
-        # 5. 사용자의 즐겨찾기 삭제
-        cursor.execute("DELETE FROM FAVORITE WHERE user_id = :1", (user_id,))
-        
-        # 6. 사용자의 냉장고 재료 삭제
-        cursor.execute("DELETE FROM USER_INGREDIENT WHERE user_id = :1", (user_id,))
-        
-        # 7. 사용자 계정 삭제
-        cursor.execute("DELETE FROM USER_T WHERE user_id = :1", (user_id,))
+        favorited_ids, commented_counts = _user_activity(cursor, user_id)
+
+        # 2. 작성한 레시피와 관련 데이터 삭제
+        _delete_recipes(cursor, "author_id = :1", (user_id,))
+
+        # 3. 사용자의 댓글, 즐겨찾기, 냉장고 재료, 계정 삭제
+        _delete_user_rows(cursor, user_id)
         
         conn.commit()
+        _forget_recipes(recipe_ids)
+        _forget_user(user_id, favorited_ids, commented_counts)
         return True
-    except oracledb.Error as e:
+    except backend.Error as e:
         print(f"회원 탈퇴 실패: {e}")
         conn.rollback()
         return False
@@ -322,15 +481,447 @@ def delete_user(user_id):
         if cursor: cursor.close()
         if conn: conn.close()
 
+def _start_user_purge(user_id):
+    """계정을 USER_PURGE에 등록(로그인 차단)하고 백그라운드 정리 시작"""
+    conn = get_db_conn()
+    if not conn: return False
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            INSERT INTO USER_PURGE (user_id, recipes_total, recipes_done)
+            SELECT U.user_id, (SELECT COUNT(*) FROM RECIPE R WHERE R.author_id = U.user_id), 0
+            FROM USER_T U WHERE U.user_id = :1
+        """, (user_id,))
+        if cursor.rowcount == 0:
+            return False
+        conn.commit()
+    except backend.Error as e:
+        print(f"회원 탈퇴 실패: {e}")
+        conn.rollback()
+        return False
+    finally:
+        if cursor: cursor.close()
+        if conn: conn.close()
+    _submit_user_purge(user_id)
+    return True
+
+def _submit_user_purge(user_id):
+    with _purge_lock:
+        if user_id in _purging:
+            return
+        _purging.add(user_id)
+    _purge_executor.submit(_run_user_purge, user_id)
+
+def _run_user_purge(user_id):
+    try:
+        while _purge_batch(user_id):
+            pass
+    except Exception as e:
+        # USER_PURGE 행이 남으므로 resume_user_purges()로 이어서 정리할 수 있음
+        print(f"회원 탈퇴 정리 실패 ({user_id}): {e}")
+    finally:
+        with _purge_lock:
+            _purging.discard(user_id)
+
+def _purge_batch(user_id):
+    """레시피 한 묶음을 삭제하고 커밋, 남은 레시피가 없으면 계정 삭제 (더 할 일이 있으면 True)"""
+    conn = get_db_conn()
+    if not conn: raise RuntimeError("DB 연결 실패")
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute(backend.limit_rows(
+            "SELECT recipe_id FROM RECIPE WHERE author_id = :1 ORDER BY recipe_id", USER_PURGE_BATCH_SIZE), (user_id,))
+        recipe_ids = [row[0] for row in cursor.fetchall()]
+        if recipe_ids:
+            deleted = _delete_recipes(cursor, _in_condition('recipe_id', len(recipe_ids)), recipe_ids)
+            cursor.execute("UPDATE USER_PURGE SET recipes_done = recipes_done + :1 WHERE user_id = :2", (deleted, user_id))
+            conn.commit()
+            _forget_recipes(recipe_ids)
+            return True
+
+        favorited_ids, commented_counts = _user_activity(cursor, user_id)
+        cursor.execute("DELETE FROM USER_PURGE WHERE user_id = :1", (user_id,))
+        _delete_user_rows(cursor, user_id)
+        conn.commit()
+        _forget_user(user_id, favorited_ids, commented_counts)
+        return False
+    except backend.Error:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+def get_user_purge_status(user_id):
+    """백그라운드 탈퇴 정리 진행 상황 (진행 중인 정리가 없으면 None)
+
+    반환: {'recipes_total', 'recipes_done', 'started_date', 'running'}
+    running이 False면 정리가 중단된 상태 (resume_user_purges()로 재시작)
+    """
+    conn = get_db_conn()
+    if not conn: return None
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT recipes_total, recipes_done, started_date FROM USER_PURGE WHERE user_id = :1", (user_id,))
+        row = cursor.fetchone()
+        if not row:
+            return None
+        with _purge_lock:
+            running = user_id in _purging
+        return {'recipes_total': row[0], 'recipes_done': row[1], 'started_date': row[2], 'running': running}
+    except backend.Error as e:
+        print(f"탈퇴 정리 상태 조회 오류: {e}")
+        return None
+    finally:
+        if cursor: cursor.close()
+        if conn: conn.close()
+
+def resume_user_purges():
+    """중단된 백그라운드 탈퇴 정리 재시작 (서버 시작 시 호출)"""
+    conn = get_db_conn()
+    if not conn: return 0
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT user_id FROM USER_PURGE")
+        user_ids = [row[0] for row in cursor.fetchall()]
+    except backend.Error as e:
+        print(f"탈퇴 정리 재시작 실패: {e}")
+        return 0
+    finally:
+        if cursor: cursor.close()
+        if conn: conn.close()
+    for user_id in user_ids:
+        _submit_user_purge(user_id)
+    return len(user_ids)
+
+# 검색 색인 (제목 / 닉네임 n-gram, 영양 정보 열 저장소)
+# 색인으로 구한 후보가 이보다 많으면 IN 목록 대신 SQL 조건으로 검색
+SEARCH_INDEX_MAX_CANDIDATES = getattr(config, 'SEARCH_INDEX_MAX_CANDIDATES', 5000)
+
+# 메모리 색인(재료 역색인, 제목 / 닉네임 n-gram, 영양 정보)은 이 프로세스의 쓰기만 바로
+# 반영하므로, 다른 워커의 쓰기가 보이도록 이 주기(초)마다 백그라운드에서 다시 만든다
+# (None이면 재구성 안 함, 프로세스 하나로 실행할 때만)
+CATALOG_REFRESH_INTERVAL = getattr(config, 'CATALOG_REFRESH_INTERVAL', 300)
+
+def _ensure_index(index, load_rows, interval=CATALOG_REFRESH_INTERVAL):
+    """색인이 없으면 만들고, 재구성 주기(interval초)가 지났으면 백그라운드 재구성 시작
+
+    처음 만들 때 실패하면 backend.Error / RuntimeError, 재구성하는 동안은 기존 색인 사용
+    (재구성은 한 번에 하나만 실행)
+    """
+    index.ensure_loaded(load_rows)
+    if interval is not None and index.claim_refresh(interval):
+        threading.Thread(target=_refresh_index, args=(index, load_rows),
+                         name='catalog-refresh', daemon=True).start()
+
+def _refresh_index(index, load_rows):
+    try:
+        index.refresh(load_rows)
+    except (backend.Error, RuntimeError) as e:
+        print(f"메모리 색인 재구성 오류: {e}")
+
+def _load_recipe_titles():
+    conn = get_db_conn()
+    if not conn: raise RuntimeError("DB 연결 실패")
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT recipe_id, title FROM RECIPE")
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+
+def _load_user_nicknames():
+    conn = get_db_conn()
+    if not conn: raise RuntimeError("DB 연결 실패")
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT user_id, nickname FROM USER_T")
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+
+def _text_matches(index, load_rows, text):
+    """text를 포함하는 문서 ID 목록 (정렬), 색인을 쓸 수 없으면 None
+
+    LIKE 와일드카드(%, _)가 들어간 검색어는 기존 LIKE 의미를 유지하도록 색인을 쓰지 않음
+    """
+    if '%' in text or '_' in text:
+        return None
+    try:
+        _ensure_index(index, load_rows)
+    except (backend.Error, RuntimeError) as e:
+        print(f"검색 색인 생성 오류: {e}")
+        return None
+    return index.search(text)
+
+def _load_recipe_nutrition():
+    conn = get_db_conn()
+    if not conn: raise RuntimeError("DB 연결 실패")
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT recipe_id, {', '.join(nutrition.COLUMNS)} FROM RECIPE")
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+
+def _nutrition_matches(ranges, within=None, max_count=None):
+    """영양 정보 범위를 모두 만족하는 recipe_id 목록 (정렬)
+
+    열 저장소를 쓸 수 없거나 결과가 max_count개를 넘을 것 같으면 None (SQL 조건 사용)
+    """
+    if not nutrition.available:
+        return None
+    try:
+        _ensure_index(nutrition_store, _load_recipe_nutrition)
+    except (backend.Error, RuntimeError) as e:
+        print(f"영양 정보 색인 생성 오류: {e}")
+        return None
+    return nutrition_store.matching(ranges, within, max_count)
+
+def _ingredient_names(value):
+    """재료 조건 정규화: 이름 하나 또는 목록 → 공백을 뺀 중복 없는 정렬된 튜플"""
+    if not value:
+        return ()
+    if isinstance(value, str):
+        value = [value]
+    return tuple(sorted({name.strip() for name in value if name and name.strip()}))
+
+def _lookup_ingredient_ids(names):
+    """재료 이름 → {name: ingredient_id} (없는 재료는 빠짐), 조회 실패 시 None"""
+    ids = {}
+    misses = []
+    for name in names:
+        ing_id = ingredient_cache.get(name)
+        if ing_id is None:
+            misses.append(name)
+        else:
+            ids[name] = ing_id
+    if not misses:
+        return ids
+
+    conn = get_db_conn()
+    if not conn: return None
+    cursor = conn.cursor()
+    try:
+        found = _select_ingredient_ids(cursor, misses)
+        ingredient_cache.update(found)
+        ids.update(found)
+        return ids
+    except backend.Error as e:
+        print(f"재료 조회 오류: {e}")
+        return None
+    finally:
+        cursor.close()
+        conn.close()
+
+def _ingredient_index_ready():
+    try:
+        _ensure_index(ingredient_index, _load_recipe_ingredients)
+        return True
+    except (backend.Error, RuntimeError) as e:
+        print(f"재료 색인 생성 오류: {e}")
+        return False
+
+def _search_query(keyword=None, author=None, recipe_way=None, recipe_type=None,
+                  calories_min=None, calories_max=None,
+                  carbohydrate_min=None, carbohydrate_max=None,
+                  protein_min=None, protein_max=None,
+                  fat_min=None, fat_max=None,
+                  natrium_min=None, natrium_max=None,
+                  include_ingredient=None, exclude_ingredient=None, include_mode='and',
+                  after=None, before=None, limit=None):
+    """search_recipes 조건으로 (sql, params) 생성, 조건에 맞는 레시피가 있을 수 없으면 None"""
+    if not _ensure_lookups(): return None
+
+    # 조리 방법 / 요리 종류는 메모리 조회 테이블에서 ID로 바꿔 필터링
+    way_id = type_id = None
+    if recipe_way:
+        way_id = lookups.id_of('RECIPE_WAY', recipe_way)
+        if way_id is None: return None
+    if recipe_type:
+        type_id = lookups.id_of('RECIPE_TYPE', recipe_type)
+        if type_id is None: return None
+
+    sql = """
+        SELECT R.recipe_id, R.title, U.nickname, R.recipe_way_id, R.recipe_type_id, 
+               R.info_calories, R.info_carbohydrate, R.info_protein, 
+               R.info_fat, R.info_natrium
+        FROM RECIPE R 
+        JOIN USER_T U ON R.author_id = U.user_id 
+        WHERE 1=1
+    """
+    params = []
+    param_idx = 1
+
+    # 재료 포함 / 제외 조건은 재료 ID로 바꿔 둠
+    include_names = _ingredient_names(include_ingredient)
+    exclude_names = _ingredient_names(exclude_ingredient)
+    match_all = include_mode != 'or'
+    include_ids = exclude_ids = []
+    if include_names or exclude_names:
+        ing_ids = _lookup_ingredient_ids(include_names + exclude_names)
+        if ing_ids is None: return None
+        include_ids = [ing_ids[n] for n in include_names if n in ing_ids]
+        exclude_ids = [ing_ids[n] for n in exclude_names if n in ing_ids]
+        # 없는 재료는 모두 포함이면 결과 없음, 하나라도 포함 / 제외면 무시
+        if include_names and (not include_ids or (match_all and len(include_ids) < len(include_names))):
+            return None
+
+    # 제목 / 재료 / 영양 정보 범위는 메모리 색인으로 후보 recipe_id를 먼저 구해 IN 조건 하나로 검색
+    nutrition_ranges = {col: (lo, hi) for col, lo, hi in (
+        ('info_calories', calories_min, calories_max),
+        ('info_carbohydrate', carbohydrate_min, carbohydrate_max),
+        ('info_protein', protein_min, protein_max),
+        ('info_fat', fat_min, fat_max),
+        ('info_natrium', natrium_min, natrium_max),
+    ) if lo is not None or hi is not None}
+    candidates = None
+    keyword_indexed = nutrition_indexed = include_indexed = exclude_indexed = False
+    if keyword:
+        candidates = _text_matches(title_index, _load_recipe_titles, keyword)
+        keyword_indexed = candidates is not None
+    ingredient_indexed = bool(include_ids or exclude_ids) and _ingredient_index_ready()
+    if include_ids and ingredient_indexed:
+        recipe_ids = ingredient_index.recipes_with(include_ids, match_all)
+        candidates = recipe_ids if candidates is None else sorted(set(candidates).intersection(recipe_ids))
+        include_indexed = True
+    if nutrition_ranges:
+        # 후보가 SEARCH_INDEX_MAX_CANDIDATES개를 넘으면 아래에서 SQL 조건으로 바뀌므로 미리 포기.
+        # 다른 색인 후보와 함께 쓰고 남은 SQL 조건이 없을 때만 limit으로 잘라 쓰므로 상한 없음
+        # (영양 정보만이면 페이지 조회는 SQL이 recipe_id 순서로 limit개에서 멈추는 편이 빠름)
+        sql_filters_left = any([keyword and not keyword_indexed, include_ids and not include_indexed,
+                                exclude_ids and not ingredient_indexed,
+                                author, way_id is not None, type_id is not None])
+        max_count = SEARCH_INDEX_MAX_CANDIDATES
+        if limit is not None and candidates is not None and not sql_filters_left:
+            max_count = None
+        recipe_ids = _nutrition_matches(nutrition_ranges, candidates, max_count)
+        if recipe_ids is not None:
+            candidates = recipe_ids
+            nutrition_indexed = True
+    if exclude_ids and ingredient_indexed and candidates is not None:
+        candidates = ingredient_index.without(candidates, exclude_ids)
+        exclude_indexed = True
+    if candidates is not None:
+        candidates = id_range(candidates, after, before)
+        if not candidates: return None
+        sql_filters = any([keyword and not keyword_indexed, nutrition_ranges and not nutrition_indexed,
+                           include_ids and not include_indexed, exclude_ids and not exclude_indexed,
+                           author, way_id is not None, type_id is not None])
+        if limit is not None and not sql_filters:
+            # 남은 SQL 조건이 없으면 후보가 곧 결과이므로 정렬 순서대로 limit개만 조회
+            candidates = candidates[:limit] if before is not None else candidates[-limit:]
+        if len(candidates) > SEARCH_INDEX_MAX_CANDIDATES:
+            candidates = None
+            keyword_indexed = nutrition_indexed = include_indexed = exclude_indexed = False
+
+    if candidates is not None:
+        sql += " AND " + _in_condition("R.recipe_id", len(candidates), param_idx)
+        params.extend(candidates)
+        param_idx += len(candidates)
+
+    # 기본 검색 조건
+    if keyword and not keyword_indexed:
+        sql += f" AND R.title LIKE :{param_idx}"
+        params.append(f"%{keyword}%")
+        param_idx += 1
+
+    if author:
+        user_ids = _text_matches(nickname_index, _load_user_nicknames, author)
+        if user_ids is not None and not user_ids: return None
+        if user_ids is None or len(user_ids) > SEARCH_INDEX_MAX_CANDIDATES:
+            sql += f" AND U.nickname LIKE :{param_idx}"
+            params.append(f"%{author}%")
+            param_idx += 1
+        else:
+            sql += " AND " + _in_condition("R.author_id", len(user_ids), param_idx)
+            params.extend(user_ids)
+            param_idx += len(user_ids)
+
+    if way_id is not None:
+        sql += f" AND R.recipe_way_id = :{param_idx}"
+        params.append(way_id)
+        param_idx += 1
+
+    if type_id is not None:
+        sql += f" AND R.recipe_type_id = :{param_idx}"
+        params.append(type_id)
+        param_idx += 1
+
+    # 세부 검색 조건 (영양 정보 범위, 열 저장소를 쓰지 못한 경우)
+    if not nutrition_indexed:
+        for col, (lo, hi) in nutrition_ranges.items():
+            if lo is not None:
+                sql += f" AND R.{col} >= :{param_idx}"
+                params.append(lo)
+                param_idx += 1
+            if hi is not None:
+                sql += f" AND R.{col} <= :{param_idx}"
+                params.append(hi)
+                param_idx += 1
+
+    # 재료 포함 / 제외 조건 (재료 역색인을 쓰지 못한 경우, 재료 수와 관계없이 서브쿼리 하나씩)
+    if include_ids and not include_indexed:
+        if match_all and len(include_ids) > 1:
+            sql += f""" AND R.recipe_id IN (
+                SELECT RI.recipe_id FROM RECIPE_INGREDIENT RI
+                WHERE RI.ingredient_id IN ({_in_clause(len(include_ids), param_idx)})
+                GROUP BY RI.recipe_id
+                HAVING COUNT(DISTINCT RI.ingredient_id) = :{param_idx + len(include_ids)}
+            )"""
+            params.extend(include_ids)
+            params.append(len(include_ids))
+            param_idx += len(include_ids) + 1
+        else:
+            sql += f""" AND EXISTS (
+                SELECT 1 FROM RECIPE_INGREDIENT RI
+                WHERE RI.recipe_id = R.recipe_id
+                  AND RI.ingredient_id IN ({_in_clause(len(include_ids), param_idx)})
+            )"""
+            params.extend(include_ids)
+            param_idx += len(include_ids)
+
+    if exclude_ids and not exclude_indexed:
+        sql += f""" AND NOT EXISTS (
+            SELECT 1 FROM RECIPE_INGREDIENT RI
+            WHERE RI.recipe_id = R.recipe_id
+              AND RI.ingredient_id IN ({_in_clause(len(exclude_ids), param_idx)})
+        )"""
+        params.extend(exclude_ids)
+        param_idx += len(exclude_ids)
+
+    # 키셋 페이지네이션 (정렬 키: recipe_id)
+    if after is not None:
+        sql += f" AND R.recipe_id < :{param_idx}"
+        params.append(after)
+        param_idx += 1
+    if before is not None:
+        sql += f" AND R.recipe_id > :{param_idx}"
+        params.append(before)
+        param_idx += 1
+    sql += " ORDER BY R.recipe_id ASC" if before is not None else " ORDER BY R.recipe_id DESC"
+    if limit is not None:
+        sql = backend.limit_rows(sql, limit)
+    return sql, params
+
 def search_recipes(keyword=None, author=None, recipe_way=None, recipe_type=None,
                    calories_min=None, calories_max=None,
                    carbohydrate_min=None, carbohydrate_max=None,
                    protein_min=None, protein_max=None,
                    fat_min=None, fat_max=None,
                    natrium_min=None, natrium_max=None,
-                   include_ingredient=None, exclude_ingredient=None):
+                   include_ingredient=None, exclude_ingredient=None, include_mode='and',
+                   after=None, before=None, limit=None):
     """
-    레시피 검색 함수
+    레시피 검색 함수 (최신 레시피 순, recipe_id 내림차순)
+    결과는 검색 캐시와 공유하므로 반환된 목록과 dict는 수정하지 말 것
     
     기본 검색:
     - keyword: 레시피 제목 검색
@@ -345,135 +936,146 @@ def search_recipes(keyword=None, author=None, recipe_way=None, recipe_type=None,
     - fat_min, fat_max: 지방 범위
     - natrium_min, natrium_max: 나트륨 범위
     
-    재료 필터:
+    재료 필터 (재료 이름 하나 또는 목록):
     - include_ingredient: 포함해야 할 재료
-    - exclude_ingredient: 제외할 재료
+    - exclude_ingredient: 제외할 재료 (하나라도 들어가면 제외)
+    - include_mode: 'and'면 포함 재료를 모두, 'or'면 하나라도 포함
+    
+    키셋 페이지네이션 (search_recipes_page에서 사용):
+    - after: 이 recipe_id보다 오래된 레시피부터
+    - before: 이 recipe_id보다 최신인 레시피 중 가장 오래된 것부터 (오름차순으로 반환)
+    - limit: 최대 행 수
     """
+    filters = dict(
+        keyword=keyword,
+        author=author,
+        recipe_way=recipe_way,
+        recipe_type=recipe_type,
+        calories_min=calories_min,
+        calories_max=calories_max,
+        carbohydrate_min=carbohydrate_min,
+        carbohydrate_max=carbohydrate_max,
+        protein_min=protein_min,
+        protein_max=protein_max,
+        fat_min=fat_min,
+        fat_max=fat_max,
+        natrium_min=natrium_min,
+        natrium_max=natrium_max,
+        include_ingredient=_ingredient_names(include_ingredient),
+        exclude_ingredient=_ingredient_names(exclude_ingredient),
+        include_mode=include_mode,
+        after=after,
+        before=before,
+        limit=limit
+    )
+    # 같은 조건의 검색은 catalog 쓰기 epoch가 바뀌기 전까지 캐시된 결과 사용
+    epoch = _catalog_epoch
+    key = (epoch, _search_cache_key(filters))
+    rows = search_cache.get(key)
+    if rows is not None:
+        return rows
+
+    query = _search_query(**filters)
+    if query is None: return []
+
     conn = get_db_conn()
     if not conn: return []
     
     cursor = conn.cursor()
     try:
-        sql = """
-            SELECT R.recipe_id, R.title, U.nickname, RW.way_name, RT.type_name, 
-                   R.info_calories, R.info_carbohydrate, R.info_protein, 
-                   R.info_fat, R.info_natrium
-            FROM RECIPE R 
-            JOIN USER_T U ON R.author_id = U.user_id 
-            JOIN RECIPE_WAY RW ON R.recipe_way_id = RW.recipe_way_id 
-            JOIN RECIPE_TYPE RT ON R.recipe_type_id = RT.recipe_type_id
-            WHERE 1=1
-        """
-        params = []
-        param_idx = 1
-        
-        # 기본 검색 조건
-        if keyword:
-            sql += f" AND R.title LIKE :{param_idx}"
-            params.append(f"%{keyword}%")
-            param_idx += 1
-            
-        if author:
-            sql += f" AND U.nickname LIKE :{param_idx}"
-            params.append(f"%{author}%")
-            param_idx += 1
-            
-        if recipe_way:
-            sql += f" AND RW.way_name = :{param_idx}"
-            params.append(recipe_way)
-            param_idx += 1
-            
-        if recipe_type:
-            sql += f" AND RT.type_name = :{param_idx}"
-            params.append(recipe_type)
-            param_idx += 1
-        
-        # 세부 검색 조건 (영양 정보 범위)
-        if calories_min is not None:
-            sql += f" AND R.info_calories >= :{param_idx}"
-            params.append(calories_min)
-            param_idx += 1
-            
-        if calories_max is not None:
-            sql += f" AND R.info_calories <= :{param_idx}"
-            params.append(calories_max)
-            param_idx += 1
-            
-        if carbohydrate_min is not None:
-            sql += f" AND R.info_carbohydrate >= :{param_idx}"
-            params.append(carbohydrate_min)
-            param_idx += 1
-            
-        if carbohydrate_max is not None:
-            sql += f" AND R.info_carbohydrate <= :{param_idx}"
-            params.append(carbohydrate_max)
-            param_idx += 1
-            
-        if protein_min is not None:
-            sql += f" AND R.info_protein >= :{param_idx}"
-            params.append(protein_min)
-            param_idx += 1
-            
-        if protein_max is not None:
-            sql += f" AND R.info_protein <= :{param_idx}"
-            params.append(protein_max)
-            param_idx += 1
-            
-        if fat_min is not None:
-            sql += f" AND R.info_fat >= :{param_idx}"
-            params.append(fat_min)
-            param_idx += 1
-            
-        if fat_max is not None:
-            sql += f" AND R.info_fat <= :{param_idx}"
-            params.append(fat_max)
-            param_idx += 1
-            
-        if natrium_min is not None:
-            sql += f" AND R.info_natrium >= :{param_idx}"
-            params.append(natrium_min)
-            param_idx += 1
-            
-        if natrium_max is not None:
-            sql += f" AND R.info_natrium <= :{param_idx}"
-            params.append(natrium_max)
-            param_idx += 1
-        
-        # 재료 포함 조건
-        if include_ingredient:
-            sql += f""" AND EXISTS (
-                SELECT 1 FROM RECIPE_INGREDIENT RI
-                JOIN INGREDIENT I ON RI.ingredient_id = I.ingredient_id
-                WHERE RI.recipe_id = R.recipe_id AND I.name = :{param_idx}
-            )"""
-            params.append(include_ingredient)
-            param_idx += 1
-        
-        # 재료 제외 조건
-        if exclude_ingredient:
-            sql += f""" AND NOT EXISTS (
-                SELECT 1 FROM RECIPE_INGREDIENT RI
-                JOIN INGREDIENT I ON RI.ingredient_id = I.ingredient_id
-                WHERE RI.recipe_id = R.recipe_id AND I.name = :{param_idx}
-            )"""
-            params.append(exclude_ingredient)
-            param_idx += 1
-        
-        cursor.execute(sql, params)
+        cursor.execute(*query)
         
         if cursor.description:
             columns = [col[0].lower() for col in cursor.description]
-            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            rows = _attach_lookup_names([dict(zip(columns, row)) for row in cursor.fetchall()])
+            with _catalog_lock:
+                if epoch == _catalog_epoch:
+                    search_cache.put(key, rows)
+            return rows
         return []
-    except oracledb.Error as e:
+    except backend.Error as e:
         print(f"레시피 검색 오류: {e}")
         return []
     finally:
         if cursor: cursor.close()
         if conn: conn.close()
 
+# 스트리밍 검색 (결과 전체를 메모리에 올리지 않고 fetchmany로 나눠 읽기)
+SEARCH_FETCH_ARRAYSIZE = getattr(config, 'SEARCH_FETCH_ARRAYSIZE', 500)
+
+def _iter_rows(cursor, batch_size=None):
+    """실행된 커서의 결과를 batch_size(arraysize)씩 읽어 dict로 하나씩 yield"""
+    cursor.arraysize = batch_size or SEARCH_FETCH_ARRAYSIZE
+    columns = [col[0].lower() for col in cursor.description]
+    while True:
+        rows = cursor.fetchmany()
+        if not rows: break
+        yield from _attach_lookup_names([dict(zip(columns, row)) for row in rows])
+
+def iter_search_recipes(batch_size=None, **filters):
+    """search_recipes와 같은 조건의 결과를 하나씩 yield (최신 레시피 순)
+
+    커넥션은 생성기가 끝나거나 닫힐 때 반환하므로 끝까지 읽거나 close()를 호출해야 함
+    """
+    query = _search_query(**filters)
+    if query is None: return
+
+    conn = get_db_conn()
+    if not conn: return
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute(*query)
+        if cursor.description:
+            yield from _iter_rows(cursor, batch_size)
+    except backend.Error as e:
+        print(f"레시피 검색 오류: {e}")
+    finally:
+        cursor.close()
+        conn.close()
+
+# 조리방법, 요리종류 조회 테이블 (메모리에 한 번 읽어 두고 refresh_lookups로 갱신)
+def _load_lookup_rows(table_name, id_col, name_col):
+    conn = get_db_conn()
+    if not conn: raise RuntimeError("DB 연결 실패")
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT {id_col}, {name_col} FROM {table_name}")
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+
+def refresh_lookups():
+    """RECIPE_WAY, RECIPE_TYPE 다시 읽기 (앱 시작 시, 테이블 변경 후 호출)"""
+    try:
+        lookups.refresh(_load_lookup_rows)
+        return True
+    except (backend.Error, RuntimeError) as e:
+        print(f"조회 테이블 로드 실패: {e}")
+        return False
+
+def _ensure_lookups():
+    try:
+        lookups.ensure_loaded(_load_lookup_rows)
+        return True
+    except (backend.Error, RuntimeError) as e:
+        print(f"조회 테이블 로드 실패: {e}")
+        return False
+
+def _attach_lookup_names(rows):
+    """recipe_way_id / recipe_type_id 를 way_name / type_name 으로 바꿔 채움"""
+    for row in rows:
+        row['way_name'] = lookups.name_of('RECIPE_WAY', row.pop('recipe_way_id'))
+        row['type_name'] = lookups.name_of('RECIPE_TYPE', row.pop('recipe_type_id'))
+    return rows
+
 # 조리방법, 요리종류 이름으로 ID 조회
 def get_id_by_name(table_name, id_col, name_col, value):
+    if table_name.upper() in LOOKUP_TABLES:
+        if not _ensure_lookups(): return None
+        return lookups.id_of(table_name.upper(), value)
+
     conn = get_db_conn()
     if not conn: return None
     cursor = conn.cursor()
@@ -486,65 +1088,184 @@ def get_id_by_name(table_name, id_col, name_col, value):
         cursor.close()
         conn.close()
 
+def _select_ingredient_ids(cursor, names):
+    ids = {}
+    for i in range(0, len(names), IN_CHUNK_SIZE):
+        chunk = names[i:i + IN_CHUNK_SIZE]
+        cursor.execute(f"SELECT name, ingredient_id FROM INGREDIENT WHERE name IN ({_in_clause(len(chunk))})", chunk)
+        ids.update(cursor.fetchall())
+    return ids
+
+def _resolve_ingredient_ids(cursor, names, new_ids=None):
+    """재료 이름 목록 → {name: ingredient_id} (없는 재료는 한 번에 추가)
+
+    ingredient_cache를 먼저 보고 나머지만 DB에서 조회한다. 다른 세션이 같은
+    재료를 동시에 추가해도 UNIQUE(name) 위반 행은 건너뛰고 다시 조회하므로
+    양쪽 모두 같은 ID를 얻는다. 새로 추가한 ID는 커밋 전이므로 캐시에 넣지
+    않으며, 호출한 쪽이 커밋 후 ingredient_cache.update()로 넣는다.
+    new_ids(_reserve_ingredient_ids)가 있으면 새 재료에 그 ID를 쓰고,
+    모자라는 만큼은 DB가 ID를 정한다.
+    """
+    ids = {}
+    misses = []
+    for name in dict.fromkeys(names):
+        ing_id = ingredient_cache.get(name)
+        if ing_id is None:
+            misses.append(name)
+        else:
+            ids[name] = ing_id
+    if not misses:
+        return ids
+
+    found = _select_ingredient_ids(cursor, misses)
+    ingredient_cache.update(found)
+    ids.update(found)
+    new_names = [n for n in misses if n not in found]
+    if new_names:
+        id_rows = list(zip(new_ids or (), new_names))
+        if id_rows:
+            backend.insert_ignore_duplicates(cursor, "INSERT INTO INGREDIENT (ingredient_id, name) VALUES (:1, :2)", id_rows)
+        if len(id_rows) < len(new_names):
+            backend.insert_ignore_duplicates(cursor, "INSERT INTO INGREDIENT (name) VALUES (:1)",
+                                             [(n,) for n in new_names[len(id_rows):]])
+        ids.update(_select_ingredient_ids(cursor, new_names))
+    return ids
+
+def _insert_recipe_children(cursor, recipe_id, ingredients_data, steps_data, new_ing_ids=None):
+    """재료 연결(RECIPE_INGREDIENT)과 조리 순서(COOKING_STEP)를 배열 바인드로 삽입
+
+    레시피 크기와 관계없이 왕복 횟수가 일정하다. 사용한 {재료 이름: ID} 반환
+    """
+    ing_map = _resolve_ingredient_ids(cursor, [ing['name'] for ing in ingredients_data], new_ing_ids)
+    # 같은 재료가 두 번 나오면 처음 양만 사용 (_sync_recipe_children과 같게)
+    wanted_ings = {}
+    for ing in ingredients_data:
+        wanted_ings.setdefault(ing_map[ing['name']], ing['amount'])
+    ing_rows = [(recipe_id, ing_id, amount) for ing_id, amount in wanted_ings.items()]
+    if ing_rows:
+        cursor.executemany("""
+            INSERT INTO RECIPE_INGREDIENT (recipe_id, ingredient_id, amount)
+            VALUES (:1, :2, :3)
+        """, ing_rows)
+
+    step_rows = [(recipe_id, idx + 1, instruction) for idx, instruction in enumerate(steps_data)]
+    if step_rows:
+        cursor.executemany("""
+            INSERT INTO COOKING_STEP (recipe_id, step_number, instruction)
+            VALUES (:1, :2, :3)
+        """, step_rows)
+    return ing_map
+
+def _same_text(a, b):
+    # Oracle은 빈 문자열을 NULL로 저장하므로 둘을 같게 취급
+    return (a or None) == (b or None)
+
+def _sync_recipe_children(cursor, recipe_id, ingredients_data, steps_data, new_ing_ids=None):
+    """저장된 재료/조리 순서와 비교해 추가·수정·삭제할 행만 배열 바인드로 반영
+
+    바뀐 것이 없으면 자식 테이블에는 쓰지 않는다.
+    반환: ({재료 이름: ID}, 재료 구성이 바뀌었는지)
+    """
+    (_, stored_ings), (_, stored_steps) = backend.fetch_result_sets(cursor, [
+        "SELECT ingredient_id, amount FROM RECIPE_INGREDIENT WHERE recipe_id = :recipe_id",
+        "SELECT step_number, instruction FROM COOKING_STEP WHERE recipe_id = :recipe_id",
+    ], {'recipe_id': recipe_id})
+    stored_ings = dict(stored_ings)
+    stored_steps = dict(stored_steps)
+
+    ing_map = _resolve_ingredient_ids(cursor, [ing['name'] for ing in ingredients_data], new_ing_ids)
+    wanted_ings = {}
+    for ing in ingredients_data:
+        wanted_ings.setdefault(ing_map[ing['name']], ing['amount'])
+    wanted_steps = {idx + 1: instruction for idx, instruction in enumerate(steps_data)}
+
+    # 재료 연결 (키: ingredient_id)
+    ing_deletes = [(recipe_id, i) for i in stored_ings if i not in wanted_ings]
+    ing_inserts = [(recipe_id, i, a) for i, a in wanted_ings.items() if i not in stored_ings]
+    ing_updates = [(a, recipe_id, i) for i, a in wanted_ings.items()
+                   if i in stored_ings and not _same_text(a, stored_ings[i])]
+    if ing_deletes:
+        cursor.executemany("DELETE FROM RECIPE_INGREDIENT WHERE recipe_id = :1 AND ingredient_id = :2", ing_deletes)
+    if ing_updates:
+        cursor.executemany("UPDATE RECIPE_INGREDIENT SET amount = :1 WHERE recipe_id = :2 AND ingredient_id = :3", ing_updates)
+    if ing_inserts:
+        cursor.executemany("""
+            INSERT INTO RECIPE_INGREDIENT (recipe_id, ingredient_id, amount)
+            VALUES (:1, :2, :3)
+        """, ing_inserts)
+
+    # 조리 순서 (키: step_number)
+    step_deletes = [(recipe_id, n) for n in stored_steps if n not in wanted_steps]
+    step_inserts = [(recipe_id, n, t) for n, t in wanted_steps.items() if n not in stored_steps]
+    step_updates = [(t, recipe_id, n) for n, t in wanted_steps.items()
+                    if n in stored_steps and not _same_text(t, stored_steps[n])]
+    if step_deletes:
+        cursor.executemany("DELETE FROM COOKING_STEP WHERE recipe_id = :1 AND step_number = :2", step_deletes)
+    if step_updates:
+        cursor.executemany("UPDATE COOKING_STEP SET instruction = :1 WHERE recipe_id = :2 AND step_number = :3", step_updates)
+    if step_inserts:
+        cursor.executemany("""
+            INSERT INTO COOKING_STEP (recipe_id, step_number, instruction)
+            VALUES (:1, :2, :3)
+        """, step_inserts)
+
+    return ing_map, bool(ing_deletes or ing_inserts)
+
 def create_recipe(user_id, title, description, type_id, way_id, 
                   cal, carbo, protein, fat, natrium, 
                   ingredients_data, steps_data):
+    try:
+        # 블록 ID는 트랜잭션 시작 전에 받아 둠
+        recipe_id = next_id('RECIPE') if ID_BLOCK_INSERTS else None
+        new_ing_ids = _reserve_ingredient_ids([ing['name'] for ing in ingredients_data])
+    except backend.Error as e:
+        print(f"레시피 등록 실패: {e}")
+        return None
     conn = get_db_conn()
-    if not conn: return False
+    if not conn: return None
     
     cursor = conn.cursor()
     try:
         # RECIPE 테이블 삽입
-        recipe_id_var = cursor.var(int)
-        
-        sql_recipe = """
-            INSERT INTO RECIPE (
-                title, description, author_id, 
-                recipe_type_id, recipe_way_id, 
-                info_calories, info_carbohydrate, info_protein, info_fat, info_natrium
-            ) VALUES (
-                :1, :2, :3, :4, :5, :6, :7, :8, :9, :10
-            ) RETURNING recipe_id INTO :11
-        """
-        cursor.execute(sql_recipe, (
+        values = [
             title, description, user_id, 
             type_id, way_id, 
-            cal, carbo, protein, fat, natrium,
-            recipe_id_var
-        ))
-        
-        recipe_id = recipe_id_var.getvalue()[0]
-        
-        # 2. 재료 삽입 (RECIPE_INGREDIENT)
-        for ing in ingredients_data:
-            name = ing['name']
-            amount = ing['amount']
-            
-            # 재료 ID 조회 (없으면 생성)
-            cursor.execute("SELECT ingredient_id FROM INGREDIENT WHERE name = :1", (name,))
-            res = cursor.fetchone()
-            if res:
-                ing_id = res[0]
-            else:
-                ing_id_var = cursor.var(int)
-                cursor.execute("INSERT INTO INGREDIENT (name) VALUES (:1) RETURNING ingredient_id INTO :2", [name, ing_id_var])
-                ing_id = ing_id_var.getvalue()[0]
-            
-            # 레시피-재료 연결
-            cursor.execute("""
-                INSERT INTO RECIPE_INGREDIENT (recipe_id, ingredient_id, amount)
-                VALUES (:1, :2, :3)
-            """, (recipe_id, ing_id, amount))
-
-        # 3. 조리 순서 삽입 (COOKING_STEP)
-        for idx, instruction in enumerate(steps_data):
-            step_num = idx + 1
+            cal, carbo, protein, fat, natrium
+        ]
+        if recipe_id is None:
+            sql_recipe = """
+                INSERT INTO RECIPE (
+                    title, description, author_id, 
+                    recipe_type_id, recipe_way_id, 
+                    info_calories, info_carbohydrate, info_protein, info_fat, info_natrium
+                ) VALUES (
+                    :1, :2, :3, :4, :5, :6, :7, :8, :9, :10
+                )
+            """
+            recipe_id = backend.insert_returning_id(cursor, sql_recipe, values, 'recipe_id')
+        else:
+            # 블록 ID를 쓰면 생성된 ID를 돌려받을 필요가 없음
             cursor.execute("""
-                INSERT INTO COOKING_STEP (recipe_id, step_number, instruction)
-                VALUES (:1, :2, :3)
-            """, (recipe_id, step_num, instruction))
+                INSERT INTO RECIPE (
+                    recipe_id, title, description, author_id, 
+                    recipe_type_id, recipe_way_id, 
+                    info_calories, info_carbohydrate, info_protein, info_fat, info_natrium
+                ) VALUES (
+                    :1, :2, :3, :4, :5, :6, :7, :8, :9, :10, :11
+                )
+            """, [recipe_id, *values])
+        
+        # 2. 재료, 조리 순서 삽입
+        ing_map = _insert_recipe_children(cursor, recipe_id, ingredients_data, steps_data, new_ing_ids)
             
         conn.commit()
+        ingredient_cache.update(ing_map)
+        ingredient_index.set_recipe(recipe_id, ing_map.values())
+        title_index.set_document(recipe_id, title)
+        nutrition_store.set_recipe(recipe_id, (cal, carbo, protein, fat, natrium))
+        favorite_ranking.add_recipe(recipe_id)
+        comment_ranking.add_recipe(recipe_id)
+        _bump_catalog_epoch()
         return recipe_id
     except Exception as e:
         print(f"레시피 등록 실패: {e}")
@@ -558,6 +1279,11 @@ def create_recipe(user_id, title, description, type_id, way_id,
 def update_recipe(recipe_id, title, description, type_id, way_id, 
                   cal, carbo, protein, fat, natrium, 
                   ingredients_data, steps_data):
+    try:
+        new_ing_ids = _reserve_ingredient_ids([ing['name'] for ing in ingredients_data])
+    except backend.Error as e:
+        print(f"레시피 수정 실패: {e}")
+        return False
     conn = get_db_conn()
     if not conn: return False
     
@@ -583,42 +1309,17 @@ def update_recipe(recipe_id, title, description, type_id, way_id,
             recipe_id
         ))
         
-        # 2. 기존 재료 삭제
-        cursor.execute("DELETE FROM RECIPE_INGREDIENT WHERE recipe_id = :1", (recipe_id,))
-        
-        # 3. 재료 재삽입
-        for ing in ingredients_data:
-            name = ing['name']
-            amount = ing['amount']
-            
-            # 재료 ID 조회 (없으면 생성)
-            cursor.execute("SELECT ingredient_id FROM INGREDIENT WHERE name = :1", (name,))
-            res = cursor.fetchone()
-            if res:
-                ing_id = res[0]
-            else:
-                ing_id_var = cursor.var(int)
-                cursor.execute("INSERT INTO INGREDIENT (name) VALUES (:1) RETURNING ingredient_id INTO :2", [name, ing_id_var])
-                ing_id = ing_id_var.getvalue()[0]
-            
-            # 레시피-재료 연결
-            cursor.execute("""
-                INSERT INTO RECIPE_INGREDIENT (recipe_id, ingredient_id, amount)
-                VALUES (:1, :2, :3)
-            """, (recipe_id, ing_id, amount))
-        
-        # 4. 기존 조리 순서 삭제
-        cursor.execute("DELETE FROM COOKING_STEP WHERE recipe_id = :1", (recipe_id,))
-        
-        # 5. 조리 순서 재삽입
-        for idx, instruction in enumerate(steps_data):
-            step_num = idx + 1
-            cursor.execute("""
-                INSERT INTO COOKING_STEP (recipe_id, step_number, instruction)
-                VALUES (:1, :2, :3)
-            """, (recipe_id, step_num, instruction))
+        # 2. 재료, 조리 순서는 저장된 값과 비교해 바뀐 행만 반영
+        ing_map, ingredients_changed = _sync_recipe_children(cursor, recipe_id, ingredients_data, steps_data, new_ing_ids)
         
         conn.commit()
+        ingredient_cache.update(ing_map)
+        if ingredients_changed:
+            ingredient_index.set_recipe(recipe_id, ing_map.values())
+        title_index.set_document(recipe_id, title)
+        nutrition_store.set_recipe(recipe_id, (cal, carbo, protein, fat, natrium))
+        _bump_catalog_epoch()
+        _invalidate_details(recipe_id)
         return True
     except Exception as e:
         print(f"레시피 수정 실패: {e}")
@@ -636,22 +1337,11 @@ def delete_recipe(recipe_id):
     cursor = conn.cursor()
     try:
         # CASCADE 설정이 되어있다면 자동으로 삭제되지만, 명시적으로 삭제
-        # 1. 댓글 삭제
-        cursor.execute("DELETE FROM COMMENT_T WHERE recipe_id = :1", (recipe_id,))
-        
-        # 2. 즐겨찾기 삭제
-        cursor.execute("DELETE FROM FAVORITE WHERE recipe_id = :1", (recipe_id,))
-        
-        # 3. 조리 순서 삭제
-        cursor.execute("DELETE FROM COOKING_STEP WHERE recipe_id = :1", (recipe_id,))
-        
-        # 4. 재료 연결 삭제
-        cursor.execute("DELETE FROM RECIPE_INGREDIENT WHERE recipe_id = :1", (recipe_id,))
-        
-        # 5. 레시피 삭제
-        cursor.execute("DELETE FROM RECIPE WHERE recipe_id = :1", (recipe_id,))
+        # (댓글, 즐겨찾기, 조리 순서, 재료 연결, 레시피 순)
+        _delete_recipes(cursor, "recipe_id = :1", (recipe_id,))
         
         conn.commit()
+        _forget_recipes([recipe_id])
         return True
     except Exception as e:
         print(f"레시피 삭제 실패: {e}")
@@ -661,169 +1351,444 @@ def delete_recipe(recipe_id):
         if cursor: cursor.close()
         if conn: conn.close()
 
-# 레시피 상세 조회
+# 레시피 상세 조회 (기본 정보, 재료, 조리 단계, 댓글을 한 번에 조회)
+_DETAIL_SQL = [
+    """SELECT R.*, U.nickname, RW.way_name, RT.type_name 
+       FROM RECIPE R 
+       JOIN USER_T U ON R.author_id = U.user_id 
+       JOIN RECIPE_WAY RW ON R.recipe_way_id = RW.recipe_way_id 
+       JOIN RECIPE_TYPE RT ON R.recipe_type_id = RT.recipe_type_id 
+       WHERE R.recipe_id = :recipe_id""",
+    """SELECT I.name, RI.amount 
+       FROM RECIPE_INGREDIENT RI
+       JOIN INGREDIENT I ON RI.ingredient_id = I.ingredient_id
+       WHERE RI.recipe_id = :recipe_id""",
+    """SELECT step_number, instruction FROM COOKING_STEP
+       WHERE recipe_id = :recipe_id ORDER BY step_number""",
+    """SELECT C.comment_id, C.user_id, C.content, U.nickname 
+       FROM COMMENT_T C 
+       JOIN USER_T U ON C.user_id = U.user_id 
+       WHERE C.recipe_id = :recipe_id""",
+]
+
+def _bump_catalog_epoch():
+    """검색 결과 캐시 무효화 (레시피 / 닉네임 쓰기 커밋 후 호출)"""
+    global _catalog_epoch
+    with _catalog_lock:
+        _catalog_epoch += 1
+        search_cache.clear()
+
+def _search_cache_key(filters):
+    """검색 조건 정규화 (빈 조건은 빼고 이름 순으로)"""
+    return tuple(sorted((name, value) for name, value in filters.items()
+                        if value not in (None, '', ())))
+
+def _invalidate_details(*recipe_ids):
+    """레시피 상세 캐시 무효화 (쓰기 커밋 후 호출)"""
+    global _detail_epoch
+    with _detail_lock:
+        _detail_epoch += 1
+    for recipe_id in recipe_ids:
+        detail_cache.pop(recipe_id)
+
+def _build_detail(results):
+    """_DETAIL_SQL 결과 집합들로 상세 dict 구성 (레시피가 없으면 None)"""
+    (col_basic, info), (col_ing, ings), (col_steps, steps), (col_comments, comments) = results
+    if not info: return None
+
+    data = {
+        'info': dict(zip(col_basic, info[0])),
+        'ingredients': [dict(zip(col_ing, r)) for r in ings],
+        'steps': [],
+        'comments': [dict(zip(col_comments, r)) for r in comments],
+    }
+    for r in steps:
+        step_dict = dict(zip(col_steps, r))
+        step_dict['instruction'] = re.sub(r'^\d+\.\s*', '', step_dict['instruction'])
+        data['steps'].append(step_dict)
+    return data
+
+def _store_detail(recipe_id, epoch, data):
+    """조회 시작 후 무효화가 없었을 때만 상세 캐시에 저장"""
+    if data is None: return
+    with _detail_lock:
+        if epoch == _detail_epoch:
+            detail_cache.put(recipe_id, data)
+
 def get_recipe_detail(recipe_id):
+    """레시피 상세 (recipe_id별 캐시, 반환된 dict는 수정하지 말 것)"""
+    data = detail_cache.get(recipe_id)
+    if data is not None:
+        return data
+
+    # 조회 중에 무효화가 일어나면 읽은 값이 오래됐을 수 있으므로 캐시에 넣지 않음
+    epoch = _detail_epoch
     conn = get_db_conn()
     if not conn: return None
     
     cursor = conn.cursor()
-    data = {}
     try:
-        # 기본 정보
-        cursor.execute("""
-            SELECT R.*, U.nickname, RW.way_name, RT.type_name 
-            FROM RECIPE R 
-            JOIN USER_T U ON R.author_id = U.user_id 
-            JOIN RECIPE_WAY RW ON R.recipe_way_id = RW.recipe_way_id 
-            JOIN RECIPE_TYPE RT ON R.recipe_type_id = RT.recipe_type_id 
-            WHERE R.recipe_id = :1
-        """, (recipe_id,))
-        
-        row = cursor.fetchone()
-        if not row: return None
-        
-        col_basic = [col[0].lower() for col in cursor.description]
-        data['info'] = dict(zip(col_basic, row))
-
-        # 재료
-        cursor.execute("""
-            SELECT I.name, RI.amount 
-            FROM RECIPE_INGREDIENT RI
-            JOIN INGREDIENT I ON RI.ingredient_id = I.ingredient_id
-            WHERE RI.recipe_id = :1
-        """, (recipe_id,))
-        
-        if cursor.description:
-            col_ing = [col[0].lower() for col in cursor.description]
-            data['ingredients'] = [dict(zip(col_ing, r)) for r in cursor.fetchall()]
-        else:
-            data['ingredients'] = []
-
-        # 조리 단계
-        cursor.execute("SELECT step_number, instruction FROM COOKING_STEP WHERE recipe_id = :1 ORDER BY step_number", (recipe_id,))
-        if cursor.description:
-            col_steps = [col[0].lower() for col in cursor.description]
-            steps_raw = cursor.fetchall()
-            
-            cleaned_steps = []
-            for r in steps_raw:
-                step_dict = dict(zip(col_steps, r))
-                step_dict['instruction'] = re.sub(r'^\d+\.\s*', '', step_dict['instruction'])
-                cleaned_steps.append(step_dict)
-                
-            data['steps'] = cleaned_steps
-        else:
-            data['steps'] = []
-
-        # 댓글
-        cursor.execute("""
-            SELECT C.comment_id, C.user_id, C.content, U.nickname 
-            FROM COMMENT_T C 
-            JOIN USER_T U ON C.user_id = U.user_id 
-            WHERE C.recipe_id = :1
-        """, (recipe_id,))
-        
-        if cursor.description:
-            col_comments = [col[0].lower() for col in cursor.description]
-            data['comments'] = [dict(zip(col_comments, r)) for r in cursor.fetchall()]
-        else:
-            data['comments'] = []
-
+        data = _build_detail(backend.fetch_result_sets(cursor, _DETAIL_SQL, {'recipe_id': recipe_id}))
+        _store_detail(recipe_id, epoch, data)
         return data
-    except oracledb.Error as e:
+    except backend.Error as e:
         print(f"레시피 상세 오류: {e}")
         return None
     finally:
         if cursor: cursor.close()
         if conn: conn.close()
 
-# TOP 5 조회
-def get_top5_favorites():
+# TOP 5 조회 (메모리 랭킹, RANKING_RECOUNT_INTERVAL초마다 전체 재집계)
+RANKING_RECOUNT_INTERVAL = getattr(config, 'RANKING_RECOUNT_INTERVAL', 300)
+
+# {where}: 전체 집계는 빈 문자열, 일부 레시피만 다시 셀 때는 WHERE 조건
+_FAVORITE_COUNT_SQL = """
+    SELECT R.recipe_id, COUNT(F.user_id)
+    FROM RECIPE R
+    LEFT JOIN FAVORITE F ON R.recipe_id = F.recipe_id
+    {where}
+    GROUP BY R.recipe_id
+"""
+
+_COMMENT_COUNT_SQL = """
+    SELECT R.recipe_id, COUNT(C.comment_id)
+    FROM RECIPE R
+    LEFT JOIN COMMENT_T C ON R.recipe_id = C.recipe_id
+    {where}
+    GROUP BY R.recipe_id
+"""
+
+def _recount(sql):
+    def load_rows(recipe_ids=None):
+        """(recipe_id, count) 전체, recipe_ids를 주면 그 레시피만"""
+        conn = get_db_conn()
+        if not conn: raise RuntimeError("DB 연결 실패")
+        cursor = conn.cursor()
+        try:
+            if recipe_ids is None:
+                cursor.execute(sql.format(where=''))
+                return cursor.fetchall()
+            rows = []
+            for i in range(0, len(recipe_ids), IN_CHUNK_SIZE):
+                chunk = recipe_ids[i:i + IN_CHUNK_SIZE]
+                cursor.execute(sql.format(where=f"WHERE R.recipe_id IN ({_in_clause(len(chunk))})"), chunk)
+                rows.extend(cursor.fetchall())
+            return rows
+        finally:
+            cursor.close()
+            conn.close()
+    return load_rows
+
+def _ranking_top(ranking, count_sql):
+    """[(cnt, recipe_id), ...] 상위 5개
+
+    처음이면 전체 집계를 기다리고, 재집계 주기가 지났으면 백그라운드에서 한 번만 재집계
+    (그동안은 기존 랭킹 사용)
+    """
+    try:
+        _ensure_index(ranking, _recount(count_sql), RANKING_RECOUNT_INTERVAL)
+    except (backend.Error, RuntimeError) as e:
+        print(f"랭킹 집계 오류: {e}")
+        if not ranking.loaded: return []
+    return ranking.top()
+
+def _top5(ranking, count_sql):
+    """랭킹 상위 5개 레시피의 recipe_id, title, cnt, type_name"""
+    if not _ensure_lookups(): return []
+    top = _ranking_top(ranking, count_sql)
+    if not top: return []
+
     conn = get_db_conn()
     if not conn: return []
     cursor = conn.cursor()
     try:
-        sql = """
-            SELECT * FROM (
-                SELECT R.recipe_id, R.title, COUNT(F.user_id) as cnt, RT.type_name
-                FROM RECIPE R
-                JOIN RECIPE_TYPE RT ON R.recipe_type_id = RT.recipe_type_id
-                LEFT JOIN FAVORITE F ON R.recipe_id = F.recipe_id
-                GROUP BY R.recipe_id, R.title, RT.type_name
-                ORDER BY cnt DESC, R.recipe_id DESC
-            ) WHERE ROWNUM <= 5
-        """
-        cursor.execute(sql)
-        if cursor.description:
-            columns = [col[0].lower() for col in cursor.description]
-            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        ids = [recipe_id for _, recipe_id in top]
+        cursor.execute(f"SELECT recipe_id, title, recipe_type_id FROM RECIPE WHERE recipe_id IN ({_in_clause(len(ids))})", ids)
+        info = {row[0]: row[1:] for row in cursor.fetchall()}
+        return [{'recipe_id': recipe_id, 'title': info[recipe_id][0], 'cnt': cnt,
+                 'type_name': lookups.name_of('RECIPE_TYPE', info[recipe_id][1])}
+                for cnt, recipe_id in top if recipe_id in info]
+    except backend.Error as e:
+        print(f"랭킹 조회 오류: {e}")
         return []
     finally:
         cursor.close()
         conn.close()
 
+def get_top5_favorites():
+    return _top5(favorite_ranking, _FAVORITE_COUNT_SQL)
+
 def get_top5_comments():
+    return _top5(comment_ranking, _COMMENT_COUNT_SQL)
+
+# 메인 화면 데이터 (내 즐겨찾기/레시피/댓글 + TOP 5 두 가지)
+@dataclass
+class Dashboard:
+    favorites: list = field(default_factory=list)
+    my_recipes: list = field(default_factory=list)
+    my_comments: list = field(default_factory=list)
+    top_favorites: list = field(default_factory=list)
+    top_comments: list = field(default_factory=list)
+
+# 섹션별 결과를 UNION ALL로 묶어 한 번에 조회 (rn: 섹션 안에서의 순서)
+_DASHBOARD_SQL = """
+    SELECT 'favorites' AS section, ROW_NUMBER() OVER (ORDER BY F.created_date DESC) AS rn,
+           R.recipe_id, R.title, R.recipe_type_id, R.recipe_way_id,
+           CAST(NULL AS VARCHAR(4000)) AS content
+    FROM FAVORITE F
+    JOIN RECIPE R ON F.recipe_id = R.recipe_id
+    WHERE F.user_id = :user_id
+    UNION ALL
+    SELECT 'my_recipes', ROW_NUMBER() OVER (ORDER BY R.recipe_id DESC),
+           R.recipe_id, R.title, R.recipe_type_id, R.recipe_way_id, NULL
+    FROM RECIPE R
+    WHERE R.author_id = :user_id
+    UNION ALL
+    SELECT 'my_comments', ROW_NUMBER() OVER (ORDER BY C.created_date DESC),
+           R.recipe_id, R.title, NULL, NULL, C.content
+    FROM COMMENT_T C
+    JOIN RECIPE R ON C.recipe_id = R.recipe_id
+    WHERE C.user_id = :user_id
+"""
+
+def _dashboard_query(user_id):
+    """메인 화면 쿼리 (sql, params, 즐겨찾기 TOP 5, 댓글 TOP 5), 조회 테이블이 없으면 None"""
+    if not _ensure_lookups(): return None
+    top_favorites = _ranking_top(favorite_ranking, _FAVORITE_COUNT_SQL)
+    top_comments = _ranking_top(comment_ranking, _COMMENT_COUNT_SQL)
+
+    sql = _DASHBOARD_SQL
+    params = {'user_id': user_id}
+    top_ids = sorted({recipe_id for _, recipe_id in top_favorites + top_comments})
+    if top_ids:
+        binds = ", ".join(f":top{i}" for i in range(len(top_ids)))
+        sql += f"""
+    UNION ALL
+    SELECT 'top', 0, R.recipe_id, R.title, R.recipe_type_id, NULL, NULL
+    FROM RECIPE R
+    WHERE R.recipe_id IN ({binds})
+"""
+        params.update({f"top{i}": recipe_id for i, recipe_id in enumerate(top_ids)})
+    sql += "    ORDER BY 1, 2"
+    return sql, params, top_favorites, top_comments
+
+def _build_dashboard(rows, top_favorites, top_comments):
+    """_dashboard_query 결과 행으로 Dashboard 구성"""
+    dashboard = Dashboard()
+    top_info = {}
+    for section, _, recipe_id, title, type_id, way_id, content in rows:
+        if section == 'top':
+            top_info[recipe_id] = (title, lookups.name_of('RECIPE_TYPE', type_id))
+        elif section == 'my_comments':
+            dashboard.my_comments.append({'content': content, 'recipe_id': recipe_id, 'title': title})
+        else:
+            getattr(dashboard, section).append({
+                'recipe_id': recipe_id, 'title': title,
+                'type_name': lookups.name_of('RECIPE_TYPE', type_id),
+                'way_name': lookups.name_of('RECIPE_WAY', way_id),
+            })
+    for target, top in ((dashboard.top_favorites, top_favorites), (dashboard.top_comments, top_comments)):
+        for cnt, recipe_id in top:
+            if recipe_id in top_info:
+                title, type_name = top_info[recipe_id]
+                target.append({'recipe_id': recipe_id, 'title': title, 'cnt': cnt, 'type_name': type_name})
+    return dashboard
+
+def get_dashboard(user_id):
+    """메인 화면의 다섯 가지 목록을 커넥션 하나, 쿼리 한 번으로 조회해 Dashboard로 반환"""
+    query = _dashboard_query(user_id)
+    if query is None: return Dashboard()
+    sql, params, top_favorites, top_comments = query
+
     conn = get_db_conn()
-    if not conn: return []
+    if not conn: return Dashboard()
     cursor = conn.cursor()
     try:
-        sql = """
-            SELECT * FROM (
-                SELECT R.recipe_id, R.title, COUNT(C.comment_id) as cnt, RT.type_name
-                FROM RECIPE R
-                JOIN RECIPE_TYPE RT ON R.recipe_type_id = RT.recipe_type_id
-                LEFT JOIN COMMENT_T C ON R.recipe_id = C.recipe_id
-                GROUP BY R.recipe_id, R.title, RT.type_name
-                ORDER BY cnt DESC, R.recipe_id DESC
-            ) WHERE ROWNUM <= 5
-        """
-        cursor.execute(sql)
-        if cursor.description:
-            columns = [col[0].lower() for col in cursor.description]
-            return [dict(zip(columns, row)) for row in cursor.fetchall()]
-        return []
+        cursor.execute(sql, params)
+        return _build_dashboard(cursor.fetchall(), top_favorites, top_comments)
+    except backend.Error as e:
+        print(f"메인 화면 조회 오류: {e}")
+        return Dashboard()
     finally:
         cursor.close()
         conn.close()
 
+def _load_recipe_ingredients():
+    """재료 역색인 생성용 (recipe_id, ingredient_id) 전체 조회"""
+    conn = get_db_conn()
+    if not conn: raise RuntimeError("DB 연결 실패")
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT recipe_id, ingredient_id FROM RECIPE_INGREDIENT")
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+
+def _fetch_recipe_rows(cursor, recipe_ids):
+    """레시피 ID 목록의 검색 결과용 기본 정보 조회 (recipe_ids 순서대로)"""
+    if not _ensure_lookups(): return []
+    rows = []
+    for i in range(0, len(recipe_ids), IN_CHUNK_SIZE):
+        chunk = recipe_ids[i:i + IN_CHUNK_SIZE]
+        cursor.execute(f"""
+            SELECT R.recipe_id, R.title, U.nickname, R.recipe_way_id, R.recipe_type_id, 
+                   R.info_calories
+            FROM RECIPE R 
+            JOIN USER_T U ON R.author_id = U.user_id 
+            WHERE R.recipe_id IN ({_in_clause(len(chunk))})
+        """, chunk)
+        columns = [col[0].lower() for col in cursor.description]
+        rows.extend(dict(zip(columns, row)) for row in cursor.fetchall())
+    order = {recipe_id: i for i, recipe_id in enumerate(recipe_ids)}
+    rows.sort(key=lambda r: order[r['recipe_id']])
+    return _attach_lookup_names(rows)
 
 # 냉장고 파먹기
-def find_recipes_by_fridge(user_id):
+def find_recipes_by_fridge(user_id, after=None, before=None, limit=None):
+    """냉장고 재료만으로 만들 수 있는 레시피 (재료 역색인 사용, 최신 레시피 순)
+
+    after / before / limit 은 search_recipes와 같은 키셋 페이지네이션
+    """
+    try:
+        _ensure_index(ingredient_index, _load_recipe_ingredients)
+    except (backend.Error, RuntimeError) as e:
+        print(f"냉장고 파먹기 색인 생성 오류: {e}")
+        return []
+
     conn = get_db_conn()
     if not conn: return []
     
     cursor = conn.cursor()
     try:
-        sql = """
-            SELECT T1.recipe_id, T1.title, T1.nickname, T1.way_name, T1.type_name, 
-                   T1.info_calories
-            FROM ( 
-                SELECT R.recipe_id, R.title, U.nickname, RW.way_name, RT.type_name, 
-                       R.info_calories, COUNT(RI.ingredient_id) AS total_needed 
-                FROM RECIPE R 
-                JOIN USER_T U ON R.author_id = U.user_id 
-                JOIN RECIPE_WAY RW ON R.recipe_way_id = RW.recipe_way_id 
-                JOIN RECIPE_TYPE RT ON R.recipe_type_id = RT.recipe_type_id 
-                JOIN RECIPE_INGREDIENT RI ON R.recipe_id = RI.recipe_id 
-                GROUP BY R.recipe_id, R.title, U.nickname, RW.way_name, RT.type_name, 
-                         R.info_calories
-            ) T1 
-            JOIN ( 
-                SELECT RI.recipe_id, COUNT(UI.ingredient_id) AS total_covered 
-                FROM RECIPE_INGREDIENT RI 
-                JOIN USER_INGREDIENT UI ON RI.ingredient_id = UI.ingredient_id 
-                WHERE UI.user_id = :1 
-                GROUP BY RI.recipe_id 
-            ) T2 ON T1.recipe_id = T2.recipe_id 
-            WHERE T1.total_needed = T2.total_covered
-        """
-        cursor.execute(sql, (user_id,))
-        
-        if cursor.description:
-            columns = [col[0].lower() for col in cursor.description]
-            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        cursor.execute("SELECT ingredient_id FROM USER_INGREDIENT WHERE user_id = :1", (user_id,))
+        fridge_ids = [row[0] for row in cursor.fetchall()]
+
+        recipe_ids = ingredient_index.covered_recipes(fridge_ids)
+        if before is not None:
+            recipe_ids = recipe_ids[bisect_right(recipe_ids, before):]
+        else:
+            if after is not None:
+                recipe_ids = recipe_ids[:bisect_left(recipe_ids, after)]
+            recipe_ids.reverse()
+        if limit is not None:
+            recipe_ids = recipe_ids[:limit]
+        if not recipe_ids:
+            return []
+        return _fetch_recipe_rows(cursor, recipe_ids)
+    except backend.Error as e:
+        print(f"냉장고 파먹기 오류: {e}")
         return []
-    except oracledb.Error as e:
+    finally:
+        if cursor: cursor.close()
+        if conn: conn.close()
+
+def iter_recipes_by_fridge(user_id, batch_size=None):
+    """find_recipes_by_fridge 결과를 batch_size개씩 조회해 하나씩 yield (최신 레시피 순)"""
+    try:
+        _ensure_index(ingredient_index, _load_recipe_ingredients)
+    except (backend.Error, RuntimeError) as e:
+        print(f"냉장고 파먹기 색인 생성 오류: {e}")
+        return
+
+    conn = get_db_conn()
+    if not conn: return
+
+    batch_size = batch_size or SEARCH_FETCH_ARRAYSIZE
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT ingredient_id FROM USER_INGREDIENT WHERE user_id = :1", (user_id,))
+        fridge_ids = [row[0] for row in cursor.fetchall()]
+
+        recipe_ids = ingredient_index.covered_recipes(fridge_ids)
+        recipe_ids.reverse()
+        for i in range(0, len(recipe_ids), batch_size):
+            yield from _fetch_recipe_rows(cursor, recipe_ids[i:i + batch_size])
+    except backend.Error as e:
+        print(f"냉장고 파먹기 오류: {e}")
+    finally:
+        cursor.close()
+        conn.close()
+
+# 검색 결과 한 페이지 (next_cursor: 다음 페이지 after 값, prev_cursor: 이전 페이지 before 값)
+SEARCH_PAGE_SIZE = getattr(config, 'SEARCH_PAGE_SIZE', 20)
+
+@dataclass
+class Page:
+    items: list = field(default_factory=list)
+    next_cursor: int = None
+    prev_cursor: int = None
+
+def _make_page(fetch, page_size=None, after=None, before=None):
+    """fetch(after=, before=, limit=)로 page_size + 1개를 읽어 Page 구성"""
+    page_size = page_size or SEARCH_PAGE_SIZE
+    rows = fetch(after=after, before=before, limit=page_size + 1)
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    page = Page(items=rows)
+    if before is not None:
+        # 오름차순으로 읽었으므로 뒤집고, 남은 행이 있으면 더 최신 페이지가 있음
+        rows.reverse()
+        if rows:
+            page.next_cursor = rows[-1]['recipe_id']
+            page.prev_cursor = rows[0]['recipe_id'] if has_more else None
+    elif rows:
+        page.next_cursor = rows[-1]['recipe_id'] if has_more else None
+        page.prev_cursor = rows[0]['recipe_id'] if after is not None else None
+    return page
+
+def search_recipes_page(page_size=None, after=None, before=None, **filters):
+    """search_recipes 결과 한 페이지"""
+    return _make_page(lambda **keys: search_recipes(**filters, **keys), page_size, after, before)
+
+def find_recipes_by_fridge_page(user_id, page_size=None, after=None, before=None):
+    """find_recipes_by_fridge 결과 한 페이지"""
+    return _make_page(lambda **keys: find_recipes_by_fridge(user_id, **keys), page_size, after, before)
+
+# 냉장고 파먹기 (재료가 조금 부족한 레시피까지 순위로)
+def find_recipes_by_fridge_ranked(user_id, max_missing, limit=20):
+    """부족한 재료가 max_missing개 이하인 레시피 상위 limit개
+
+    충족 비율이 높은 순, 부족한 재료가 적은 순으로 정렬하며
+    각 레시피에 covered, needed, missing_ingredients(부족한 재료 이름)를 붙여 반환
+    """
+    try:
+        _ensure_index(ingredient_index, _load_recipe_ingredients)
+    except (backend.Error, RuntimeError) as e:
+        print(f"냉장고 파먹기 색인 생성 오류: {e}")
+        return []
+
+    conn = get_db_conn()
+    if not conn: return []
+    
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT ingredient_id FROM USER_INGREDIENT WHERE user_id = :1", (user_id,))
+        fridge_ids = [row[0] for row in cursor.fetchall()]
+
+        matches = ingredient_index.ranked_matches(fridge_ids, max_missing, limit)
+        if not matches:
+            return []
+
+        # 부족한 재료 이름 조회
+        missing_ids = sorted({i for m in matches for i in m[3]})
+        names = {}
+        if missing_ids:
+            cursor.execute(f"SELECT ingredient_id, name FROM INGREDIENT WHERE ingredient_id IN ({_in_clause(len(missing_ids))})",
+                           missing_ids)
+            names = dict(cursor.fetchall())
+
+        rows = {r['recipe_id']: r for r in _fetch_recipe_rows(cursor, [m[0] for m in matches])}
+        results = []
+        for recipe_id, covered, needed, missing in matches:
+            row = rows.get(recipe_id)
+            if not row: continue
+            row['covered'] = covered
+            row['needed'] = needed
+            row['missing_ingredients'] = sorted(names.get(i, '') for i in missing)
+            results.append(row)
+        return results
+    except backend.Error as e:
         print(f"냉장고 파먹기 오류: {e}")
         return []
     finally:
@@ -832,6 +1797,12 @@ def find_recipes_by_fridge(user_id):
 
 # 댓글 작성
 def add_comment(user_id, recipe_id, content):
+    # comment_id는 블록에서 꺼냄 (MAX(comment_id) + 1은 매번 테이블을 집계하고 동시 작성 시 충돌)
+    try:
+        comment_id = next_id('COMMENT_T')
+    except backend.Error as e:
+        print(f"댓글 등록 실패: {e}")
+        return False
     conn = get_db_conn()
     if not conn: return False
     
@@ -839,13 +1810,12 @@ def add_comment(user_id, recipe_id, content):
     try:
         sql = """
             INSERT INTO COMMENT_T (comment_id, user_id, recipe_id, content) 
-            VALUES (
-                (SELECT NVL(MAX(comment_id), 0) + 1 FROM COMMENT_T), 
-                :1, :2, :3
-            )
+            VALUES (:1, :2, :3, :4)
         """
-        cursor.execute(sql, (user_id, recipe_id, content))
+        cursor.execute(sql, (comment_id, user_id, recipe_id, content))
         conn.commit()
+        comment_ranking.adjust(recipe_id, 1)
+        _invalidate_details(recipe_id)
         return True
     except Exception as e:
         print(f"댓글 등록 실패: {e}")
@@ -864,9 +1834,14 @@ def delete_comment(comment_id, user_id):
     cursor = conn.cursor()
     try:
         # 본인 댓글인지 확인(user_id 조건) 후 삭제
+        cursor.execute("SELECT recipe_id FROM COMMENT_T WHERE comment_id = :1 AND user_id = :2", (comment_id, user_id))
+        row = cursor.fetchone()
         sql = "DELETE FROM COMMENT_T WHERE comment_id = :1 AND user_id = :2"
         cursor.execute(sql, (comment_id, user_id))
         conn.commit()
+        if row:
+            comment_ranking.adjust(row[0], -1)
+            _invalidate_details(row[0])
         return True
     except Exception as e:
         print(f"댓글 삭제 실패: {e}")
@@ -894,8 +1869,9 @@ def toggle_favorite(recipe_id, user_id):
             cursor.execute("INSERT INTO FAVORITE (recipe_id, user_id) VALUES (:1, :2)", (recipe_id, user_id))
             action = "added"
         conn.commit()
+        favorite_ranking.adjust(recipe_id, 1 if action == "added" else -1)
         return action
-    except oracledb.Error as e:
+    except backend.Error as e:
         print(f"즐겨찾기 추가/삭제 실패: {e}")
         return False
     finally:
@@ -913,3 +1889,6 @@ def is_favorited(recipe_id, user_id):
     finally:
         cursor.close()
         conn.close()
+
+if METRICS_ENABLED:
+    metrics.instrument_functions(globals(), exclude=('get_db_conn', 'get_pool_stats', 'get_cache_stats'))
@@ -0,0 +1,170 @@
+"""database.py의 비동기 버전 (async 뷰용)
+
+- Oracle: oracledb 비동기(thin 모드) 커넥션 풀로 메인 화면, 레시피 상세,
+  즐겨찾기 여부를 조회한다. 비동기 풀은 만들어진 이벤트 루프에 묶이는데
+  Flask의 async 뷰는 요청마다 새 루프에서 실행되므로, 풀은 전용 스레드의
+  이벤트 루프 하나에 두고 요청 루프는 결과만 기다린다.
+- WSGI 서버에서는 async 뷰도 요청마다 워커 스레드 하나가 응답까지 붙어 있으므로,
+  겹쳐 실행되는 것은 한 요청 안의 독립적인 DB 호출(fan_out)뿐이다. 워커 하나가
+  여러 요청의 DB 호출을 동시에 진행하지는 않는다 (동시 요청 수 = 워커 스레드 수).
+- 그 밖의 함수와 비동기 드라이버가 없는 backend(SQLite)는 크기가 제한된
+  스레드 풀에서 database.py 함수를 그대로 실행한다.
+
+database.py의 공개 함수는 모두 같은 이름의 코루틴으로 쓸 수 있다.
+
+    import database_async as adb
+    dashboard = await adb.get_dashboard(user_id)
+"""
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+import database as db
+from storage import backend
+from monitoring.metrics import metrics
+
+# 동기 함수를 실행할 스레드 수 (DB 커넥션 풀 크기보다 크게 잡을 필요는 없음)
+ASYNC_DB_THREADS = getattr(config, 'ASYNC_DB_THREADS', 16)
+
+_executor = ThreadPoolExecutor(max_workers=ASYNC_DB_THREADS, thread_name_prefix='db-async')
+
+# fan_out 호출당 제한 시간 (초)
+FAN_OUT_TIMEOUT = getattr(config, 'FAN_OUT_TIMEOUT', 5.0)
+
+# backend가 비동기 드라이버를 제공하고 지금 쓸 수 있으면 직접 비동기로 조회
+native = hasattr(backend, 'acquire_async') and backend.async_supported()
+
+_loop = None
+_loop_lock = threading.Lock()
+
+async def run_sync(fn, *args, **kwargs):
+    """동기 함수를 스레드 풀에서 실행하고 결과를 기다림"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(fn, *args, **kwargs))
+
+def __getattr__(name):
+    # 비동기 구현이 따로 없는 database.py 공개 함수는 스레드 풀에서 실행
+    fn = getattr(db, name, None)
+    if name.startswith('_') or not callable(fn) or isinstance(fn, type):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    @functools.wraps(fn)
+    async def call(*args, **kwargs):
+        return await run_sync(fn, *args, **kwargs)
+    return call
+
+class _FanOutFailed:
+    """fan_out에서 시간 초과 / 예외로 결과를 얻지 못한 호출 (None을 반환한 호출과 구분)"""
+    def __bool__(self):
+        return False
+
+    def __repr__(self):
+        return 'FAN_OUT_FAILED'
+
+FAN_OUT_FAILED = _FanOutFailed()
+
+async def fan_out(*aws, timeout=None):
+    """서로 독립적인 조회 코루틴들을 동시에 실행해 결과 목록 반환 (호출 순서대로)
+
+    호출마다 timeout초(기본 FAN_OUT_TIMEOUT)까지 기다리며, 시간 초과나 예외가 난
+    호출의 결과는 FAN_OUT_FAILED (거짓으로 평가되므로 "없음"과 구분하려면 is로 비교).
+    시간 초과 시 전용 루프의 비동기 조회는 취소되지만, 스레드 풀에서 실행 중인
+    동기 함수는 멈출 수 없어 끝날 때까지 스레드와 커넥션을 계속 쓴다
+    (Oracle은 ORACLE_CALL_TIMEOUT으로 DB 왕복 하나의 시간을 제한할 수 있음).
+    """
+    timeout = FAN_OUT_TIMEOUT if timeout is None else timeout
+
+    async def guarded(aw):
+        name = getattr(aw, '__qualname__', aw)
+        try:
+            return await asyncio.wait_for(aw, timeout)
+        except asyncio.TimeoutError:
+            print(f"동시 조회 시간 초과: {name}")
+        except Exception as e:
+            print(f"동시 조회 실패 ({name}): {e}")
+        return FAN_OUT_FAILED
+
+    return await asyncio.gather(*(guarded(aw) for aw in aws))
+
+def _native_loop():
+    """비동기 커넥션 풀을 소유하는 전용 이벤트 루프 (처음 사용할 때 시작)"""
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='db-async-loop', daemon=True).start()
+                _loop = loop
+    return _loop
+
+async def _on_native_loop(coro):
+    """코루틴을 전용 루프에서 실행하고 현재 루프에서 결과를 기다림"""
+    future = asyncio.run_coroutine_threadsafe(coro, _native_loop())
+    return await asyncio.wrap_future(future)
+
+# call: 요청 루프에서 얻은 metrics.current_call() (전용 루프에는 계측 문맥이 없으므로 전달)
+async def _fetchall(sql, params, call):
+    async with backend.acquire_async() as conn:
+        cursor = metrics.wrap_async_connection(conn, call).cursor()
+        try:
+            await cursor.execute(sql, params)
+            return await cursor.fetchall()
+        finally:
+            cursor.close()
+
+async def _fetch_result_sets(statements, params, call):
+    async with backend.acquire_async() as conn:
+        cursor = metrics.wrap_async_connection(conn, call).cursor()
+        try:
+            return await backend.fetch_result_sets_async(cursor, statements, params)
+        finally:
+            cursor.close()
+
+async def get_dashboard(user_id):
+    """database.get_dashboard의 비동기 버전"""
+    if not native:
+        return await run_sync(db.get_dashboard, user_id)
+    # TOP 5 후보는 메모리 랭킹이지만 재집계 / 조회 테이블 로드 때 동기 DB 조회를
+    # 하므로 스레드 풀에서 계산 (요청 루프를 막지 않도록)
+    query = await run_sync(db._dashboard_query, user_id)
+    if query is None: return db.Dashboard()
+    sql, params, top_favorites, top_comments = query
+    try:
+        rows = await _on_native_loop(_fetchall(sql, params, metrics.current_call()))
+    except backend.Error as e:
+        print(f"메인 화면 조회 오류: {e}")
+        return db.Dashboard()
+    return db._build_dashboard(rows, top_favorites, top_comments)
+
+async def get_recipe_detail(recipe_id):
+    """database.get_recipe_detail의 비동기 버전 (같은 상세 캐시 사용)"""
+    data = db.detail_cache.get(recipe_id)
+    if data is not None:
+        return data
+    if not native:
+        return await run_sync(db.get_recipe_detail, recipe_id)
+
+    epoch = db._detail_epoch
+    try:
+        results = await _on_native_loop(_fetch_result_sets(db._DETAIL_SQL, {'recipe_id': recipe_id},
+                                                             metrics.current_call()))
+    except backend.Error as e:
+        print(f"레시피 상세 오류: {e}")
+        return None
+    data = db._build_detail(results)
+    db._store_detail(recipe_id, epoch, data)
+    return data
+
+async def is_favorited(recipe_id, user_id):
+    """database.is_favorited의 비동기 버전"""
+    if not native:
+        return await run_sync(db.is_favorited, recipe_id, user_id)
+    rows = await _on_native_loop(_fetchall(
+        "SELECT 1 FROM FAVORITE WHERE recipe_id = :1 AND user_id = :2", (recipe_id, user_id),
+        metrics.current_call()))
+    return bool(rows)
+
+if db.METRICS_ENABLED:
+    metrics.instrument_functions(globals(), exclude=('run_sync', 'fan_out'))
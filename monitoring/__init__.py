@@ -0,0 +1,4 @@
+"""운영 모니터링 (Prometheus 지표 등)
+
+database.py와 app.py가 가져다 쓰며, 지표는 프로세스별로 메모리에 쌓인다.
+"""
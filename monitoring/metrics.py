@@ -0,0 +1,454 @@
+"""DB 함수 / Flask 라우트 지표 (Prometheus 텍스트 형식)
+
+- instrument_functions(): 모듈의 공개 함수를 감싸 호출 수, 지연 히스토그램,
+  DB 왕복 수(execute/executemany/commit), 읽은 행 수, DB 오류 수를 기록
+- wrap_connection(): 계측 중인 함수 안에서 연 커넥션의 커서를 감싸 왕복/행 수를 셈
+- wrap_async_connection(): 비동기 커넥션(oracledb 비동기 풀)용 wrap_connection
+- add_statement_hook(): 문장마다 SQL / 바인드 값 / 걸린 시간 / 행 수를 받을 함수 등록
+  (monitoring.slow_query)
+- init_app(): Flask 라우트(URL 규칙)별 지연 히스토그램과 상태 코드별 요청 수
+- render(): /metrics 응답 본문
+
+왕복/행 수는 그 커넥션을 연 가장 안쪽의 계측 함수에 더한다. 호출마다 스레드
+로컬 카운터에 모았다가 끝날 때 락 한 번으로 합치므로 호출당 비용은 몇 µs 이내.
+"""
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+
+# 히스토그램 구간 상한 (초)
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_local = threading.local()
+# 계측 중인 코루틴의 호출 기록 (이벤트 루프에서는 스레드 로컬 대신 사용)
+_async_call = contextvars.ContextVar('metrics_async_call', default=None)
+
+# 문장이 끝날 때마다 호출할 함수들
+# hook(cursor, sql, params, elapsed, rows, many, function)
+# (cursor는 동기 DB API 커서, 비동기 커서에서 실행된 문장이면 None)
+_statement_hooks = []
+
+class _Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)   # 마지막 칸은 +Inf
+        self.sum = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, seconds):
+        i = bisect_left(BUCKETS, seconds)
+        with self.lock:
+            self.counts[i] += 1
+            self.sum += seconds
+
+    def snapshot(self):
+        with self.lock:
+            return list(self.counts), self.sum
+
+class _FunctionStats(_Histogram):
+    def __init__(self):
+        super().__init__()
+        self.round_trips = 0
+        self.rows = 0
+        self.errors = 0
+
+    def record(self, seconds, call):
+        i = bisect_left(BUCKETS, seconds)
+        with self.lock:
+            self.counts[i] += 1
+            self.sum += seconds
+            self.round_trips += call[0]
+            self.rows += call[1]
+            self.errors += call[2]
+
+    def totals(self):
+        with self.lock:
+            return self.round_trips, self.rows, self.errors
+
+class _MeteredCursor:
+    """execute/executemany 수, 읽은 행 수, DB 예외 수를 호출 기록(call)에 더하는 커서
+
+    문장 관찰자(add_statement_hook)가 있으면 문장마다 실행 + 읽기 시간과 행 수를
+    모았다가 다음 실행이나 close() 때 관찰자에게 넘긴다.
+    """
+    __slots__ = ('_cursor', '_call', '_stmt')
+    _sync = True
+
+    def __init__(self, cursor, call, stmt=None):
+        object.__setattr__(self, '_cursor', cursor)
+        object.__setattr__(self, '_call', call)
+        # [실행 인자, 걸린 시간(초), 읽은 행 수, executemany 여부, 보고 여부]
+        object.__setattr__(self, '_stmt', stmt)
+
+    def execute(self, *args, **kwargs):
+        return self._run(self._cursor.execute, args, kwargs, False)
+
+    def executemany(self, *args, **kwargs):
+        return self._run(self._cursor.executemany, args, kwargs, True)
+
+    def _run(self, method, args, kwargs, many):
+        self._call[0] += 1
+        if not _statement_hooks:
+            try:
+                result = method(*args, **kwargs)
+            except Exception:
+                self._call[2] += 1
+                raise
+            return self if result is self._cursor else result
+
+        self._finish()
+        start = time.perf_counter()
+        try:
+            result = method(*args, **kwargs)
+        except Exception:
+            self._call[2] += 1
+            raise
+        object.__setattr__(self, '_stmt', [args, time.perf_counter() - start, 0, many, False])
+        return self if result is self._cursor else result
+
+    def _fetched(self, start, count):
+        self._call[1] += count
+        stmt = self._stmt
+        if stmt is not None:
+            stmt[1] += time.perf_counter() - start
+            stmt[2] += count
+
+    def _finish(self):
+        stmt = self._stmt
+        if stmt is None or stmt[4]:
+            return
+        stmt[4] = True
+        args, elapsed, rows, many = stmt[:4]
+        sql, params = args[0], args[1] if len(args) > 1 else None
+        rowcount = getattr(self._cursor, 'rowcount', -1) or 0
+        cursor = self._cursor if self._sync else None
+        for hook in _statement_hooks:
+            hook(cursor, sql, params, elapsed, max(rows, rowcount), many, self._call[3])
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._fetched(start, 0 if row is None else 1)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        start = time.perf_counter()
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self._fetched(start, len(rows))
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._fetched(start, len(rows))
+        return rows
+
+    def getimplicitresults(self):
+        # Oracle fetch_result_sets의 결과 커서들도 읽은 행 수를 셈 (같은 문장으로 기록)
+        return [_MeteredCursor(c, self._call, self._stmt) for c in self._cursor.getimplicitresults()]
+
+    def close(self):
+        self._finish()
+        return self._cursor.close()
+
+    def __iter__(self):
+        while True:
+            start = time.perf_counter()
+            row = self._cursor.fetchone()
+            if row is None:
+                return
+            self._fetched(start, 1)
+            yield row
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._cursor, name, value)
+
+class _MeteredAsyncCursor(_MeteredCursor):
+    """_MeteredCursor의 비동기 커서 버전 (execute / fetch가 코루틴)"""
+    __slots__ = ()
+    _sync = False
+
+    async def execute(self, *args, **kwargs):
+        return await self._run_async(self._cursor.execute, args, kwargs, False)
+
+    async def executemany(self, *args, **kwargs):
+        return await self._run_async(self._cursor.executemany, args, kwargs, True)
+
+    async def _run_async(self, method, args, kwargs, many):
+        self._call[0] += 1
+        if _statement_hooks:
+            self._finish()
+        start = time.perf_counter()
+        try:
+            result = await method(*args, **kwargs)
+        except Exception:
+            self._call[2] += 1
+            raise
+        if _statement_hooks:
+            object.__setattr__(self, '_stmt', [args, time.perf_counter() - start, 0, many, False])
+        return self if result is self._cursor else result
+
+    async def fetchone(self):
+        start = time.perf_counter()
+        row = await self._cursor.fetchone()
+        self._fetched(start, 0 if row is None else 1)
+        return row
+
+    async def fetchmany(self, *args, **kwargs):
+        start = time.perf_counter()
+        rows = await self._cursor.fetchmany(*args, **kwargs)
+        self._fetched(start, len(rows))
+        return rows
+
+    async def fetchall(self):
+        start = time.perf_counter()
+        rows = await self._cursor.fetchall()
+        self._fetched(start, len(rows))
+        return rows
+
+    def getimplicitresults(self):
+        return [_MeteredAsyncCursor(c, self._call, self._stmt) for c in self._cursor.getimplicitresults()]
+
+    __iter__ = None
+
+class _MeteredConnection:
+    __slots__ = ('_conn', '_call')
+
+    def __init__(self, conn, call):
+        self._conn = conn
+        self._call = call
+
+    def cursor(self, *args, **kwargs):
+        return _MeteredCursor(self._conn.cursor(*args, **kwargs), self._call)
+
+    def commit(self):
+        self._call[0] += 1
+        return self._conn.commit()
+
+    def close(self):
+        return self._conn.close()
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+class _MeteredAsyncConnection(_MeteredConnection):
+    __slots__ = ()
+
+    def cursor(self, *args, **kwargs):
+        return _MeteredAsyncCursor(self._conn.cursor(*args, **kwargs), self._call)
+
+    async def commit(self):
+        self._call[0] += 1
+        return await self._conn.commit()
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._functions = {}    # (module, function) -> _FunctionStats
+        self._routes = {}       # (route, method) -> _Histogram
+        self._requests = {}     # (route, method, status) -> count
+
+    def _function_stats(self, module, name):
+        with self._lock:
+            return self._functions.setdefault((module, name), _FunctionStats())
+
+    # ---- DB 함수 ----
+
+    def instrument_functions(self, namespace, exclude=()):
+        """namespace(모듈 globals())에서 그 모듈에 정의된 공개 함수를 계측 함수로 교체"""
+        module = namespace['__name__']
+        for name, fn in list(namespace.items()):
+            if (name.startswith('_') or name in exclude or not inspect.isfunction(fn)
+                    or fn.__module__ != module or hasattr(fn, '__wrapped__')):
+                continue
+            namespace[name] = self._wrap(fn, self._function_stats(module, name))
+
+    def _wrap(self, fn, stats):
+        if inspect.isgeneratorfunction(fn):
+            @functools.wraps(fn)
+            def generator(*args, **kwargs):
+                # 생성기는 끝나거나 닫힐 때까지를 한 호출로 잼 (읽는 동안의 왕복/행 포함)
+                call = [0, 0, 0, fn.__name__]
+                start = time.perf_counter()
+                gen = fn(*args, **kwargs)
+                try:
+                    while True:
+                        outer = getattr(_local, 'call', None)
+                        _local.call = call
+                        try:
+                            item = next(gen)
+                        except StopIteration:
+                            return
+                        finally:
+                            _local.call = outer
+                        yield item
+                finally:
+                    gen.close()
+                    stats.record(time.perf_counter() - start, call)
+            return generator
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def coroutine(*args, **kwargs):
+                # 이벤트 루프에서 번갈아 실행되므로 호출 기록은 contextvar로 전달
+                # (스레드 풀에서 실행한 동기 함수의 왕복/행 수는 그 함수에 기록됨)
+                call = [0, 0, 0, fn.__name__]
+                token = _async_call.set(call)
+                start = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    stats.record(time.perf_counter() - start, call)
+                    _async_call.reset(token)
+            return coroutine
+
+        @functools.wraps(fn)
+        def function(*args, **kwargs):
+            call = [0, 0, 0, fn.__name__]
+            outer = getattr(_local, 'call', None)
+            _local.call = call
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                stats.record(time.perf_counter() - start, call)
+                _local.call = outer
+        return function
+
+    def wrap_connection(self, conn):
+        """계측 중인 함수 안이거나 문장 관찰자가 있으면 왕복/행 수를 세는 커넥션으로 감싸서 반환"""
+        call = getattr(_local, 'call', None)
+        if call is None:
+            if not _statement_hooks:
+                return conn
+            call = [0, 0, 0, None]
+        if conn is None:
+            return conn
+        return _MeteredConnection(conn, call)
+
+    def current_call(self):
+        """지금 실행 중인 가장 안쪽 계측 함수의 호출 기록 (없으면 None)
+
+        다른 스레드의 이벤트 루프에서 쿼리를 실행할 때 미리 얻어 wrap_async_connection에 넘긴다.
+        """
+        return _async_call.get() or getattr(_local, 'call', None)
+
+    def wrap_async_connection(self, conn, call):
+        """비동기 커넥션을 call(current_call()의 값)에 왕복/행 수를 세는 커넥션으로 감싸서 반환"""
+        if call is None:
+            if not _statement_hooks:
+                return conn
+            call = [0, 0, 0, None]
+        return _MeteredAsyncConnection(conn, call)
+
+    def add_statement_hook(self, hook):
+        """문장마다 hook(cursor, sql, params, elapsed, rows, many, function) 호출
+
+        elapsed는 실행과 결과 읽기에 걸린 시간(초), function은 문장을 실행한
+        가장 안쪽 계측 함수 이름 (없으면 None), cursor는 비동기 커서면 None
+        """
+        _statement_hooks.append(hook)
+
+    # ---- Flask 라우트 ----
+
+    def init_app(self, app):
+        """요청마다 URL 규칙(예: /recipe/<int:recipe_id>) 단위로 지연 / 상태 코드 기록"""
+        from flask import g, request
+
+        def route_key():
+            rule = request.url_rule.rule if request.url_rule else '(unmatched)'
+            return rule, request.method
+
+        @app.before_request
+        def start_timer():
+            g.metrics_start = time.perf_counter()
+
+        @app.after_request
+        def record_response(response):
+            start = g.pop('metrics_start', None)
+            if start is not None:
+                self.observe_request(*route_key(), response.status_code, time.perf_counter() - start)
+            return response
+
+        @app.teardown_request
+        def record_error(exc):
+            # 처리되지 않은 예외로 after_request를 건너뛴 요청
+            start = g.pop('metrics_start', None)
+            if start is not None:
+                self.observe_request(*route_key(), 500, time.perf_counter() - start)
+
+    def observe_request(self, route, method, status, seconds):
+        with self._lock:
+            hist = self._routes.get((route, method))
+            if hist is None:
+                hist = self._routes[(route, method)] = _Histogram()
+            key = (route, method, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+        hist.observe(seconds)
+
+    # ---- 출력 ----
+
+    def render(self, gauges=None):
+        """Prometheus 텍스트 형식 (gauges: {지표 이름: {레이블 dict 튜플 또는 (): 값}})"""
+        with self._lock:
+            functions = sorted(self._functions.items())
+            routes = sorted(self._routes.items())
+            requests = sorted(self._requests.items())
+
+        lines = []
+        _histogram(lines, 'app_db_call_duration_seconds', 'database 함수 실행 시간',
+                   [({'module': m, 'function': f}, s.snapshot()) for (m, f), s in functions])
+        totals = [({'module': m, 'function': f}, s.totals()) for (m, f), s in functions]
+        for i, (name, help_text) in enumerate([
+                ('app_db_round_trips_total', 'database 함수가 보낸 DB 왕복 수 (execute / executemany / commit)'),
+                ('app_db_rows_fetched_total', 'database 함수가 읽은 행 수'),
+                ('app_db_errors_total', 'database 함수 실행 중 발생한 DB 예외 수')]):
+            _header(lines, name, help_text, 'counter')
+            for labels, values in totals:
+                lines.append(f"{name}{_labels(labels)} {values[i]}")
+
+        _histogram(lines, 'app_http_request_duration_seconds', 'Flask 라우트 처리 시간',
+                   [({'route': r, 'method': m}, h.snapshot()) for (r, m), h in routes])
+        _header(lines, 'app_http_requests_total', 'Flask 라우트 / 상태 코드별 요청 수', 'counter')
+        for (route, method, status), count in requests:
+            lines.append(f"app_http_requests_total{_labels({'route': route, 'method': method, 'status': status})} {count}")
+
+        for name, samples in (gauges or {}).items():
+            _header(lines, name, None, 'gauge')
+            for labels, value in samples.items():
+                if not isinstance(value, (int, float)):
+                    continue
+                lines.append(f"{name}{_labels(dict(labels))} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+def _header(lines, name, help_text, kind):
+    if help_text:
+        lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+def _histogram(lines, name, help_text, series):
+    _header(lines, name, help_text, 'histogram')
+    for labels, (counts, total) in series:
+        cumulative = 0
+        for bound, count in zip((*BUCKETS, '+Inf'), counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{_labels({**labels, 'le': bound})} {cumulative}")
+        lines.append(f"{name}_sum{_labels(labels)} {total}")
+        lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+
+def _labels(labels):
+    if not labels:
+        return ""
+    def escape(value):
+        return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+    return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in labels.items()) + "}"
+
+def _number(value):
+    return int(value) if isinstance(value, bool) else value
+
+metrics = Metrics()
@@ -0,0 +1,97 @@
+"""느린 쿼리 로그 (JSON lines, 파일 크기 기준 회전)
+
+metrics.add_statement_hook()으로 등록하면 실행 + 결과 읽기에 threshold_ms 이상
+걸린 문장마다 한 줄을 남긴다.
+
+    {"time": "...", "elapsed_ms": 812.4, "rows": 20, "function": "search_recipes",
+     "backend": "oracle", "sql": "SELECT ...", "binds": [...], "plan": [...]}
+
+redact_binds면 문자열 바인드 값은 길이만 남기고 가린다 (비밀번호, 아이디 등).
+숫자(레시피 ID, 영양 정보 범위 등)는 어떤 조건 조합이 느렸는지 알 수 있도록 그대로 둔다.
+"""
+import json
+import logging
+import logging.handlers
+import re
+import sys
+from datetime import datetime
+
+# IN 목록처럼 긴 바인드 목록은 앞부분만 기록
+MAX_LOGGED_BINDS = 50
+
+class SlowQueryLog:
+    def __init__(self, path, threshold_ms, redact_binds=True, explain=None,
+                 max_bytes=10 * 1024 * 1024, backup_count=5, backend_name=None):
+        self.threshold = threshold_ms / 1000
+        self.redact_binds = redact_binds
+        self.explain = explain            # explain(cursor, sql, params) -> [str, ...] 또는 None
+        self.backend_name = backend_name
+        self.logged = 0
+
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes,
+                                                       backupCount=backup_count, encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        self._logger = logging.getLogger(f"{__name__}.{path}")
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
+        self._logger.addHandler(handler)
+
+    def observe(self, cursor, sql, params, elapsed, rows, many, function):
+        """metrics 문장 관찰자 (threshold 미만이면 바로 반환)"""
+        if elapsed < self.threshold:
+            return
+        entry = {
+            'time': datetime.now().astimezone().isoformat(timespec='milliseconds'),
+            'elapsed_ms': round(elapsed * 1000, 3),
+            'rows': rows,
+            'function': function or _caller(),
+            'backend': self.backend_name,
+            'sql': _compact(sql),
+        }
+        if many:
+            params = list(params or ())
+            entry['batch_size'] = len(params)
+            entry['binds'] = self._binds(params[0]) if params else None
+        else:
+            entry['binds'] = self._binds(params)
+        # 비동기 커서(cursor=None)에서 실행된 문장은 실행 계획을 동기로 조회할 수 없음
+        if self.explain is not None and cursor is not None and _explainable(sql):
+            try:
+                entry['plan'] = self.explain(cursor, sql, None if many else params)
+            except Exception as e:
+                entry['plan_error'] = str(e)
+        self._logger.info(json.dumps(entry, ensure_ascii=False, default=str))
+        self.logged += 1
+
+    def _binds(self, params):
+        if params is None:
+            return None
+        if isinstance(params, dict):
+            return {name: self._bind(value) for name, value in params.items()}
+        values = [self._bind(value) for value in list(params)[:MAX_LOGGED_BINDS]]
+        if len(params) > MAX_LOGGED_BINDS:
+            values.append(f"... ({len(params)}개)")
+        return values
+
+    def _bind(self, value):
+        if self.redact_binds and isinstance(value, str):
+            return f"<str:{len(value)}>"
+        if isinstance(value, (str, int, float, bool)) or value is None:
+            return value
+        return repr(value)
+
+def _compact(sql):
+    return re.sub(r'\s+', ' ', sql).strip()
+
+def _explainable(sql):
+    return re.match(r'\s*(SELECT|WITH)\b', sql, re.IGNORECASE) is not None
+
+def _caller():
+    """계측 함수 밖에서 실행된 문장: database 모듈의 가장 가까운 호출 함수"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        if module in ('database', 'database_async'):
+            return f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
@@ -0,0 +1,41 @@
+"""DB 저장소(backend) 선택
+
+config.DB_BACKEND 값에 따라 Oracle 또는 내장 SQLite 구현을 사용한다.
+각 backend 모듈은 아래 이름을 제공한다.
+
+- NAME: backend 이름
+- Error: DB 예외 클래스
+- connect(): DB 연결 객체 반환 (close() 시 반환/정리)
+- insert_returning_id(cursor, sql, params, id_col): INSERT 후 생성된 ID 반환
+- insert_ignore_duplicates(cursor, sql, rows): UNIQUE 위반 행은 건너뛰는 executemany
+- allocate_id_block(cursor, table, id_col, size): table의 새 ID 블록
+  [start, start + size) 시작값 (시퀀스 / ID_BLOCK 테이블, 호출한 쪽이 커밋)
+- limit_rows(sql, n): 결과를 n행으로 제한한 SQL 반환
+- fetch_result_sets(cursor, statements, params): 여러 SELECT를 한 번에 실행해
+  [(컬럼 이름 목록, 행 목록), ...] 반환 (이름 바인드 변수 사용)
+- explain_plan(cursor, sql, params): 실행 계획 설명 줄 목록 (느린 쿼리 로그용)
+- get_pool_stats(): 연결 통계
+
+비동기 드라이버가 있는 backend는 아래 이름도 제공한다 (없으면 database_async가
+스레드 풀에서 동기 함수를 실행한다).
+
+- async_supported(): 지금 드라이버 모드에서 비동기 커넥션을 쓸 수 있는지
+- acquire_async(): async with 로 쓰는 비동기 커넥션
+- fetch_result_sets_async(cursor, statements, params): fetch_result_sets의 비동기 버전
+"""
+import importlib
+
+import config
+
+BACKENDS = {
+    'oracle': 'storage.oracle',
+    'sqlite': 'storage.sqlite',
+}
+
+def load_backend(name=None):
+    name = name or getattr(config, 'DB_BACKEND', 'oracle')
+    if name not in BACKENDS:
+        raise ValueError(f"지원하지 않는 DB_BACKEND: {name}")
+    return importlib.import_module(BACKENDS[name])
+
+backend = load_backend()
@@ -0,0 +1,28 @@
+-- 블록 단위 ID 할당용 Oracle 시퀀스 (storage.oracle.allocate_id_block)
+--
+-- NEXTVAL 한 번이 ID 블록 하나이므로 INCREMENT BY는 config.ID_BLOCK_SIZE와 같아야 한다.
+-- 아래 ID_BLOCK_SIZE를 config.py 값으로 바꿔 실행할 것 (다르면 워커끼리 ID가 겹치므로
+-- storage.oracle.allocate_id_block이 시퀀스의 INCREMENT BY를 확인하고 블록 할당을 거부한다).
+-- ID_BLOCK_SIZE를 바꾸면 시퀀스를 지우고 이 스크립트를 다시 실행한다.
+-- 기존 행과 겹치지 않도록 현재 최대 ID 다음 값에서 시작한다.
+-- RECIPE / INGREDIENT에 블록 ID를 쓰려면(ID_BLOCK_INSERTS = True) ID 컬럼이
+-- 값을 직접 넣을 수 있어야 한다 (GENERATED ALWAYS 식별 컬럼이면 BY DEFAULT로 변경).
+
+DEFINE ID_BLOCK_SIZE = 50
+
+DECLARE
+    block_size CONSTANT PLS_INTEGER := &ID_BLOCK_SIZE;
+
+    PROCEDURE create_block_seq(p_table VARCHAR2, p_id_col VARCHAR2) IS
+        v_start NUMBER;
+    BEGIN
+        EXECUTE IMMEDIATE 'SELECT NVL(MAX(' || p_id_col || '), 0) + 1 FROM ' || p_table INTO v_start;
+        EXECUTE IMMEDIATE 'CREATE SEQUENCE ' || p_table || '_ID_BLOCK_SEQ'
+            || ' START WITH ' || v_start || ' INCREMENT BY ' || block_size || ' NOCACHE';
+    END;
+BEGIN
+    create_block_seq('COMMENT_T', 'comment_id');
+    create_block_seq('RECIPE', 'recipe_id');
+    create_block_seq('INGREDIENT', 'ingredient_id');
+END;
+/
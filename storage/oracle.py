@@ -0,0 +1,189 @@
+"""Oracle backend (oracledb 커넥션 풀)"""
+import threading
+import time
+
+import oracledb
+
+import config
+
+NAME = 'oracle'
+Error = oracledb.Error
+
+# 기본은 Thin 모드. ORACLE_THICK_MODE면 Instant Client(Thick 모드)로 초기화
+# (Thick 모드에서는 비동기 풀을 쓸 수 없어 database_async가 스레드 풀로 실행)
+if getattr(config, 'ORACLE_THICK_MODE', False):
+    try:
+        oracledb.init_oracle_client(lib_dir=getattr(config, 'ORACLE_CLIENT_LIB_DIR', None))
+    except Exception as e:
+        print(f"Oracle Client 초기화 실패 (Thin 모드로 실행): {e}")
+
+oracledb.defaults.fetch_lobs = False
+
+# 커넥션 풀 (connect에서 공유, 최초 호출 시 생성)
+_pool = None
+_pool_lock = threading.Lock()
+_pool_stats = {
+    'acquires': 0,          # 커넥션 획득 횟수
+    'waits': 0,             # 유휴 커넥션이 없어 대기(또는 신규 생성)한 횟수
+    'failures': 0,          # 획득 실패(타임아웃 포함) 횟수
+    'acquire_time_total': 0.0,
+    'acquire_time_max': 0.0,
+}
+
+def _pool_params():
+    """config.py의 커넥션 풀 설정 (동기 / 비동기 풀 공통)"""
+    return dict(
+        user=config.ORACLE_USER,
+        password=config.ORACLE_PASSWORD,
+        dsn=config.ORACLE_DSN,
+        min=getattr(config, 'ORACLE_POOL_MIN', 2),
+        max=getattr(config, 'ORACLE_POOL_MAX', 10),
+        increment=getattr(config, 'ORACLE_POOL_INCREMENT', 1),
+        # 풀이 가득 차면 wait_timeout(ms)까지만 대기
+        getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+        wait_timeout=getattr(config, 'ORACLE_POOL_WAIT_TIMEOUT', 5000),
+        # 마지막 사용 후 ping_interval(초)이 지난 커넥션은 꺼낼 때 ping으로 확인
+        ping_interval=getattr(config, 'ORACLE_POOL_PING_INTERVAL', 60),
+        # 유휴 시간 / 최대 수명(초)을 넘긴 커넥션은 풀에서 제거
+        timeout=getattr(config, 'ORACLE_POOL_IDLE_TIMEOUT', 300),
+        max_lifetime_session=getattr(config, 'ORACLE_POOL_MAX_LIFETIME', 3600),
+    )
+
+def _get_pool():
+    """config.py 설정으로 Oracle 커넥션 풀 생성 (한 번만)"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = oracledb.create_pool(**_pool_params())
+    return _pool
+
+def connect():
+    """풀에서 커넥션 획득 (close() 시 풀로 반환)"""
+    start = time.perf_counter()
+    try:
+        pool = _get_pool()
+        waited = pool.busy >= pool.opened
+        conn = pool.acquire()
+    except oracledb.Error:
+        with _pool_lock:
+            _pool_stats['failures'] += 1
+        raise
+
+    # DB 왕복 하나의 제한 시간 (ms, 0이면 없음), 넘으면 호출이 DPI-1067 오류로 끝남
+    conn.call_timeout = getattr(config, 'ORACLE_CALL_TIMEOUT', 0)
+
+    elapsed = time.perf_counter() - start
+    with _pool_lock:
+        _pool_stats['acquires'] += 1
+        if waited:
+            _pool_stats['waits'] += 1
+        _pool_stats['acquire_time_total'] += elapsed
+        _pool_stats['acquire_time_max'] = max(_pool_stats['acquire_time_max'], elapsed)
+    return conn
+
+# 비동기(thin 모드) 커넥션 풀: 이벤트 루프에 묶이므로 database_async의 전용 루프에서만 사용
+_async_pool = None
+
+def async_supported():
+    """비동기 풀 사용 가능 여부 (Thin 모드에서만)"""
+    return oracledb.is_thin_mode()
+
+def acquire_async():
+    """비동기 풀에서 커넥션 획득 (async with 로 사용, 끝나면 풀로 반환)"""
+    global _async_pool
+    if _async_pool is None:
+        _async_pool = oracledb.create_pool_async(**_pool_params())
+    return _async_pool.acquire()
+
+async def fetch_result_sets_async(cursor, statements, params):
+    """fetch_result_sets의 비동기 버전"""
+    declare = "".join(f" c{i} SYS_REFCURSOR;" for i in range(len(statements)))
+    body = "".join(f" OPEN c{i} FOR {sql}; DBMS_SQL.RETURN_RESULT(c{i});"
+                   for i, sql in enumerate(statements))
+    await cursor.execute(f"DECLARE{declare} BEGIN{body} END;", params)
+    results = []
+    for result in cursor.getimplicitresults():
+        columns = [col[0].lower() for col in result.description]
+        results.append((columns, await result.fetchall()))
+    return results
+
+def insert_returning_id(cursor, sql, params, id_col):
+    """INSERT ... RETURNING id INTO 로 생성된 ID 반환"""
+    id_var = cursor.var(int)
+    cursor.execute(f"{sql} RETURNING {id_col} INTO :{len(params) + 1}", [*params, id_var])
+    return id_var.getvalue()[0]
+
+def insert_ignore_duplicates(cursor, sql, rows):
+    """executemany 중 UNIQUE 위반(ORA-00001) 행은 건너뜀 (다른 세션이 먼저 넣은 경우)"""
+    cursor.executemany(sql, rows, batcherrors=True)
+    for err in cursor.getbatcherrors():
+        if err.code != 1:
+            raise oracledb.DatabaseError(err.message)
+
+# INCREMENT BY를 확인한 블록 시퀀스
+_checked_block_seqs = set()
+
+def allocate_id_block(cursor, table, id_col, size):
+    """{table}_ID_BLOCK_SEQ 시퀀스에서 다음 ID 블록 [start, start + size) 시작값
+
+    시퀀스는 INCREMENT BY size로 만들어 두어야 한다 (storage/id_blocks_oracle.sql).
+    다르면 워커끼리 ID가 겹치므로 시퀀스마다 처음 한 번 확인하고 블록을 내주지 않는다.
+    NEXTVAL은 트랜잭션과 무관하므로 커밋할 필요 없음
+    """
+    seq = f"{table}_ID_BLOCK_SEQ"
+    if seq not in _checked_block_seqs:
+        cursor.execute("SELECT increment_by FROM USER_SEQUENCES WHERE sequence_name = :1", [seq])
+        row = cursor.fetchone()
+        if row is None or row[0] != size:
+            raise oracledb.ProgrammingError(
+                f"{seq}의 INCREMENT BY({row[0] if row else '시퀀스 없음'})가 "
+                f"ID_BLOCK_SIZE({size})와 다름: storage/id_blocks_oracle.sql 확인")
+        _checked_block_seqs.add(seq)
+    cursor.execute(f"SELECT {seq}.NEXTVAL FROM DUAL")
+    return cursor.fetchone()[0]
+
+def limit_rows(sql, n):
+    return f"SELECT * FROM ({sql}) WHERE ROWNUM <= {int(n)}"
+
+def fetch_result_sets(cursor, statements, params):
+    """PL/SQL 블록의 암시적 결과(DBMS_SQL.RETURN_RESULT)로 한 번의 왕복에 여러 결과 조회"""
+    declare = "".join(f" c{i} SYS_REFCURSOR;" for i in range(len(statements)))
+    body = "".join(f" OPEN c{i} FOR {sql}; DBMS_SQL.RETURN_RESULT(c{i});"
+                   for i, sql in enumerate(statements))
+    cursor.execute(f"DECLARE{declare} BEGIN{body} END;", params)
+    results = []
+    for result in cursor.getimplicitresults():
+        columns = [col[0].lower() for col in result.description]
+        results.append((columns, result.fetchall()))
+    return results
+
+def explain_plan(cursor, sql, params):
+    """EXPLAIN PLAN + DBMS_XPLAN.DISPLAY 결과 줄 목록, 같은 커넥션의 새 커서로 실행
+
+    EXPLAIN PLAN은 바인드 값을 보지 않으므로 실제 실행 계획과 다를 수 있다 (params 미사용).
+    """
+    plan = cursor.connection.cursor()
+    try:
+        plan.execute("DELETE FROM PLAN_TABLE WHERE statement_id = 'SLOW_QUERY'")
+        plan.execute(f"EXPLAIN PLAN SET STATEMENT_ID = 'SLOW_QUERY' FOR {sql}")
+        plan.execute("SELECT plan_table_output FROM TABLE(DBMS_XPLAN.DISPLAY(NULL, 'SLOW_QUERY', 'TYPICAL'))")
+        return [row[0] for row in plan.fetchall()]
+    finally:
+        plan.close()
+
+def get_pool_stats():
+    """모니터링용 커넥션 풀 통계"""
+    with _pool_lock:
+        stats = dict(_pool_stats)
+    total_time = stats.pop('acquire_time_total')
+    stats['acquire_time_avg_ms'] = (total_time / stats['acquires'] * 1000) if stats['acquires'] else 0.0
+    stats['acquire_time_max_ms'] = stats.pop('acquire_time_max') * 1000
+    if _pool is not None:
+        stats['in_use'] = _pool.busy
+        stats['opened'] = _pool.opened
+        stats['min'] = _pool.min
+        stats['max'] = _pool.max
+    else:
+        stats['in_use'] = stats['opened'] = 0
+    return stats
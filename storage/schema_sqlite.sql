@@ -0,0 +1,99 @@
+-- 내장 SQLite backend 스키마 (Oracle 스키마와 같은 테이블/컬럼 구성)
+
+CREATE TABLE IF NOT EXISTS USER_T (
+    user_id     VARCHAR(50) PRIMARY KEY,
+    password    VARCHAR(100) NOT NULL,
+    nickname    VARCHAR(50) NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS RECIPE_WAY (
+    recipe_way_id   INTEGER PRIMARY KEY AUTOINCREMENT,
+    way_name        VARCHAR(50) NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS RECIPE_TYPE (
+    recipe_type_id  INTEGER PRIMARY KEY AUTOINCREMENT,
+    type_name       VARCHAR(50) NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS INGREDIENT (
+    ingredient_id   INTEGER PRIMARY KEY AUTOINCREMENT,
+    name            VARCHAR(100) NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS RECIPE (
+    recipe_id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    title               VARCHAR(200) NOT NULL,
+    description         VARCHAR(4000),
+    author_id           VARCHAR(50) NOT NULL REFERENCES USER_T (user_id),
+    recipe_type_id      INTEGER NOT NULL REFERENCES RECIPE_TYPE (recipe_type_id),
+    recipe_way_id       INTEGER NOT NULL REFERENCES RECIPE_WAY (recipe_way_id),
+    info_calories       NUMBER,
+    info_carbohydrate   NUMBER,
+    info_protein        NUMBER,
+    info_fat            NUMBER,
+    info_natrium        NUMBER
+);
+CREATE INDEX IF NOT EXISTS IDX_RECIPE_AUTHOR ON RECIPE (author_id);
+
+CREATE TABLE IF NOT EXISTS RECIPE_INGREDIENT (
+    recipe_id       INTEGER NOT NULL REFERENCES RECIPE (recipe_id),
+    ingredient_id   INTEGER NOT NULL REFERENCES INGREDIENT (ingredient_id),
+    amount          VARCHAR(100),
+    PRIMARY KEY (recipe_id, ingredient_id)
+);
+CREATE INDEX IF NOT EXISTS IDX_RECIPE_INGREDIENT_ING ON RECIPE_INGREDIENT (ingredient_id);
+
+CREATE TABLE IF NOT EXISTS COOKING_STEP (
+    recipe_id       INTEGER NOT NULL REFERENCES RECIPE (recipe_id),
+    step_number     INTEGER NOT NULL,
+    instruction     VARCHAR(4000),
+    PRIMARY KEY (recipe_id, step_number)
+);
+
+CREATE TABLE IF NOT EXISTS USER_INGREDIENT (
+    user_ingredient_id  INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id             VARCHAR(50) NOT NULL REFERENCES USER_T (user_id),
+    ingredient_id       INTEGER NOT NULL REFERENCES INGREDIENT (ingredient_id),
+    quantity            VARCHAR(100),
+    UNIQUE (user_id, ingredient_id)
+);
+
+CREATE TABLE IF NOT EXISTS FAVORITE (
+    recipe_id       INTEGER NOT NULL REFERENCES RECIPE (recipe_id),
+    user_id         VARCHAR(50) NOT NULL REFERENCES USER_T (user_id),
+    created_date    TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (recipe_id, user_id)
+);
+CREATE INDEX IF NOT EXISTS IDX_FAVORITE_USER ON FAVORITE (user_id);
+
+CREATE TABLE IF NOT EXISTS COMMENT_T (
+    comment_id      INTEGER PRIMARY KEY,
+    user_id         VARCHAR(50) NOT NULL REFERENCES USER_T (user_id),
+    recipe_id       INTEGER NOT NULL REFERENCES RECIPE (recipe_id),
+    content         VARCHAR(1000) NOT NULL,
+    created_date    TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS IDX_COMMENT_RECIPE ON COMMENT_T (recipe_id);
+CREATE INDEX IF NOT EXISTS IDX_COMMENT_USER ON COMMENT_T (user_id);
+
+-- 백그라운드 회원 탈퇴 정리 (database.USER_PURGE_ASYNC): 등록된 계정은 로그인 불가
+CREATE TABLE IF NOT EXISTS USER_PURGE (
+    user_id         VARCHAR(50) PRIMARY KEY REFERENCES USER_T (user_id),
+    recipes_total   INTEGER NOT NULL,
+    recipes_done    INTEGER DEFAULT 0 NOT NULL,
+    started_date    TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 블록 단위 ID 할당 (storage.sqlite.allocate_id_block): 테이블별 다음 블록 시작 ID
+CREATE TABLE IF NOT EXISTS ID_BLOCK (
+    name            VARCHAR(30) PRIMARY KEY,
+    next_id         INTEGER NOT NULL
+);
+
+-- 조리 방법 / 요리 종류 기본값 (레시피 작성 화면의 선택지)
+INSERT OR IGNORE INTO RECIPE_WAY (way_name) VALUES
+    ('끓이기'), ('볶기'), ('굽기'), ('튀기기'), ('찌기'), ('기타');
+
+INSERT OR IGNORE INTO RECIPE_TYPE (type_name) VALUES
+    ('국,찌개'), ('반찬'), ('밥'), ('일품'), ('면요리'), ('후식'), ('기타');
@@ -0,0 +1,166 @@
+"""내장 SQLite backend
+
+단일 노드 배포, 로컬 벤치마크/부하 테스트용. database.py의 Oracle식
+바인드 변수(:1, :2 ...)를 SQLite의 번호 바인드(?1, ?2 ...)로 바꿔 실행한다.
+커넥션은 스레드마다 하나씩 열어 재사용하고, close()는 롤백만 한다.
+같은 스레드에서 connect()를 겹쳐 부르면 같은 커넥션을 받으므로, 롤백은
+가장 바깥 close()에서만 한다 (안쪽 close()가 바깥 트랜잭션을 지우지 않도록).
+메모리 DB(':memory:')는 공유 캐시의 테이블 락이 대기 없이 실패하므로
+connect()~close() 구간을 프로세스 락으로 직렬화한다.
+"""
+import functools
+import os
+import re
+import sqlite3
+import threading
+
+import config
+
+NAME = 'sqlite'
+Error = sqlite3.Error
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), 'schema_sqlite.sql')
+
+_local = threading.local()
+_memory_lock = threading.RLock()
+_init_lock = threading.Lock()
+_initialized = False
+_stats_lock = threading.Lock()
+_stats = {'connections_opened': 0, 'acquires': 0}
+
+@functools.lru_cache(maxsize=512)
+def _translate(sql):
+    """Oracle 바인드 변수 :N 을 SQLite ?N 으로 변환"""
+    return re.sub(r':(\d+)', r'?\1', sql)
+
+class _Cursor(sqlite3.Cursor):
+    def execute(self, sql, params=()):
+        return super().execute(_translate(sql), params)
+
+    def executemany(self, sql, seq_of_params):
+        return super().executemany(_translate(sql), seq_of_params)
+
+class _Connection(sqlite3.Connection):
+    _depth = 0      # 이 스레드에서 close()되지 않은 connect() 수
+
+    def cursor(self, factory=_Cursor):
+        return super().cursor(factory)
+
+    def close(self):
+        # 스레드별 커넥션을 재사용하므로 실제로 닫지 않고, 가장 바깥 close()에서 트랜잭션만 정리
+        self._depth -= 1
+        if self._depth == 0:
+            self.rollback()
+        if _is_memory():
+            _memory_lock.release()
+
+    def really_close(self):
+        super().close()
+
+def _is_memory():
+    return getattr(config, 'SQLITE_PATH', 'recipes.db') == ':memory:'
+
+def _database_path():
+    path = getattr(config, 'SQLITE_PATH', 'recipes.db')
+    if path == ':memory:':
+        # 스레드 간에 공유되는 메모리 DB
+        return 'file:recipes?mode=memory&cache=shared', True
+    return path, False
+
+def _open():
+    path, uri = _database_path()
+    conn = sqlite3.connect(path, uri=uri, factory=_Connection,
+                           timeout=getattr(config, 'SQLITE_BUSY_TIMEOUT', 5.0))
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    # Oracle처럼 LIKE 대소문자 구분
+    conn.execute("PRAGMA case_sensitive_like = ON")
+    with _stats_lock:
+        _stats['connections_opened'] += 1
+    return conn
+
+def init_schema(conn):
+    """테이블이 없으면 생성"""
+    with open(SCHEMA_PATH, encoding='utf-8') as f:
+        conn.executescript(f.read())
+    conn.commit()
+
+def connect():
+    """현재 스레드의 SQLite 연결 반환 (최초 호출 시 스키마 생성)"""
+    if _is_memory():
+        _memory_lock.acquire()
+    try:
+        conn = _thread_conn()
+    except Exception:
+        if _is_memory():
+            _memory_lock.release()
+        raise
+    conn._depth += 1
+    with _stats_lock:
+        _stats['acquires'] += 1
+    return conn
+
+def _thread_conn():
+    global _initialized
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        conn = _open()
+        _local.conn = conn
+        if not _initialized:
+            with _init_lock:
+                if not _initialized:
+                    init_schema(conn)
+                    _initialized = True
+    return conn
+
+def insert_returning_id(cursor, sql, params, id_col):
+    """INSERT 후 생성된 ID(rowid) 반환"""
+    cursor.execute(sql, params)
+    return cursor.lastrowid
+
+def insert_ignore_duplicates(cursor, sql, rows):
+    """UNIQUE / PRIMARY KEY 위반 행만 건너뛰는 executemany (INSERT ... VALUES 문)
+
+    INSERT OR IGNORE는 NOT NULL / CHECK 위반도 삼키므로 ON CONFLICT DO NOTHING 사용
+    (Oracle의 ORA-00001만 무시하는 것과 같게)
+    """
+    cursor.executemany(f"{sql} ON CONFLICT DO NOTHING", rows)
+
+def allocate_id_block(cursor, table, id_col, size):
+    """ID_BLOCK 테이블에서 table의 다음 ID 블록 [start, start + size) 시작값 (호출한 쪽이 커밋)
+
+    블록을 쓰지 않고 들어간 행(AUTOINCREMENT 등)과 겹치지 않도록 현재 최대 ID 뒤에서 시작
+    """
+    cursor.execute(f"""
+        INSERT INTO ID_BLOCK (name, next_id)
+        VALUES (:1, (SELECT COALESCE(MAX({id_col}), 0) + 1 FROM {table}) + :2)
+        ON CONFLICT (name) DO UPDATE SET next_id = MAX(next_id, excluded.next_id - :2) + :2
+        RETURNING next_id - :2
+    """, (table, size))
+    return cursor.fetchone()[0]
+
+def limit_rows(sql, n):
+    return f"{sql} LIMIT {int(n)}"
+
+def fetch_result_sets(cursor, statements, params):
+    """여러 SELECT를 차례로 실행 (프로세스 내부 DB라 왕복 비용 없음)"""
+    results = []
+    for sql in statements:
+        cursor.execute(sql, params)
+        columns = [col[0].lower() for col in cursor.description]
+        results.append((columns, cursor.fetchall()))
+    return results
+
+def explain_plan(cursor, sql, params):
+    """EXPLAIN QUERY PLAN 결과 (detail 열) 목록, 같은 커넥션의 새 커서로 실행"""
+    plan = cursor.connection.cursor()
+    try:
+        plan.execute(f"EXPLAIN QUERY PLAN {sql}", params or ())
+        return [row[3] for row in plan.fetchall()]
+    finally:
+        plan.close()
+
+def get_pool_stats():
+    with _stats_lock:
+        return dict(_stats)
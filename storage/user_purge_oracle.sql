@@ -0,0 +1,9 @@
+-- 백그라운드 회원 탈퇴 정리용 테이블 (config.USER_PURGE_ASYNC = True 일 때 필요)
+-- 등록된 계정은 로그인할 수 없고, 작성한 레시피가 모두 삭제되면 계정과 함께 행도 삭제된다.
+
+CREATE TABLE USER_PURGE (
+    user_id         VARCHAR2(50) PRIMARY KEY REFERENCES USER_T (user_id),
+    recipes_total   NUMBER NOT NULL,
+    recipes_done    NUMBER DEFAULT 0 NOT NULL,
+    started_date    TIMESTAMP DEFAULT SYSTIMESTAMP
+);